@@ -3,8 +3,51 @@ Resource Calculator for EVE Production Calculator
 
 This module provides centralized calculation logic for all EVE resource requirements
 """
-from typing import Dict, Any, List, Union, Optional
+import math
+import threading
+from typing import Dict, Any, List, Union, Optional, Iterable, Tuple
 from core.module_registry import ModuleRegistry, ShipModule, CapitalShipModule, ComponentModule
+from core.requirement_cache import RequirementCache
+from core.config.blueprint_config import get_blueprint_me, get_blueprint_te, add_blueprint_change_listener
+from core.utils.debug import debug_print
+from core.utils.optional import load_numpy
+
+# Blueprint config category holding the ME/TE values for each registry collection
+BLUEPRINT_CONFIG_CATEGORIES = {
+    'ships': 'ship_blueprints',
+    'capital_ships': 'capital_ship_blueprints',
+    'components': 'components',
+    'capital_components': 'component_blueprints'
+}
+
+# Registry collection for each blueprint config category
+REGISTRY_CATEGORIES = {config_category: category for category, config_category in BLUEPRINT_CONFIG_CATEGORIES.items()}
+
+def _job_amounts(np, recipes, present, multipliers, runs):
+    """
+    Apply the per-job rounding of _apply_job_material_efficiency to a whole batch
+    
+    Args:
+        np: The numpy module
+        recipes: Base quantity matrix, one row per job, one column per material
+        present: Boolean matrix of the materials each row's recipe uses
+        multipliers: Combined ME, structure and rig multiplier of every row
+        runs: Runs of the job of every row; rows with 0 runs need nothing
+        
+    Returns:
+        Integer matrix of the quantities each job needs
+    """
+    runs = np.array(runs, dtype=np.int64)
+    exact = recipes * runs[:, None] * multipliers[:, None]
+    amounts = np.ceil(np.round(exact, 2))
+    
+    # np.round scales by 100 and rounds ties to even, which can settle a value
+    # lying on a half hundredth differently from round(); redo those in Python
+    scaled = exact * 100
+    for row, column in zip(*np.nonzero(present & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6))):
+        amounts[row, column] = math.ceil(round(float(exact[row, column]), 2))
+    
+    return np.where(present, np.maximum(amounts, runs[:, None]), 0).astype(np.int64)
 
 class RequirementsCalculator:
     """
@@ -22,6 +65,28 @@ class RequirementsCalculator:
         """
         self.registry = module_registry
         self.blueprint_config = None  # Will be set externally
+        
+        # Input quantities of one manufacturing job with ME applied, keyed by material
+        # graph node ID, then by (runs, structure bonus, rig bonus)
+        self._job_quantity_memo: Dict[int, Dict[Tuple[int, float, float], List[int]]] = {}
+        self._memo_graph = None  # Material graph the memos above were built against
+        # TE-adjusted seconds per manufacturing run, keyed by (category, name)
+        self._run_time_memo: Dict[Tuple[str, str], Optional[float]] = {}
+        
+        # Finished requirement dictionaries, keyed by (category, name, ME, TE, quantity, variant)
+        self.requirement_cache = RequirementCache()
+        
+        # Calculations run on a worker thread while blueprint edits invalidate
+        # from the GUI thread. Invalidations bump the generation under the lock,
+        # and a result computed under an older generation is never stored, so
+        # a calculation that read the old ME/TE cannot outlive its invalidation.
+        self._memo_lock = threading.RLock()
+        self._generation = 0
+        
+        # Ore x mineral yield matrix, built on the first refining calculation
+        self._refining_engine = None
+        self._pi_planner = None
+        add_blueprint_change_listener(self.on_blueprint_changed)
     
     def set_blueprint_config(self, blueprint_config: Dict[str, Any]):
         """
@@ -31,6 +96,59 @@ class RequirementsCalculator:
             blueprint_config: Blueprint configuration dictionary
         """
         self.blueprint_config = blueprint_config
+        self.clear_expansion_cache()
+    
+    def clear_expansion_cache(self):
+        """
+        Discard all memoized bill-of-materials expansions
+        
+        Must be called whenever ME levels or registry recipes change.
+        """
+        with self._memo_lock:
+            self._generation += 1
+            self._job_quantity_memo.clear()
+            self._run_time_memo.clear()
+            self.requirement_cache.clear()
+    
+    def on_blueprint_changed(self, category: Optional[str], blueprint_name: Optional[str]):
+        """
+        Evict cached results affected by a blueprint settings change
+        
+        Only the changed blueprint and the items whose bill of materials uses
+        it are evicted; everything else stays cached.
+        
+        Args:
+            category: Blueprint config category, or None if the whole config changed
+            blueprint_name: Name of the changed blueprint
+        """
+        registry_category = REGISTRY_CATEGORIES.get(category)
+        if registry_category is None:
+            self.clear_expansion_cache()
+            return
+        
+        with self._memo_lock:
+            self._generation += 1
+            affected = [(registry_category, blueprint_name)]
+            self._run_time_memo.pop((registry_category, blueprint_name), None)
+            graph = self.registry.material_graph
+            if graph is not None and graph is self._memo_graph:
+                node_id = graph.get_node_id(registry_category, blueprint_name)
+                if node_id is not None:
+                    self._job_quantity_memo.pop(node_id, None)
+                    affected.extend(graph.items[dependent] for dependent in graph.get_dependents(node_id)
+                                    if graph.items[dependent] is not None)
+            
+            for item in affected:
+                self.requirement_cache.invalidate(*item)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the requirement cache
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, size, evictions and invalidations
+        """
+        return self.requirement_cache.get_stats()
     
     def get_me_level(self, category: str, blueprint_name: str) -> int:
         """
@@ -43,8 +161,6 @@ class RequirementsCalculator:
         Returns:
             Material Efficiency level (default: 0)
         """
-        from config.blueprint_config import get_blueprint_me
-        
         if self.blueprint_config:
             return get_blueprint_me(self.blueprint_config, category, blueprint_name)
         return 0
@@ -60,8 +176,6 @@ class RequirementsCalculator:
         Returns:
             TE level percentage (0-20)
         """
-        from config.blueprint_config import get_blueprint_te
-        
         if self.blueprint_config:
             return get_blueprint_te(self.blueprint_config, category, blueprint_name)
         return 0
@@ -81,6 +195,51 @@ class RequirementsCalculator:
         time_multiplier = 1.0 - (te_level / 100)
         return base_time * time_multiplier
     
+    def get_run_time(self, category: str, name: str) -> Optional[float]:
+        """
+        Get the TE-adjusted duration of one manufacturing run of an item
+        
+        Args:
+            category: Registry collection of the item (ships, capital_ships, components, capital_components)
+            name: Registry name of the item
+            
+        Returns:
+            Seconds per run, or None if the item or its build time is unknown
+        """
+        key = (category, name)
+        with self._memo_lock:
+            if key in self._run_time_memo:
+                return self._run_time_memo[key]
+            generation = self._generation
+        
+        module = getattr(self.registry, category, {}).get(name)
+        base_time = getattr(module, 'build_time', None)
+        run_time = None
+        if base_time is not None:
+            te_level = max(0, min(20, self.get_te_level(BLUEPRINT_CONFIG_CATEGORIES.get(category, category), name)))
+            run_time = self.calculate_production_time(base_time, te_level)
+        with self._memo_lock:
+            if generation == self._generation:
+                self._run_time_memo[key] = run_time
+        return run_time
+    
+    def calculate_job_duration(self, category: str, name: str, runs: int = 1) -> Optional[int]:
+        """
+        Calculate how long a manufacturing job of an item takes
+        
+        Args:
+            category: Registry collection of the item (ships, capital_ships, components, capital_components)
+            name: Registry name of the item
+            runs: Number of runs in the job
+            
+        Returns:
+            Job duration in whole seconds with TE applied, or None if the build time is unknown
+        """
+        run_time = self.get_run_time(category, name)
+        if run_time is None:
+            return None
+        return int(round(run_time * runs))
+    
     def calculate_ship_requirements(self, ship_name: str) -> Dict[str, Union[int, float]]:
         """
         Calculate material requirements for a ship with material efficiency
@@ -95,9 +254,8 @@ class RequirementsCalculator:
         if not ship:
             return {}
             
-        # Get ME% for this specific ship
-        me_level = self.get_me_level('ships', ship_name)
-        return self._apply_material_efficiency(ship.requirements, me_level)
+        return self._cached_requirements('ships', ship_name, 1, 'direct',
+                                         lambda me_level: self._apply_material_efficiency(ship.requirements, me_level))
     
     def calculate_capital_ship_requirements(self, capital_ship_name: str) -> Dict[str, Union[int, float]]:
         """
@@ -113,9 +271,8 @@ class RequirementsCalculator:
         if not capital_ship:
             return {}
             
-        # Get ME% for this specific capital ship
-        me_level = self.get_me_level('capital_ships', capital_ship_name)
-        return self._apply_material_efficiency(capital_ship.requirements, me_level)
+        return self._cached_requirements('capital_ships', capital_ship_name, 1, 'direct',
+                                         lambda me_level: self._apply_material_efficiency(capital_ship.requirements, me_level))
     
     def calculate_component_requirements(self, component_name: str) -> Dict[str, Union[int, float]]:
         """
@@ -131,59 +288,154 @@ class RequirementsCalculator:
         if not component:
             return {}
             
-        # Get ME% for this specific component
-        me_level = self.get_me_level('components', component_name)
-        return self._apply_material_efficiency(component.requirements, me_level)
+        return self._cached_requirements('components', component_name, 1, 'direct',
+                                         lambda me_level: self._apply_material_efficiency(component.requirements, me_level))
     
-    def calculate_pi_requirements(self, pi_material_name: str) -> Dict[str, Union[int, float]]:
+    def calculate_pi_requirements(self, pi_material_name: str, quantity: int = 1,
+                                  expand: bool = False) -> Dict[str, Union[int, float]]:
         """
-        Calculate material requirements for a PI material with material efficiency
+        Calculate the inputs needed to produce a PI material
+        
+        PI factories run in whole cycles, so the quantity is rounded up to full
+        batches at every tier. PI schematics have no material efficiency.
         
         Args:
-            pi_material_name: Name of the PI material to calculate for
+            pi_material_name: Registry or display name of the PI material
+            quantity: Number of units to produce
+            expand: Resolve the chain all the way down to P0 resources instead
+                of listing the direct inputs only
             
         Returns:
             Dictionary of materials and quantities required
         """
-        pi_material = self.registry.get_pi_material(pi_material_name)
-        if not pi_material:
+        chain = self.registry.get_pi_chain()
+        node_id = chain.get_node_id(pi_material_name)
+        if node_id is None or quantity <= 0:
             return {}
         
-        # For P0 materials (raw materials), there are no requirements
-        if pi_material.pi_level == "P0":
+        # P0 resources are extracted and have no inputs
+        if chain.offsets[node_id] == chain.offsets[node_id + 1]:
             return {}
+        
+        if not expand:
+            cycles = math.ceil(quantity / chain.batch_sizes[node_id])
+            input_ids, amounts = chain.get_inputs(node_id)
+            return {chain.names[input_id]: amount * cycles for input_id, amount in zip(input_ids, amounts)}
+        
+        units, _ = chain.resolve({node_id: quantity})
+        return {chain.names[material_id]: amount for material_id, amount in units.items()
+                if chain.tiers[material_id] == 0 and amount}
+    
+    def plan_pi_colony(self, pi_material_name: str, units_per_day: float,
+                       extractor_units_per_hour: Optional[float] = None):
+        """
+        Plan the extractors, factories and planets for a steady PI output
+        
+        Args:
+            pi_material_name: Registry or display name of the PI material
+            units_per_day: Units of the material wanted per day
+            extractor_units_per_hour: P0 output of one extractor, None for the default
             
-        return self._apply_material_efficiency(pi_material.requirements, self.get_me_level('pi', pi_material_name))
+        Returns:
+            PiPlan with per-material rates and facility counts, or None if the material is unknown
+        """
+        from core.pi_planner import PiPlanner, DEFAULT_EXTRACTOR_UNITS_PER_HOUR
+        
+        # The planner keeps its planet cover memo for as long as the chain is current
+        chain = self.registry.get_pi_chain()
+        if self._pi_planner is None or self._pi_planner.chain is not chain:
+            self._pi_planner = PiPlanner.from_registry(self.registry)
+        
+        if extractor_units_per_hour is None:
+            extractor_units_per_hour = DEFAULT_EXTRACTOR_UNITS_PER_HOUR
+        return self._pi_planner.plan(pi_material_name, units_per_day, extractor_units_per_hour)
+    
+    def get_refining_engine(self):
+        """
+        Get the refining engine for the registry's ore data
+        
+        The ore x mineral yield matrix is built on first use and rebuilt only
+        when the registry's ore data is replaced.
+        
+        Returns:
+            RefiningEngine for the registered ores
+        """
+        if self._refining_engine is None or self._refining_engine.source is not self.registry.ores:
+            from core.refining import RefiningEngine
+            self._refining_engine = RefiningEngine.from_registry(self.registry)
+        return self._refining_engine
     
     def calculate_ore_requirements(self, ore_name: str) -> Dict[str, Union[int, float]]:
         """
-        Calculate material requirements for ore refining with efficiency
+        Get the minerals one portion of an ore refines into at full efficiency
         
         Args:
-            ore_name: Name of the ore to calculate for
+            ore_name: Display name of the ore to calculate for
             
         Returns:
-            Dictionary of materials and quantities required
+            Dictionary of minerals and quantities per portion, empty if the ore is unknown
         """
-        # This function would need access to ore data
-        # This is a placeholder implementation until ore data is available
-        return {}
+        return self.get_refining_engine().get_portion_yield(ore_name)
     
     def calculate_ore_refining(self, ore_name: str, quantity: int, efficiency: float) -> Dict[str, int]:
         """
         Calculate refined minerals from ore
         
+        Only whole portions are refined; units left over below a portion
+        size produce nothing.
+        
         Args:
-            ore_name: Name of the ore to refine
+            ore_name: Display name of the ore to refine
             quantity: Quantity of ore to refine
             efficiency: Refining efficiency as a percentage (0-100)
             
         Returns:
             Dictionary of minerals and quantities produced
         """
-        # This function would need access to ore data which is not in the registry yet
-        # This is a placeholder implementation
-        return {}
+        minerals, _ = self.get_refining_engine().refine({ore_name: quantity}, efficiency / 100)
+        return minerals
+    
+    def refine_ore_inventory(self, inventory: Dict[str, int], efficiency: float,
+                             ore_modifiers: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Refine a whole ore inventory at once
+        
+        Args:
+            inventory: Dictionary of ore display name -> units of ore
+            efficiency: Refining efficiency as a percentage (0-100)
+            ore_modifiers: Optional extra bonus per ore in percent, for ore
+                processing skills that only apply to some ores
+            
+        Returns:
+            Tuple of (minerals produced, units of ore left over below a portion)
+        """
+        modifiers = None
+        if ore_modifiers:
+            modifiers = {ore_name: bonus / 100 for ore_name, bonus in ore_modifiers.items()}
+        return self.get_refining_engine().refine(inventory, efficiency / 100, modifiers)
+    
+    def calculate_ore_mix(self, requirements: Dict[str, int], efficiency: float, objective: str = 'volume',
+                          prices: Optional[Dict[str, float]] = None,
+                          security_levels: Optional[List[str]] = None,
+                          max_nodes: Optional[int] = None):
+        """
+        Find the cheapest ore mix that refines into a mineral shopping list
+        
+        Args:
+            requirements: Dictionary of materials and quantities; only minerals are used
+            efficiency: Refining efficiency as a percentage (0-100)
+            objective: 'volume' or 'units' to minimize; ignored when prices are given
+            prices: Optional price per unit of each ore to minimize cost instead
+            security_levels: Optional security levels (e.g. "High-sec") to restrict the ores to
+            max_nodes: Optional cap on the branch and bound search (default: the solver's)
+            
+        Returns:
+            OreMix with the ores, portions, minerals produced and surplus, and
+            the search status and gap to the optimum
+        """
+        from core.ore_solver import OreMixSolver
+        return OreMixSolver(self.get_refining_engine()).solve(
+            requirements, efficiency / 100, objective, prices, security_levels, max_nodes)
     
     def _apply_material_efficiency(self, requirements: Dict[str, int], me_level: int) -> Dict[str, Union[int, float]]:
         """
@@ -212,6 +464,94 @@ class RequirementsCalculator:
             
         return result
     
+    def calculate_job_requirements(self, category: str, name: str, quantity: int,
+                                   runs_per_job: Optional[int] = None,
+                                   structure_bonus: float = 0.0,
+                                   rig_bonus: float = 0.0) -> Dict[str, int]:
+        """
+        Calculate material requirements the way the game does for manufacturing jobs
+        
+        The quantity is split into jobs of runs_per_job runs (the last job takes
+        the remainder) and each job is rounded once, rather than rounding a
+        single unit and multiplying it up.
+        
+        Args:
+            category: Registry collection of the item (ships, capital_ships, components, capital_components)
+            name: Registry name of the item
+            quantity: Total number of units to build
+            runs_per_job: Runs per manufacturing job, or None for a single job
+            structure_bonus: Structure material reduction as a percentage (e.g. 1 for 1%)
+            rig_bonus: Rig material reduction as a percentage (e.g. 2.4 for 2.4%)
+            
+        Returns:
+            Dictionary of materials and total quantities required
+        """
+        item = getattr(self.registry, category, {}).get(name)
+        if not item or quantity < 1:
+            return {}
+        
+        variant = ('job', runs_per_job, structure_bonus, rig_bonus)
+        return self._cached_requirements(category, name, quantity, variant,
+                                         lambda me_level: self._calculate_jobs(item, quantity, me_level, runs_per_job,
+                                                                               structure_bonus, rig_bonus))
+    
+    def _calculate_jobs(self, item, quantity: int, me_level: int, runs_per_job: Optional[int],
+                        structure_bonus: float, rig_bonus: float) -> Dict[str, int]:
+        """
+        Split a quantity into manufacturing jobs and total their requirements
+        
+        Args:
+            item: Registry module being built
+            quantity: Total number of units to build
+            me_level: Material Efficiency level of the blueprint
+            runs_per_job: Runs per manufacturing job, or None for a single job
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Dictionary of materials and total quantities required
+        """
+        if not runs_per_job or runs_per_job >= quantity:
+            return self._apply_job_material_efficiency(item.requirements, quantity, me_level, structure_bonus, rig_bonus)
+        
+        # Full jobs all round identically, so compute one and scale it
+        full_jobs, remainder = divmod(quantity, runs_per_job)
+        full_job = self._apply_job_material_efficiency(item.requirements, runs_per_job, me_level, structure_bonus, rig_bonus)
+        result = {material: amount * full_jobs for material, amount in full_job.items()}
+        
+        if remainder:
+            last_job = self._apply_job_material_efficiency(item.requirements, remainder, me_level, structure_bonus, rig_bonus)
+            result = self.aggregate_requirements([result, last_job])
+        
+        return result
+    
+    def _apply_job_material_efficiency(self, requirements: Dict[str, int], runs: int, me_level: int,
+                                       structure_bonus: float = 0.0, rig_bonus: float = 0.0) -> Dict[str, int]:
+        """
+        Apply material efficiency to a whole manufacturing job
+        
+        Uses the in-game rule max(runs, ceil(round(base * runs * multiplier, 2))),
+        where the multiplier combines blueprint ME, structure and rig bonuses.
+        
+        Args:
+            requirements: Dictionary of base material requirements per run
+            runs: Number of runs in the job
+            me_level: Material Efficiency level (0-10)
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Dictionary of materials and quantities required for the job
+        """
+        me_level = max(0, min(10, me_level))
+        multiplier = (1 - me_level / 100) * (1 - structure_bonus / 100) * (1 - rig_bonus / 100)
+        
+        # Rounding to 2 decimals first absorbs float noise such as 100 * 0.9 = 90.00000000000001
+        return {
+            material: max(runs, math.ceil(round(amount * runs * multiplier, 2)))
+            for material, amount in requirements.items()
+        }
+    
     def aggregate_requirements(self, requirements_list: List[Dict[str, Union[int, float]]]) -> Dict[str, Union[int, float]]:
         """
         Aggregate multiple requirement dictionaries into one
@@ -231,3 +571,408 @@ class RequirementsCalculator:
                     result[material] = amount
         
         return result
+    
+    def calculate_batch_requirements(self, orders: Iterable[Tuple[str, int, Optional[int]]],
+                                     per_job: bool = False, runs_per_job: Optional[int] = None,
+                                     structure_bonus: float = 0.0, rig_bonus: float = 0.0) -> Dict[str, int]:
+        """
+        Calculate the combined material requirements of many items at once
+        
+        By default this gives exactly the same totals as summing
+        calculate_*_requirements() multiplied by quantity for every order,
+        including the per-unit ME rounding. With NumPy available the whole
+        batch is one matrix product: the rounded, ME-adjusted recipe rows of
+        every order weighted by the order quantities.
+        
+        With per_job set, every order is rounded per manufacturing job instead,
+        giving the same totals as calculate_job_requirements() for each order.
+        With NumPy this is vectorized the same way, over one matrix of jobs.
+        
+        Args:
+            orders: Iterable of (item, quantity, me_level) tuples. The item is a
+                registry or display name, matched case-insensitively; a me_level of None uses the ME from
+                the blueprint configuration.
+            per_job: Round once per manufacturing job rather than once per unit
+            runs_per_job: Runs per manufacturing job when per_job is set, or None for one job per order
+            structure_bonus: Structure material reduction as a percentage, when per_job is set
+            rig_bonus: Rig material reduction as a percentage, when per_job is set
+            
+        Returns:
+            Dictionary of materials and total quantities required
+        """
+        resolved = []
+        for item_name, quantity, me_level in orders:
+            category, item = self.registry.find_by_name(item_name, self.registry.BUILDABLE_CATEGORIES)
+            if item is None:
+                debug_print(f"Batch calculation: unknown item '{item_name}' skipped")
+                continue
+            if me_level is None:
+                me_level = self.get_me_level(BLUEPRINT_CONFIG_CATEGORIES[category], item.name)
+            resolved.append((item, int(quantity), max(0, min(10, me_level))))
+        
+        if not resolved:
+            return {}
+        
+        np = load_numpy()
+        if np is None:
+            if per_job:
+                # Orders repeating an item, quantity and ME round identically
+                jobs = {}
+                for item, quantity, me_level in resolved:
+                    key = (id(item), quantity, me_level)
+                    if key not in jobs:
+                        jobs[key] = self._calculate_jobs(item, quantity, me_level, runs_per_job, structure_bonus, rig_bonus)
+                return self.aggregate_requirements([jobs[(id(item), quantity, me_level)]
+                                                    for item, quantity, me_level in resolved])
+            return self.aggregate_requirements([
+                {material: amount * quantity for material, amount in self._apply_material_efficiency(item.requirements, me_level).items()}
+                for item, quantity, me_level in resolved
+            ])
+        
+        # Recipe matrix: one row per distinct item, one column per material
+        materials: Dict[str, int] = {}
+        rows: Dict[int, int] = {}
+        for item, _, _ in resolved:
+            if id(item) not in rows:
+                rows[id(item)] = len(rows)
+                for material in item.requirements:
+                    materials.setdefault(material, len(materials))
+        
+        recipe_matrix = np.zeros((len(rows), len(materials)))
+        present_matrix = np.zeros((len(rows), len(materials)), dtype=bool)
+        seen = set()
+        for item, _, _ in resolved:
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            for material, amount in item.requirements.items():
+                recipe_matrix[rows[id(item)], materials[material]] = amount
+                present_matrix[rows[id(item)], materials[material]] = True
+        
+        row_index = np.array([rows[id(item)] for item, _, _ in resolved], dtype=np.intp)
+        
+        if per_job:
+            # Split every order into full jobs plus a last job taking the remainder, as _calculate_jobs does
+            job_runs, job_counts, remainders = [], [], []
+            for _, quantity, _ in resolved:
+                if runs_per_job and runs_per_job < quantity:
+                    full_jobs, remainder = divmod(quantity, runs_per_job)
+                    job_runs.append(runs_per_job)
+                    job_counts.append(full_jobs)
+                    remainders.append(remainder)
+                else:
+                    job_runs.append(quantity)
+                    job_counts.append(1)
+                    remainders.append(0)
+            
+            recipes = recipe_matrix[row_index]
+            present = present_matrix[row_index]
+            multipliers = np.array([(1 - me_level / 100) * (1 - structure_bonus / 100) * (1 - rig_bonus / 100)
+                                    for _, _, me_level in resolved])
+            totals = (np.array(job_counts, dtype=np.int64) @ _job_amounts(np, recipes, present, multipliers, job_runs)
+                      + _job_amounts(np, recipes, present, multipliers, remainders).sum(axis=0))
+        else:
+            quantities = np.array([quantity for _, quantity, _ in resolved], dtype=np.int64)
+            me_multipliers = np.array([1 - (me_level / 100) for _, _, me_level in resolved])
+            
+            # np.rint rounds half to even like round(), so per-unit amounts match _apply_material_efficiency
+            unit_requirements = np.rint(recipe_matrix[row_index] * me_multipliers[:, None]).astype(np.int64)
+            totals = quantities @ unit_requirements
+        
+        return {material: int(totals[column]) for material, column in materials.items()}
+    
+    def expand_requirements(self, category: str, name: str, quantity: int = 1,
+                            runs_per_job: Optional[int] = None, structure_bonus: float = 0.0,
+                            rig_bonus: float = 0.0) -> Dict[str, Union[int, float]]:
+        """
+        Expand an item's bill of materials recursively down to raw materials
+        
+        Every sub-component found in the registry is replaced by its own
+        ME-adjusted requirements until only raw materials (minerals, P0
+        resources and anything else without a recipe) remain. Each item and
+        component is rounded per manufacturing job, as in
+        calculate_job_requirements(), and PI goods are resolved through the PI
+        chain in whole factory cycles.
+        
+        Args:
+            category: Registry collection of the item (ships, capital_ships, components, capital_components)
+            name: Registry name of the item
+            quantity: Number of items to build
+            runs_per_job: Runs per manufacturing job, or None for a single job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Dictionary of raw materials and total quantities required
+        """
+        variant = ('expanded', runs_per_job, structure_bonus, rig_bonus)
+        return self._cached_requirements(category, name, quantity, variant,
+                                         lambda me_level: self._resolve_pi_materials(self._expand_item(
+                                             category, name, quantity, runs_per_job, structure_bonus, rig_bonus)[0]))
+    
+    def expand_intermediates(self, category: str, name: str, quantity: int = 1,
+                             runs_per_job: Optional[int] = None, structure_bonus: float = 0.0,
+                             rig_bonus: float = 0.0) -> Dict[str, Union[int, float]]:
+        """
+        Get every intermediate component that has to be built for an item
+        
+        Args:
+            category: Registry collection of the item (ships, capital_ships, components, capital_components)
+            name: Registry name of the item
+            quantity: Number of items to build
+            runs_per_job: Runs per manufacturing job, or None for a single job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Dictionary of intermediate component display names and total quantities
+        """
+        variant = ('intermediates', runs_per_job, structure_bonus, rig_bonus)
+        return self._cached_requirements(category, name, quantity, variant,
+                                         lambda me_level: self._expand_item(category, name, quantity, runs_per_job,
+                                                                            structure_bonus, rig_bonus)[1])
+    
+    def expand_order(self, orders: Iterable[Tuple[str, str, int]], runs_per_job: Optional[int] = None,
+                     structure_bonus: float = 0.0, rig_bonus: float = 0.0) -> Dict[str, Union[int, float]]:
+        """
+        Expand a whole build order down to raw materials
+        
+        The order is pushed through the registry's compiled material graph in a
+        single topological pass, so sub-components shared by many hulls are
+        expanded once for their combined demand and rounded per job on that
+        combined demand. PI goods are resolved down to P0 resources the same way.
+        
+        Args:
+            orders: Iterable of (category, name, quantity) tuples
+            runs_per_job: Runs per manufacturing job, or None for a single job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Aggregated dictionary of raw materials and quantities for the whole order
+        """
+        graph, totals = self._expand_order(orders, runs_per_job, structure_bonus, rig_bonus)
+        return self._resolve_pi_materials({graph.names[node_id]: amount for node_id, amount in totals.items()
+                                           if amount and not graph.has_recipe(node_id)})
+
+    def schedule_order(self, orders: Iterable[Tuple[str, str, int]], slots: int,
+                       runs_per_job: Optional[int] = None, structure_bonus: float = 0.0,
+                       rig_bonus: float = 0.0):
+        """
+        Schedule the manufacturing jobs of a build order over a number of slots
+
+        The order is expanded with ME and per-job rounding applied, as in
+        expand_order(), every intermediate component and ordered item becomes
+        one or more jobs timed with TE applied, and components finish before
+        the items built from them start.
+
+        Args:
+            orders: Iterable of (category, name, quantity) tuples
+            slots: Number of manufacturing slots
+            runs_per_job: Runs per manufacturing job, or None for one job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+
+        Returns:
+            Schedule with the placed jobs, makespan, slot utilization and critical path
+        """
+        from core.scheduler import ProductionScheduler
+
+        graph, totals = self._expand_order(orders, runs_per_job, structure_bonus, rig_bonus)
+        return ProductionScheduler(graph, self.calculate_job_duration).schedule(totals, slots, runs_per_job)
+
+    def _cached_requirements(self, category: str, name: str, quantity: int, variant, calculate) -> Dict[str, Union[int, float]]:
+        """
+        Look up a calculation in the requirement cache, computing it on a miss
+        
+        Args:
+            category: Registry collection of the item
+            name: Registry name of the item
+            quantity: Quantity the result was calculated for
+            variant: Hashable tag telling apart the kinds of calculation
+            calculate: Function taking the ME level and returning the requirements
+            
+        Returns:
+            A copy of the cached requirements, safe for the caller to modify
+        """
+        config_category = BLUEPRINT_CONFIG_CATEGORIES.get(category, category)
+        generation = self._generation
+        me_level = self.get_me_level(config_category, name)
+        te_level = self.get_te_level(config_category, name)
+        
+        key = (category, name, me_level, te_level, quantity, variant)
+        result = self.requirement_cache.get(key)
+        if result is None:
+            result = calculate(me_level)
+            with self._memo_lock:
+                if generation == self._generation:
+                    self.requirement_cache.put(key, result)
+        
+        return dict(result)
+    
+    def _expand_order(self, orders: Iterable[Tuple[str, str, int]], runs_per_job: Optional[int],
+                      structure_bonus: float, rig_bonus: float):
+        """
+        Push a build order through the material graph with per-job rounding
+        
+        Args:
+            orders: Iterable of (category, name, quantity) tuples
+            runs_per_job: Runs per manufacturing job, or None for a single job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Tuple of (material graph, node ID -> total quantity of every node reached)
+        """
+        graph = self._get_material_graph()
+        
+        demand = {}
+        for category, name, quantity in orders:
+            node_id = graph.get_node_id(category, name)
+            if node_id is not None:
+                demand[node_id] = demand.get(node_id, 0) + quantity
+        
+        totals = graph.expand(demand, lambda node_id, amount: self._get_input_quantities(
+            node_id, amount, runs_per_job, structure_bonus, rig_bonus))
+        return graph, totals
+    
+    def _expand_item(self, category: str, name: str, quantity: int, runs_per_job: Optional[int],
+                     structure_bonus: float, rig_bonus: float):
+        """
+        Expand a single item into raw materials and intermediate components
+        
+        Args:
+            category: Registry collection of the item
+            name: Registry name of the item
+            quantity: Number of items to build
+            runs_per_job: Runs per manufacturing job, or None for a single job per item
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Tuple of (raw materials, intermediate components) for the whole quantity
+        """
+        graph, totals = self._expand_order([(category, name, quantity)], runs_per_job, structure_bonus, rig_bonus)
+        item_id = graph.get_node_id(category, name)
+        
+        raw = {}
+        intermediates = {}
+        for node_id, amount in totals.items():
+            if node_id == item_id or not amount:
+                continue
+            if graph.has_recipe(node_id):
+                intermediates[graph.names[node_id]] = amount
+            else:
+                raw[graph.names[node_id]] = amount
+        
+        return raw, intermediates
+    
+    def _resolve_pi_materials(self, raw: Dict[str, Union[int, float]]) -> Dict[str, Union[int, float]]:
+        """
+        Replace the PI goods among raw materials with the P0 resources they are made from
+        
+        The combined demand for all PI goods is resolved in one pass, so a P1
+        or P2 shared by several products is rounded to whole cycles once.
+        
+        Args:
+            raw: Dictionary of raw materials and quantities
+            
+        Returns:
+            Dictionary with every PI good replaced by P0 resources
+        """
+        chain = self.registry.get_pi_chain()
+        demand = {}
+        result = {}
+        for material, amount in raw.items():
+            node_id = chain.get_node_id(material)
+            if node_id is None:
+                result[material] = amount
+            else:
+                demand[node_id] = demand.get(node_id, 0) + math.ceil(amount)
+        
+        if demand:
+            units, _ = chain.resolve(demand)
+            for node_id, amount in units.items():
+                if chain.tiers[node_id] == 0 and amount:
+                    result[chain.names[node_id]] = result.get(chain.names[node_id], 0) + amount
+        
+        return result
+    
+    def _get_material_graph(self):
+        """
+        Get the registry's material graph, dropping memos built for an older graph
+        
+        Returns:
+            The registry's compiled MaterialGraph
+        """
+        graph = self.registry.get_material_graph()
+        with self._memo_lock:
+            if graph is not self._memo_graph:
+                # Nothing depends on the graph before the first one is seen
+                if self._memo_graph is not None:
+                    self.clear_expansion_cache()
+                self._memo_graph = graph
+        return graph
+    
+    def _get_input_quantities(self, node_id: int, amount: Union[int, float], runs_per_job: Optional[int],
+                              structure_bonus: float, rig_bonus: float) -> List[int]:
+        """
+        Get the total input quantities for building an amount of a material graph node
+        
+        The amount is split into jobs the same way as in _calculate_jobs().
+        
+        Args:
+            node_id: ID of the node in the registry's material graph
+            amount: Number of units to build, rounded up to whole runs
+            runs_per_job: Runs per manufacturing job, or None for a single job
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Total quantities, aligned with the node's inputs in the graph
+        """
+        runs = math.ceil(amount)
+        if not runs_per_job or runs_per_job >= runs:
+            return self._get_job_quantities(node_id, runs, structure_bonus, rig_bonus)
+        
+        full_jobs, remainder = divmod(runs, runs_per_job)
+        full_job = self._get_job_quantities(node_id, runs_per_job, structure_bonus, rig_bonus)
+        quantities = [quantity * full_jobs for quantity in full_job]
+        if remainder:
+            last_job = self._get_job_quantities(node_id, remainder, structure_bonus, rig_bonus)
+            quantities = [total + quantity for total, quantity in zip(quantities, last_job)]
+        return quantities
+    
+    def _get_job_quantities(self, node_id: int, runs: int, structure_bonus: float, rig_bonus: float) -> List[int]:
+        """
+        Get the input quantities of one manufacturing job of a material graph node
+        
+        Args:
+            node_id: ID of the node in the registry's material graph
+            runs: Number of runs in the job
+            structure_bonus: Structure material reduction as a percentage
+            rig_bonus: Rig material reduction as a percentage
+            
+        Returns:
+            Quantities with ME applied by _apply_job_material_efficiency(), aligned
+            with the node's inputs in the graph
+        """
+        key = (runs, structure_bonus, rig_bonus)
+        with self._memo_lock:
+            quantities = self._job_quantity_memo.get(node_id, {}).get(key)
+            generation = self._generation
+        if quantities is None:
+            graph = self._get_material_graph()
+            category, name = graph.items[node_id]
+            me_level = self.get_me_level(BLUEPRINT_CONFIG_CATEGORIES.get(category, category), name)
+            _, base_quantities = graph.get_inputs(node_id)
+            
+            # Inputs are keyed by position, so the graph order is kept
+            job = self._apply_job_material_efficiency(dict(enumerate(base_quantities)), runs, me_level,
+                                                      structure_bonus, rig_bonus)
+            quantities = [job[index] for index in range(len(base_quantities))]
+            with self._memo_lock:
+                if generation == self._generation:
+                    self._job_quantity_memo.setdefault(node_id, {})[key] = quantities
+        
+        return quantities
@@ -0,0 +1,605 @@
+"""
+Headless command line interface for EVE Production Calculator
+
+This module runs the calculator without importing any GUI code, so it can be
+used from scripts, build servers and cron jobs. Results are written to stdout
+as JSON or CSV; debug output goes to stderr.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from typing import Dict, List, Any, Optional, Tuple, TextIO, Union
+
+from core.data_loaders import load_registry
+from core.calculator import RequirementsCalculator
+from core.config.blueprint_config import load_blueprint_ownership, apply_blueprint_ownership
+from core.config.blueprint_config import set_blueprint_backend, query_blueprints
+from core.config.blueprint_db import CATEGORIES as BLUEPRINT_CATEGORIES
+from core.config.settings import load_settings
+from core.refining import calculate_reprocessing_yield
+from core.ore_solver import OBJECTIVES as ORE_MIX_OBJECTIVES
+from core.pi_chain import PI_LEVELS
+from core.pi_planner import PI_FACILITIES, DEFAULT_EXTRACTOR_UNITS_PER_HOUR
+from core.utils.debug import set_debug_mode, debug_print
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the headless commands
+
+    Returns:
+        The configured ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="Calculate EVE Online production requirements without the GUI"
+    )
+    parser.add_argument("--debug", action="store_true", help="Write debug output to stderr")
+    parser.add_argument("--format", choices=("json", "csv"), default="json", help="Output format (default: json)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    calc_parser = subparsers.add_parser("calc", help="Direct material requirements of an item")
+    calc_parser.add_argument("item", help="Registry or display name of the item")
+    calc_parser.add_argument("-q", "--quantity", type=int, default=1, help="Number of units to build")
+    calc_parser.add_argument("--runs-per-job", type=int, help="Runs per manufacturing job (default: from settings)")
+
+    expand_parser = subparsers.add_parser("expand", help="Requirements expanded down to raw materials")
+    expand_parser.add_argument("item", help="Registry or display name of the item")
+    expand_parser.add_argument("-q", "--quantity", type=int, default=1, help="Number of units to build")
+    expand_parser.add_argument("--intermediates", action="store_true",
+                               help="List the intermediate components instead of raw materials")
+    expand_parser.add_argument("--runs-per-job", type=int, help="Runs per manufacturing job (default: from settings)")
+
+    batch_parser = subparsers.add_parser("batch", help="Combined requirements of a list of orders")
+    batch_parser.add_argument("orders", nargs="?", default="-",
+                              help="File of orders as CSV (item,quantity[,me]) or JSON; '-' reads stdin")
+    batch_parser.add_argument("--expand", action="store_true", help="Expand the orders down to raw materials")
+    batch_parser.add_argument("--runs-per-job", type=int, help="Runs per manufacturing job (default: from settings)")
+
+    subparsers.add_parser("memory", help="Memory held by the loaded registry, per category and per item")
+
+    blueprints_parser = subparsers.add_parser("blueprints", help="List configured blueprints matching filters")
+    blueprints_parser.add_argument("--category", choices=BLUEPRINT_CATEGORIES, default="ship_blueprints",
+                                   help="Blueprint category (default: ship_blueprints)")
+    ownership_group = blueprints_parser.add_mutually_exclusive_group()
+    ownership_group.add_argument("--owned", dest="owned", action="store_true", default=None, help="Only owned blueprints")
+    ownership_group.add_argument("--unowned", dest="owned", action="store_false", help="Only unowned blueprints")
+    blueprints_parser.add_argument("--min-me", type=int, help="Lowest ME level to include")
+    blueprints_parser.add_argument("--max-me", type=int, help="Highest ME level to include")
+    blueprints_parser.add_argument("--min-te", type=int, help="Lowest TE level to include")
+    blueprints_parser.add_argument("--max-te", type=int, help="Highest TE level to include")
+
+    refine_parser = subparsers.add_parser("refine", help="Minerals produced by refining an ore inventory")
+    refine_parser.add_argument("inventory", nargs="?", default="-",
+                               help="CSV (ore,quantity) or JSON inventory file, '-' for stdin (default)")
+    refine_parser.add_argument("--efficiency", type=float,
+                               help="Reprocessing efficiency in percent (default: from the refining settings)")
+
+    ore_mix_parser = subparsers.add_parser("ore-mix", help="Cheapest ore mix that refines into a mineral list")
+    ore_mix_parser.add_argument("minerals", nargs="?", default="-",
+                                help="CSV (mineral,quantity) or JSON mineral list, '-' for stdin (default)")
+    ore_mix_parser.add_argument("--item", help="Use the raw materials of an item instead of a mineral list")
+    ore_mix_parser.add_argument("-q", "--quantity", type=int, default=1, help="Number of units of --item to build")
+    ore_mix_parser.add_argument("--objective", choices=ORE_MIX_OBJECTIVES, default="volume",
+                                help="Minimize the ore volume in m3 or the number of ore units (default: volume)")
+    ore_mix_parser.add_argument("--security", action="append",
+                                help="Only use ores of this security level, e.g. High-sec; may be repeated")
+    ore_mix_parser.add_argument("--efficiency", type=float,
+                                help="Reprocessing efficiency in percent (default: from the refining settings)")
+    ore_mix_parser.add_argument("--max-nodes", type=int,
+                                help="Stop the search for a cheaper mix after this many relaxations (default: 100)")
+
+    pi_plan_parser = subparsers.add_parser("pi-plan", help="Extractors, factories and planets for a daily PI output")
+    pi_plan_parser.add_argument("item", help="Registry or display name of the PI material")
+    pi_plan_parser.add_argument("--per-day", type=float, default=1.0, help="Units wanted per day (default: 1)")
+    pi_plan_parser.add_argument("--extractor-rate", type=float,
+                                help="P0 units per hour of one extractor (default: from settings)")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Manufacturing jobs of an order laid out over slots")
+    schedule_parser.add_argument("orders", nargs="?", default="-",
+                                 help="File of orders as CSV (item,quantity) or JSON; '-' reads stdin")
+    schedule_parser.add_argument("--item", help="Schedule a single item instead of an orders file")
+    schedule_parser.add_argument("-q", "--quantity", type=int, default=1, help="Number of units of --item to build")
+    schedule_parser.add_argument("--slots", type=int, help="Manufacturing slots (default: from settings)")
+    schedule_parser.add_argument("--runs-per-job", type=int, help="Runs per manufacturing job (default: from settings)")
+
+    return parser
+
+def _parse_order_number(value, field: str, minimum: int, maximum: Optional[int] = None) -> int:
+    """
+    Validate a quantity or ME level read from an orders file
+
+    Args:
+        value: Value from the file, an int or a string of digits
+        field: Name of the field, for the error message
+        minimum: Lowest allowed value
+        maximum: Highest allowed value, or None for no limit
+
+    Returns:
+        The value as an int
+
+    Raises:
+        ValueError: If the value is not a whole number in range
+    """
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{field} must be a whole number, got {value!r}")
+    if value < minimum or (maximum is not None and value > maximum):
+        limit = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise ValueError(f"{field} must be {limit}, got {value}")
+    return value
+
+def read_orders(stream: TextIO, source: str = '<stdin>') -> List[Tuple[str, int, Optional[int]]]:
+    """
+    Read batch orders from CSV or JSON text
+
+    JSON input is a list of objects with item, quantity and optional me keys,
+    or a list of [item, quantity, me] lists. Anything else is read as CSV rows
+    of item,quantity[,me]; blank lines and '#' comments are skipped, and the
+    first row is skipped as a header if its quantity is not a number.
+
+    Args:
+        stream: Text stream to read from
+        source: Name of the input, used in error messages
+
+    Returns:
+        List of (item, quantity, me_level) tuples, me_level None if not given
+
+    Raises:
+        ValueError: If the text is not valid JSON, or a row has no item, a
+            quantity below 1 or an ME level outside 0-10. The message starts
+            with "source:line:" (or "source: entry N:" for JSON lists).
+    """
+    text = stream.read()
+
+    if text.lstrip().startswith('['):
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{source}:{e.lineno}: invalid JSON: {e.msg}") from e
+
+        orders = []
+        for number, entry in enumerate(entries, 1):
+            try:
+                if isinstance(entry, dict):
+                    item, quantity, me_level = entry.get('item'), entry.get('quantity', 1), entry.get('me')
+                elif isinstance(entry, list) and entry:
+                    item = entry[0]
+                    quantity = entry[1] if len(entry) > 1 else 1
+                    me_level = entry[2] if len(entry) > 2 else None
+                else:
+                    raise ValueError("expected an object or a non-empty list")
+                if not isinstance(item, str) or not item.strip():
+                    raise ValueError("missing item name")
+                quantity = _parse_order_number(quantity, "quantity", 1)
+                if me_level is not None:
+                    me_level = _parse_order_number(me_level, "ME", 0, 10)
+            except ValueError as e:
+                raise ValueError(f"{source}: entry {number}: {e}") from None
+            orders.append((item.strip(), quantity, me_level))
+        return orders
+
+    orders = []
+    first_row = True
+    for line_number, line in enumerate(text.splitlines(), 1):
+        row = next(csv.reader([line]), [])
+        if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+            continue
+
+        item = row[0].strip()
+        quantity = row[1].strip() if len(row) > 1 else '1'
+        if first_row:
+            first_row = False
+            if not quantity.lstrip('-').isdigit():
+                # Header row such as "item,quantity,me"
+                continue
+
+        me_level = row[2].strip() if len(row) > 2 and row[2].strip() else None
+        try:
+            quantity = _parse_order_number(quantity, "quantity", 1)
+            if me_level is not None:
+                me_level = _parse_order_number(me_level, "ME", 0, 10)
+        except ValueError as e:
+            raise ValueError(f"{source}:{line_number}: {e}") from None
+        orders.append((item, quantity, me_level))
+
+    return orders
+
+def read_orders_file(path: str) -> List[Tuple[str, int, Optional[int]]]:
+    """
+    Read batch orders from a file, or from stdin for '-'
+
+    Args:
+        path: Path of the CSV or JSON file
+
+    Returns:
+        List of (item, quantity, me_level) tuples, as read_orders()
+
+    Raises:
+        OSError: If the file cannot be opened
+        ValueError: If a row is invalid, as read_orders()
+    """
+    if path == '-':
+        return read_orders(sys.stdin)
+    with open(path, 'r', encoding='utf-8') as f:
+        return read_orders(f, path)
+
+def write_requirements(requirements: Dict[str, Union[int, float]], output_format: str, stream: TextIO):
+    """
+    Write a requirements dictionary sorted by material name
+
+    Args:
+        requirements: Dictionary of materials and quantities
+        output_format: 'json' or 'csv'
+        stream: Text stream to write to
+    """
+    rows = sorted(requirements.items())
+
+    if output_format == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['material', 'quantity'])
+        writer.writerows(rows)
+    else:
+        json.dump(dict(rows), stream, indent=4)
+        stream.write('\n')
+
+def write_rows(rows: List[Dict[str, Any]], output_format: str, stream: TextIO):
+    """
+    Write a list of report rows
+
+    Args:
+        rows: List of dictionaries sharing the same keys
+        output_format: 'json' or 'csv'
+        stream: Text stream to write to
+    """
+    if output_format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=list(rows[0]) if rows else [], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows, stream, indent=4)
+        stream.write('\n')
+
+def format_duration(seconds: int) -> str:
+    """
+    Format a duration the way the game shows job times
+
+    Args:
+        seconds: Duration in seconds
+
+    Returns:
+        Text such as "2d 03:15:00", or "03:15:00" below a day
+    """
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    clock = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{days}d {clock}" if days else clock
+
+def report_memory(base_path: str, backend: str) -> List[Dict[str, Any]]:
+    """
+    Load the registry from the JSON sources and measure its memory
+
+    Args:
+        base_path: Base path of the application
+        backend: Registry backend to measure
+
+    Returns:
+        Report rows: one per category, a total, and the traced size of the whole load
+    """
+    from core import data_loaders
+    from core.utils.memory import registry_memory_report, measure_load
+
+    def load():
+        registry = load_registry(base_path, use_snapshot=False, backend=backend)
+        # The raw JSON cache is not part of the registry
+        data_loaders._json_cache.clear()
+        return registry
+
+    registry, current, peak = measure_load(load)
+    rows = registry_memory_report(registry)
+    items = rows[-1]['items']
+    rows.append({
+        'category': 'traced_load',
+        'items': items,
+        'bytes': current,
+        'bytes_per_item': round(current / items) if items else 0
+    })
+    debug_print(f"Peak memory while loading: {peak} bytes")
+    return rows
+
+def get_job_options(settings: Dict[str, Any], runs_per_job: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get the manufacturing job options for the calculator from the settings
+
+    Args:
+        settings: Settings dictionary
+        runs_per_job: Runs per job given on the command line, or None for the settings value
+
+    Returns:
+        Keyword arguments runs_per_job, structure_bonus and rig_bonus
+    """
+    if runs_per_job is None:
+        runs_per_job = settings.get('runs_per_job')
+    return {
+        'runs_per_job': runs_per_job or None,
+        'structure_bonus': float(settings.get('structure_me_bonus', 0.0)),
+        'rig_bonus': float(settings.get('rig_me_bonus', 0.0))
+    }
+
+def get_refining_efficiency(settings: Dict[str, Any]) -> float:
+    """
+    Get the reprocessing efficiency configured in the settings
+
+    Args:
+        settings: Settings dictionary
+
+    Returns:
+        Reprocessing efficiency in percent
+    """
+    return 100 * calculate_reprocessing_yield(
+        float(settings.get('refining_base_yield', 50.0)),
+        int(settings.get('reprocessing_skill', 0)),
+        int(settings.get('reprocessing_efficiency_skill', 0)),
+        int(settings.get('ore_processing_skill', 0)),
+        float(settings.get('refining_implant_bonus', 0.0))
+    )
+
+def run_headless(argv: List[str], base_path: str) -> int:
+    """
+    Run a headless command
+
+    Args:
+        argv: Command line arguments following --headless
+        base_path: Base path of the application
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    set_debug_mode(args.debug, sys.stderr)
+
+    start = time.perf_counter()
+    settings = load_settings(base_path)
+
+    if args.command == 'memory':
+        write_rows(report_memory(base_path, settings.get('registry_backend', 'objects')), args.format, sys.stdout)
+        return 0
+
+    set_blueprint_backend(settings.get('blueprint_backend', 'json'), base_path)
+
+    if args.command == 'blueprints':
+        write_rows(query_blueprints(load_blueprint_ownership(), args.category, owned=args.owned,
+                                    min_me=args.min_me, max_me=args.max_me,
+                                    min_te=args.min_te, max_te=args.max_te),
+                   args.format, sys.stdout)
+        return 0
+
+    registry = load_registry(base_path, backend=settings.get('registry_backend', 'objects'))
+    calculator = RequirementsCalculator(registry)
+
+    blueprint_config = load_blueprint_ownership()
+    apply_blueprint_ownership(blueprint_config, registry)
+    calculator.set_blueprint_config(blueprint_config)
+    debug_print(f"Registry loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.command == 'refine':
+        try:
+            inventory_rows = read_orders_file(args.inventory)
+        except OSError as e:
+            print(f"Cannot read {args.inventory}: {e.strerror}", file=sys.stderr)
+            return 1
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+        engine = calculator.get_refining_engine()
+        inventory = {}
+        for ore_name, quantity, _ in inventory_rows:
+            if engine.find_ore(ore_name) is None:
+                print(f"Unknown ore: {ore_name}", file=sys.stderr)
+                continue
+            inventory[ore_name] = inventory.get(ore_name, 0) + quantity
+        if inventory_rows and not inventory:
+            return 1
+
+        efficiency = args.efficiency
+        if efficiency is None:
+            efficiency = get_refining_efficiency(settings)
+        minerals, leftovers = calculator.refine_ore_inventory(inventory, efficiency)
+        for ore_name, units in sorted(leftovers.items()):
+            print(f"{units} units of {ore_name} left unrefined (below one portion)", file=sys.stderr)
+
+        write_requirements(minerals, args.format, sys.stdout)
+        debug_print(f"Finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+    if args.command == 'pi-plan':
+        if args.per_day <= 0:
+            print("Units per day must be a positive number", file=sys.stderr)
+            return 2
+        extractor_rate = args.extractor_rate
+        if extractor_rate is None:
+            extractor_rate = float(settings.get('pi_extractor_units_per_hour', DEFAULT_EXTRACTOR_UNITS_PER_HOUR))
+        plan = calculator.plan_pi_colony(args.item, args.per_day, extractor_rate)
+        if plan is None:
+            print(f"Unknown PI material: {args.item}", file=sys.stderr)
+            return 1
+        for resource in plan.missing:
+            print(f"No planet type offers {resource}", file=sys.stderr)
+
+        chain = registry.get_pi_chain()
+        rows = []
+        for material, rate in plan.rates.items():
+            level = PI_LEVELS[chain.tiers[chain.get_node_id(material)]]
+            rows.append({'material': material, 'tier': level, 'units_per_day': round(rate, 2),
+                         'facility': PI_FACILITIES[level], 'count': plan.facilities[material],
+                         'planet': plan.resource_planets.get(material, '')})
+        write_rows(rows, args.format, sys.stdout)
+        print(f"Planets: {', '.join(plan.planets) or 'none'}", file=sys.stderr)
+        debug_print(f"Finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+    if args.command == 'ore-mix':
+        if args.item is not None:
+            if args.quantity < 1:
+                print("Quantity must be a positive number", file=sys.stderr)
+                return 2
+            category, item = registry.find_by_name(args.item, registry.BUILDABLE_CATEGORIES)
+            if item is None:
+                print(f"Unknown item: {args.item}", file=sys.stderr)
+                return 1
+            minerals = calculator.expand_requirements(category, item.name, args.quantity, **get_job_options(settings))
+        else:
+            try:
+                mineral_rows = read_orders_file(args.minerals)
+            except OSError as e:
+                print(f"Cannot read {args.minerals}: {e.strerror}", file=sys.stderr)
+                return 1
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 2
+            minerals = {}
+            for mineral, quantity, _ in mineral_rows:
+                minerals[mineral] = minerals.get(mineral, 0) + quantity
+
+        engine = calculator.get_refining_engine()
+        for material in sorted(minerals):
+            if material not in engine.mineral_columns:
+                # An item's raw materials also list components, PI and moon materials
+                if args.item is None:
+                    print(f"Not refined from ore, skipped: {material}", file=sys.stderr)
+                else:
+                    debug_print(f"Not refined from ore, skipped: {material}")
+
+        efficiency = args.efficiency
+        if efficiency is None:
+            efficiency = get_refining_efficiency(settings)
+        if args.max_nodes is not None and args.max_nodes < 1:
+            print("Max nodes must be a positive number", file=sys.stderr)
+            return 2
+        mix = calculator.calculate_ore_mix(minerals, efficiency, args.objective, security_levels=args.security,
+                                           max_nodes=args.max_nodes)
+        if not mix.feasible:
+            print(f"No allowed ore yields: {', '.join(mix.missing)}", file=sys.stderr)
+            return 1
+        print(f"Search: {mix.status} after {mix.nodes} nodes, within {mix.gap * 100:.2f}% of the optimum",
+              file=sys.stderr)
+        for mineral, surplus in sorted(mix.surplus.items()):
+            print(f"{surplus} surplus {mineral}", file=sys.stderr)
+
+        rows = []
+        for ore_name, units in mix.ores.items():
+            volume = engine.volumes[engine.ore_rows[ore_name]]
+            rows.append({'ore': ore_name, 'portions': mix.portions[ore_name], 'units': units,
+                         'volume': round(units * volume, 2) if volume is not None else None})
+        write_rows(rows, args.format, sys.stdout)
+        debug_print(f"Finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+    if args.command == 'schedule':
+        if args.item is not None:
+            if args.quantity < 1:
+                print("Quantity must be a positive number", file=sys.stderr)
+                return 2
+            orders = [(args.item, args.quantity, None)]
+        else:
+            try:
+                orders = read_orders_file(args.orders)
+            except OSError as e:
+                print(f"Cannot read {args.orders}: {e.strerror}", file=sys.stderr)
+                return 1
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 2
+
+        slots = args.slots if args.slots is not None else int(settings.get('manufacturing_slots', 1))
+        if slots < 1:
+            print("Slots must be a positive number", file=sys.stderr)
+            return 2
+
+        resolved = []
+        for item_name, quantity, _ in orders:
+            category, item = registry.find_by_name(item_name, registry.BUILDABLE_CATEGORIES)
+            if item is None:
+                print(f"Unknown item: {item_name}", file=sys.stderr)
+                continue
+            resolved.append((category, item.name, quantity))
+        if orders and not resolved:
+            return 1
+
+        schedule = calculator.schedule_order(resolved, slots, **get_job_options(settings, args.runs_per_job))
+        for item_name in schedule.unknown:
+            print(f"No build time for {item_name}, scheduled as taking no time", file=sys.stderr)
+
+        write_rows([{'slot': job.slot + 1, 'item': job.display_name, 'runs': job.runs,
+                     'start': job.start, 'end': job.end, 'duration': job.duration}
+                    for job in schedule.jobs], args.format, sys.stdout)
+        print(f"Total time: {format_duration(schedule.makespan)} "
+              f"(lower bound {format_duration(schedule.lower_bound)})", file=sys.stderr)
+        for slot, utilization in enumerate(schedule.utilization, 1):
+            print(f"Slot {slot}: {utilization:.0%} busy", file=sys.stderr)
+        print(f"Critical path: {' -> '.join(schedule.critical_path) or 'none'} "
+              f"({format_duration(schedule.critical_path_time)})", file=sys.stderr)
+        debug_print(f"Finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return 0
+
+    if args.command == 'batch':
+        try:
+            orders = read_orders_file(args.orders)
+        except OSError as e:
+            print(f"Cannot read {args.orders}: {e.strerror}", file=sys.stderr)
+            return 1
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+        resolved = []
+        for item_name, quantity, me_level in orders:
+            category, item = registry.find_by_name(item_name, registry.BUILDABLE_CATEGORIES)
+            if item is None:
+                print(f"Unknown item: {item_name}", file=sys.stderr)
+                continue
+            resolved.append((category, item, quantity, me_level))
+        if orders and not resolved:
+            return 1
+
+        if args.expand:
+            requirements = calculator.expand_order([(category, item.name, quantity)
+                                                    for category, item, quantity, _ in resolved],
+                                                   **get_job_options(settings, args.runs_per_job))
+        else:
+            requirements = calculator.calculate_batch_requirements(
+                [(item.name, quantity, me_level) for _, item, quantity, me_level in resolved],
+                per_job=True, **get_job_options(settings, args.runs_per_job))
+    else:
+        if args.quantity < 1:
+            print("Quantity must be a positive number", file=sys.stderr)
+            return 2
+
+        category, item = registry.find_by_name(args.item)
+        if item is None:
+            print(f"Unknown item: {args.item}", file=sys.stderr)
+            return 1
+
+        if args.command == 'expand':
+            if category == 'pi_materials':
+                if args.intermediates:
+                    print("--intermediates is not supported for PI materials", file=sys.stderr)
+                    return 1
+                requirements = calculator.calculate_pi_requirements(item.name, args.quantity, expand=True)
+            else:
+                expand = calculator.expand_intermediates if args.intermediates else calculator.expand_requirements
+                requirements = expand(category, item.name, args.quantity, **get_job_options(settings, args.runs_per_job))
+        elif category == 'pi_materials':
+            requirements = calculator.calculate_pi_requirements(item.name, args.quantity)
+        else:
+            requirements = calculator.calculate_job_requirements(
+                category, item.name, args.quantity, **get_job_options(settings, args.runs_per_job))
+
+    write_requirements(requirements, args.format, sys.stdout)
+    debug_print(f"Finished in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
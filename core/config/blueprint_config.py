@@ -5,18 +5,474 @@ Handles saving and loading blueprint ownership status
 
 import os
 import json
+import time
+import atexit
+import weakref
+import threading
 from collections import defaultdict
 from core.utils.debug import debug_print
 
 # Constants
 CONFIG_FILENAME = "blueprint_ownership.json"
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'core', 'data', CONFIG_FILENAME)
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'core', 'data', CONFIG_FILENAME)
+
+# Append-only change log of (category, blueprint, attribute, value) records
+# replayed on top of CONFIG_FILE, which acts as the compacted snapshot
+JOURNAL_FILE = os.path.splitext(CONFIG_FILE)[0] + '.journal'
+
+# Journal size in bytes after which it is folded back into CONFIG_FILE
+JOURNAL_COMPACT_BYTES = 64 * 1024
+
+# Seconds a burst of blueprint edits is collected before it is written
+DEFAULT_SAVE_DELAY = 0.5
+
+# Version of the configuration layout; files stamped with it skip migration
+CONFIG_SCHEMA_VERSION = 1
+
+# Blueprint categories of unversioned files and the category they migrate to.
+# Where both a legacy and a current category exist, the current one wins.
+LEGACY_CATEGORIES = {
+    'ships': 'ship_blueprints',
+    'capital_ships': 'capital_ship_blueprints'
+}
+
+# Serializes read/merge/write cycles on the configuration file
+_file_lock = threading.RLock()
+
+# Callbacks notified as callback(category, blueprint_name) after a blueprint changes.
+# A category of None means the whole configuration may have changed.
+_change_listeners = []
+
+def add_blueprint_change_listener(callback):
+    """
+    Register a callback to be notified when blueprint settings change
+    
+    Bound methods are held weakly so listeners do not keep their owner alive.
+    
+    Args:
+        callback: Callable taking (category, blueprint_name)
+    """
+    if hasattr(callback, '__self__'):
+        _change_listeners.append(weakref.WeakMethod(callback))
+    else:
+        _change_listeners.append(lambda: callback)
+
+def notify_blueprint_changed(category=None, blueprint_name=None):
+    """
+    Notify listeners that a blueprint's settings changed
+    
+    Args:
+        category: Category of the blueprint, or None if the whole config changed
+        blueprint_name: Name of the blueprint, or None if the whole config changed
+    """
+    for reference in list(_change_listeners):
+        callback = reference()
+        if callback is None:
+            _change_listeners.remove(reference)
+            continue
+        try:
+            callback(category, blueprint_name)
+        except Exception as e:
+            debug_print(f"Error in blueprint change listener: {e}")
+
+class WriteBehindStore:
+    """
+    Coalescing background writer for blueprint configuration edits
+    
+    Edits only mark their blueprint attribute dirty. The first edit of a burst
+    opens a save window; when it closes, a background thread writes the latest
+    value of every dirty attribute in one pass. A burst of edits therefore
+    costs one write, and none of it runs on the UI thread.
+    """
+    
+    def __init__(self, write_function, delay=DEFAULT_SAVE_DELAY):
+        """
+        Initialize the store
+        
+        Args:
+            write_function: Callable taking a list of (category, blueprint, attribute, value)
+                records and returning True on success
+            delay: Save window in seconds; 0 writes every edit immediately
+        """
+        self.write_function = write_function
+        self.delay = delay
+        self._dirty = {}
+        self._deadline = None
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+    
+    def mark_dirty(self, category, blueprint_name, attribute, value):
+        """
+        Schedule a blueprint attribute to be written
+        
+        Args:
+            category: Category of the blueprint
+            blueprint_name: Name of the blueprint
+            attribute: The attribute that changed
+            value: Its new stored value
+        """
+        with self._condition:
+            self._dirty[(category, blueprint_name, attribute)] = value
+            write_now = self._closed or self.delay <= 0
+            if not write_now:
+                if self._deadline is None:
+                    self._deadline = time.monotonic() + self.delay
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="blueprint-config-writer", daemon=True)
+                    self._thread.start()
+                self._condition.notify()
+        
+        if write_now:
+            self.flush()
+    
+    def _run(self):
+        """Background loop writing dirty attributes once their save window closes"""
+        while True:
+            with self._condition:
+                while not self._closed and self._deadline is None:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+            self.flush()
+    
+    def flush(self):
+        """
+        Write all dirty attributes now
+        
+        Returns:
+            True if nothing was pending or the write succeeded
+        """
+        with self._flush_lock:
+            with self._condition:
+                dirty = self._dirty
+                self._dirty = {}
+                self._deadline = None
+            if not dirty:
+                return True
+            
+            records = [(category, blueprint_name, attribute, value)
+                       for (category, blueprint_name, attribute), value in dirty.items()]
+            success = self.write_function(records)
+            if not success:
+                # Keep the values for the next attempt unless they were edited again
+                with self._condition:
+                    for key, value in dirty.items():
+                        self._dirty.setdefault(key, value)
+            debug_print(f"Wrote {len(records)} pending blueprint change(s): " + ("ok" if success else "failed"))
+            return success
+    
+    def pending_count(self):
+        """Number of blueprint attributes waiting to be written"""
+        with self._condition:
+            return len(self._dirty)
+    
+    def close(self):
+        """
+        Stop the background writer and write everything still pending
+        
+        Returns:
+            True if the final flush succeeded
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self.flush()
+
+# Open BlueprintDatabase when the SQLite backend is selected, None for JSON
+_database = None
+
+def _write_blueprint_records(records):
+    """Persist written-behind records in the database or the journal"""
+    if _database is not None:
+        try:
+            with _file_lock:
+                _database.write_records(records)
+            return True
+        except Exception as e:
+            debug_print(f"Error writing blueprint changes to the database: {e}")
+            return False
+    return append_blueprint_journal(records)
+
+_write_behind = WriteBehindStore(_write_blueprint_records)
+atexit.register(_write_behind.close)
+
+# Set while a background compaction is running
+_compaction_running = threading.Event()
+
+def set_blueprint_backend(backend, base_path=None):
+    """
+    Select where the blueprint configuration is stored
+    
+    The first time the SQLite backend is selected, the existing JSON
+    configuration is imported into it.
+    
+    Args:
+        backend: "json" for the journaled JSON file, or "sqlite" for the database
+        base_path: Base path of the application (optional)
+    """
+    global _database
+    
+    _write_behind.flush()
+    if _database is not None:
+        _database.close()
+        _database = None
+    
+    if backend == "sqlite":
+        from core.config.blueprint_db import BlueprintDatabase, get_database_path
+        
+        if base_path is None:
+            base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        database = BlueprintDatabase(get_database_path(base_path))
+        if database.is_empty() and os.path.exists(CONFIG_FILE):
+            debug_print(f"Importing {CONFIG_FILE} into the blueprint database")
+            with _file_lock:
+                database.save_config(_load_json_blueprint_ownership())
+        _database = database
+        debug_print(f"Using blueprint database {database.path}")
+    elif backend != "json":
+        debug_print(f"Unknown blueprint backend '{backend}', using json")
+
+def query_blueprints(config, category, owned=None, invented=None, min_me=None, max_me=None, min_te=None, max_te=None):
+    """
+    Find the blueprints of a category matching the given filters
+    
+    With the SQLite backend the filter runs as an indexed SQL query after the
+    pending edits are written; otherwise the configuration dictionary is scanned.
+    
+    Args:
+        config: The blueprint configuration dictionary (used by the JSON backend)
+        category: Category of the blueprints (ship_blueprints, capital_ship_blueprints, ...)
+        owned: Only owned (True) or unowned (False) blueprints, None for both
+        invented: Only invented (True) or not invented (False), None for both
+        min_me: Lowest ME level to include
+        max_me: Highest ME level to include
+        min_te: Lowest TE level to include
+        max_te: Highest TE level to include
+        
+    Returns:
+        List of dictionaries with name, owned, invented, me and te, sorted by name
+    """
+    if _database is not None:
+        _write_behind.flush()
+        return _database.query(category, owned, invented, min_me, max_me, min_te, max_te)
+    
+    results = []
+    for name, data in sorted(config.get(category, {}).items()):
+        if not isinstance(data, dict):
+            continue
+        row = {'name': name, 'owned': bool(data.get('owned', False)), 'invented': bool(data.get('invented', False)),
+               'me': data.get('me', 0), 'te': data.get('te', 0)}
+        if ((owned is None or row['owned'] == owned) and
+                (invented is None or row['invented'] == invented) and
+                (min_me is None or row['me'] >= min_me) and (max_me is None or row['me'] <= max_me) and
+                (min_te is None or row['te'] >= min_te) and (max_te is None or row['te'] <= max_te)):
+            results.append(row)
+    return results
+
+def set_save_delay(seconds):
+    """
+    Set how long blueprint edits are collected before they are written
+    
+    Args:
+        seconds: Save window in seconds; 0 writes every edit immediately
+    """
+    _write_behind.delay = max(0.0, float(seconds))
+
+def flush_blueprint_changes():
+    """
+    Write all pending blueprint edits now
+    
+    Returns:
+        True if nothing was pending or the write succeeded
+    """
+    return _write_behind.flush()
+
+def close_blueprint_store():
+    """
+    Write all pending blueprint edits and stop the background writer
+    
+    Call this when the application closes. Later edits are written immediately.
+    
+    Returns:
+        True if the final write succeeded
+    """
+    return _write_behind.close()
+
+def append_blueprint_journal(records):
+    """
+    Append change records to the blueprint journal
+    
+    Each record is one JSON line, so an edit costs an append instead of a
+    rewrite of the whole configuration. Once the journal grows past
+    JOURNAL_COMPACT_BYTES it is compacted on a background thread.
+    
+    Args:
+        records: Iterable of (category, blueprint, attribute, value) tuples
+        
+    Returns:
+        True if the records were written
+    """
+    lines = "".join(
+        json.dumps({'category': category, 'blueprint': blueprint_name, 'attribute': attribute, 'value': value}) + "\n"
+        for category, blueprint_name, attribute, value in records
+    )
+    try:
+        with _file_lock:
+            os.makedirs(os.path.dirname(JOURNAL_FILE), exist_ok=True)
+            with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+                journal_size = f.tell()
+    except Exception as e:
+        debug_print(f"Error appending to blueprint journal: {e}")
+        return False
+    
+    if journal_size > JOURNAL_COMPACT_BYTES and not _compaction_running.is_set():
+        _compaction_running.set()
+        threading.Thread(target=_compact_in_background, name="blueprint-journal-compaction", daemon=True).start()
+    return True
+
+def replay_blueprint_journal(config):
+    """
+    Apply the journal's change records to a configuration loaded from the snapshot
+    
+    A torn last line from an interrupted append is skipped.
+    
+    Args:
+        config: The blueprint configuration dictionary to update in place
+        
+    Returns:
+        Number of records applied
+    """
+    if not os.path.exists(JOURNAL_FILE):
+        return 0
+    
+    applied = 0
+    with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                category = record['category']
+                blueprint_name = record['blueprint']
+                attribute = record['attribute']
+                value = record['value']
+            except (ValueError, KeyError, TypeError):
+                debug_print("Skipping unreadable blueprint journal record")
+                continue
+            
+            entry = config.setdefault(category, {}).setdefault(blueprint_name, _default_blueprint_entry())
+            entry[attribute] = value
+            applied += 1
+    return applied
+
+def _default_blueprint_entry():
+    """Settings of a blueprint without an entry"""
+    return {
+        'owned': False,
+        'invented': False,
+        'me': 0,  # Default ME% is 0
+        'te': 0   # Default TE% is 0
+    }
+
+def _read_config_file():
+    """
+    Read the snapshot and replay the journal on top (caller holds _file_lock)
+    
+    Raises:
+        ValueError: If the snapshot exists but cannot be read. It is then left
+            untouched, as writing the journal over an empty configuration would
+            lose every blueprint it holds.
+    """
+    config = {}
+    if os.path.exists(CONFIG_FILE):
+        try:
+            with open(CONFIG_FILE, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Blueprint configuration {CONFIG_FILE} is unreadable, not replacing it: {e}") from e
+        if not isinstance(config, dict):
+            raise ValueError(f"Blueprint configuration {CONFIG_FILE} is not a JSON object, not replacing it")
+    replay_blueprint_journal(config)
+    return config
+
+def _fsync_directory(path):
+    """Make a rename inside a directory durable; not supported on every platform"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _write_config_file(config):
+    """
+    Atomically replace the snapshot and empty the journal (caller holds _file_lock)
+    
+    The snapshot is written to a temporary file and moved into place, so a
+    crash never leaves a truncated configuration behind. The journal is
+    emptied the same way, and both renames are synced, so an old journal can
+    never be replayed over the newer snapshot after a crash.
+    """
+    config_directory = os.path.dirname(CONFIG_FILE)
+    os.makedirs(config_directory, exist_ok=True)
+    temp_file = CONFIG_FILE + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(config, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, CONFIG_FILE)
+    _fsync_directory(config_directory)
+    
+    # Every journal record is now part of the snapshot
+    if os.path.exists(JOURNAL_FILE):
+        empty_journal = JOURNAL_FILE + '.tmp'
+        with open(empty_journal, 'w') as f:
+            os.fsync(f.fileno())
+        os.replace(empty_journal, JOURNAL_FILE)
+        _fsync_directory(os.path.dirname(JOURNAL_FILE))
+
+def compact_blueprint_journal():
+    """
+    Fold the journal into the snapshot and empty it
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with _file_lock:
+            _write_config_file(_read_config_file())
+        debug_print("Blueprint journal compacted")
+        return True
+    except Exception as e:
+        debug_print(f"Error compacting blueprint journal: {e}")
+        return False
+
+def _compact_in_background():
+    """Thread target for compaction triggered by journal growth"""
+    try:
+        compact_blueprint_journal()
+    finally:
+        _compaction_running.clear()
 
 def create_default_blueprint_config():
     """
     Create default blueprint configuration structure
     """
     return {
+        'schema_version': CONFIG_SCHEMA_VERSION,
         'ship_blueprints': {},
         'capital_ship_blueprints': {},
         'components': {},
@@ -25,7 +481,23 @@ def create_default_blueprint_config():
 
 def load_blueprint_ownership():
     """
-    Load blueprint ownership configuration from file
+    Load blueprint ownership configuration from the selected backend
+    """
+    if _database is not None:
+        try:
+            with _file_lock:
+                config = create_default_blueprint_config()
+                config.update(_database.load())
+            debug_print(f"Loaded configuration from {_database.path}")
+            return config
+        except Exception as e:
+            debug_print(f"Error loading blueprint database: {e}")
+            return create_default_blueprint_config()
+    return _load_json_blueprint_ownership()
+
+def _load_json_blueprint_ownership():
+    """
+    Load blueprint ownership configuration from the JSON file and its journal
     """
     try:
         # Check if file exists
@@ -33,10 +505,16 @@ def load_blueprint_ownership():
             debug_print("Loading blueprint ownership from file...")
             # Read from existing file
             try:
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
+                with _file_lock:
+                    with open(CONFIG_FILE, 'r') as f:
+                        config = json.load(f)
                     debug_print(f"Loaded configuration from {CONFIG_FILE}")
                     
+                    # Apply the edits journaled since the last compaction
+                    replayed = replay_blueprint_journal(config)
+                    if replayed:
+                        debug_print(f"Replayed {replayed} blueprint journal record(s)")
+                    
                     # Verify if any ships are set to owned
                     owned_ships = []
                     for ship_name, ship_data in config.get('ship_blueprints', {}).items():
@@ -48,7 +526,16 @@ def load_blueprint_ownership():
                     else:
                         debug_print("No owned ships found in loaded configuration")
                     
-                    return migrate_blueprint_config(config)
+                    if config.get('schema_version') == CONFIG_SCHEMA_VERSION:
+                        # Current layout: no copy and no rewrite
+                        for category, entries in create_default_blueprint_config().items():
+                            config.setdefault(category, entries)
+                        return config
+                    
+                    debug_print(f"Migrating blueprint configuration to schema version {CONFIG_SCHEMA_VERSION}")
+                    config = migrate_blueprint_config(config)
+                    _write_config_file(config)
+                    return config
             except Exception as e:
                 debug_print(f"Error loading blueprint configuration: {e}")
                 return create_default_blueprint_config()
@@ -71,22 +558,29 @@ def save_blueprint_ownership(config):
     Returns:
         True if successful, False otherwise
     """
-    try:
-        # Ensure the configuration directory exists
-        os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-        
-        # First, try to read the existing config to merge with new changes
-        existing_config = {}
-        if os.path.exists(CONFIG_FILE):
+    with _file_lock:
+        if _database is not None:
             try:
-                with open(CONFIG_FILE, 'r') as existing_file:
-                    existing_config = json.load(existing_file)
+                _database.save_config(config)
+                return True
             except Exception as e:
-                debug_print(f"Could not read existing config file (will create new): {e}")
+                debug_print(f"Error saving blueprint configuration to the database: {e}")
+                return False
+        return _save_blueprint_ownership(config)
+
+def _save_blueprint_ownership(config):
+    """Merge a configuration into the configuration file (caller holds _file_lock)"""
+    try:
+        # Start from the current snapshot plus journal to merge with new changes
+        existing_config = _read_config_file()
                 
         # Carefully merge configs to preserve ownership settings
         # For each category in the new config
         for category, category_data in config.items():
+            if not isinstance(category_data, dict):
+                # Scalar settings such as schema_version
+                existing_config[category] = category_data
+                continue
             if category not in existing_config:
                 existing_config[category] = {}
                 
@@ -101,10 +595,9 @@ def save_blueprint_ownership(config):
                     for key, value in item_data.items():
                         existing_config[category][item_name][key] = value
         
-        # Save the merged configuration
+        # Save the merged configuration, which also compacts the journal
         debug_print(f"Attempting to save blueprint configuration...")
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(existing_config, f, indent=4)
+        _write_config_file(existing_config)
         debug_print(f"Blueprint configuration saved successfully to: {CONFIG_FILE}")
         return True
     except Exception as e:
@@ -128,12 +621,7 @@ def update_blueprint_attribute(config, category, blueprint_name, attribute, valu
     
     # If blueprint doesn't exist in config, create it with defaults
     if blueprint_name not in config[category]:
-        config[category][blueprint_name] = {
-            'owned': False,
-            'invented': False,
-            'me': 0,  # Default ME% is 0
-            'te': 0   # Default TE% is 0
-        }
+        config[category][blueprint_name] = _default_blueprint_entry()
     
     # Handle special case for 'owned' which takes a string but stores a boolean
     if attribute == 'owned':
@@ -141,9 +629,11 @@ def update_blueprint_attribute(config, category, blueprint_name, attribute, valu
     else:
         config[category][blueprint_name][attribute] = value
     
-    # Save the updated config
-    success = save_blueprint_ownership(config)
-    debug_print("Configuration " + ("saved successfully." if success else "failed to save."))
+    # Let dependents such as the calculator's requirement cache react
+    notify_blueprint_changed(category, blueprint_name)
+    
+    # Queue the change for the background writer, which appends it to the journal
+    _write_behind.mark_dirty(category, blueprint_name, attribute, config[category][blueprint_name][attribute])
     
     return config
 
@@ -285,16 +775,16 @@ def apply_blueprint_ownership(config, registry):
     
     owned_counts = {'ships': 0, 'capital_ships': 0}
     
-    # Map config categories to registry attributes and status attribute names
+    # Map config categories to registry attributes
     mappings = [
-        ('ship_blueprints', 'ships', 'owned_status'),
-        ('capital_ship_blueprints', 'capital_ships', 'owned_status'),
-        ('components', 'components', 'owned_status'),
-        ('component_blueprints', 'capital_components', 'blueprint_owned')
+        ('ship_blueprints', 'ships'),
+        ('capital_ship_blueprints', 'capital_ships'),
+        ('components', 'components'),
+        ('component_blueprints', 'capital_components')
     ]
     
     # Apply ownership status for each category
-    for config_category, registry_attr, status_attr in mappings:
+    for config_category, registry_attr in mappings:
         if config_category in config and hasattr(registry, registry_attr):
             registry_dict = getattr(registry, registry_attr)
             debug_print(f"Processing {len(config[config_category])} items in {config_category}")
@@ -302,7 +792,7 @@ def apply_blueprint_ownership(config, registry):
             for item_name, item_data in config[config_category].items():
                 if item_name in registry_dict:
                     owned_value = item_data.get('owned', False)
-                    setattr(registry_dict[item_name], status_attr, owned_value)
+                    registry.set_owned_status(registry_attr, item_name, owned_value)
                     
                     # Count owned ships for reporting
                     if owned_value and registry_attr in ['ships', 'capital_ships']:
@@ -313,202 +803,75 @@ def apply_blueprint_ownership(config, registry):
     
     debug_print(f"Blueprint ownership application complete: {owned_counts['ships']} owned ships, "
                 f"{owned_counts['capital_ships']} owned capital ships")
+    
+    # Bulk edits bypass update_blueprint_attribute, so treat this as a full change
+    notify_blueprint_changed()
 
 def migrate_blueprint_config(config):
     """
-    Migrate old blueprint configuration format to new format
+    Migrate an older blueprint configuration to the current schema
+    
+    Legacy category names are mapped to their current ones, '_data' suffixes
+    are removed from blueprint names, and boolean or string entries become
+    full dictionaries. The result is stamped with CONFIG_SCHEMA_VERSION.
     
     Args:
-        config: Old configuration dictionary
+        config: Configuration dictionary in any earlier format
     
     Returns:
-        Updated configuration dictionary
+        New configuration dictionary in the current format
     """
     new_config = create_default_blueprint_config()
     
-    # Function to clean up keys (remove _data suffix if present)
-    def clean_key(key):
-        if key.endswith('_data'):
-            return key[:-5]  # Remove _data suffix
-        return key
-    
-    # Migrate ships
-    if 'ships' in config:
-        # Create a clean ships dictionary without duplicates
-        clean_ships = {}
-        for ship_name, ship_data in config['ships'].items():
-            clean_name = clean_key(ship_name)
-            
-            # Convert legacy boolean format to dictionary
-            new_data = {}
-            if isinstance(ship_data, bool):
-                new_data = {
-                    'owned': ship_data,
-                    'invented': False,
-                    'me': 0,
-                    'te': 0
-                }
-            # Convert legacy string format to dictionary
-            elif isinstance(ship_data, str):
-                new_data = {
-                    'owned': ship_data == 'Owned',
-                    'invented': ship_data == 'Invented',
-                    'me': 0,
-                    'te': 0
-                }
-            # Modern format - copy the dictionary
-            elif isinstance(ship_data, dict):
-                new_data = ship_data.copy()
-                # Ensure all expected keys exist
-                if 'owned' not in new_data:
-                    new_data['owned'] = False
-                if 'invented' not in new_data:
-                    new_data['invented'] = False
-                if 'me' not in new_data:
-                    new_data['me'] = 0
-                if 'te' not in new_data:
-                    new_data['te'] = 0
-            
-            # Store with clean name, overwriting any duplicates with the same clean name
-            clean_ships[clean_name] = new_data
-            
-        # Replace ships in new_config with cleaned dictionary
-        new_config['ship_blueprints'] = clean_ships
-    
-    # Migrate capital ships
-    if 'capital_ships' in config:
-        # Create a clean capital ships dictionary without duplicates
-        clean_cap_ships = {}
-        for ship_name, ship_data in config['capital_ships'].items():
-            clean_name = clean_key(ship_name)
-            
-            # Convert legacy boolean format to dictionary
-            new_data = {}
-            if isinstance(ship_data, bool):
-                new_data = {
-                    'owned': ship_data,
-                    'invented': False,
-                    'me': 0,
-                    'te': 0
-                }
-            # Convert legacy string format to dictionary
-            elif isinstance(ship_data, str):
-                new_data = {
-                    'owned': ship_data == 'Owned',
-                    'invented': ship_data == 'Invented',
-                    'me': 0,
-                    'te': 0
-                }
-            # Modern format - copy the dictionary
-            elif isinstance(ship_data, dict):
-                new_data = ship_data.copy()
-                # Ensure all expected keys exist
-                if 'owned' not in new_data:
-                    new_data['owned'] = False
-                if 'invented' not in new_data:
-                    new_data['invented'] = False
-                if 'me' not in new_data:
-                    new_data['me'] = 0
-                if 'te' not in new_data:
-                    new_data['te'] = 0
-            
-            # Store with clean name, overwriting any duplicates with the same clean name
-            clean_cap_ships[clean_name] = new_data
-            
-        # Replace capital_ships in new_config with cleaned dictionary
-        new_config['capital_ship_blueprints'] = clean_cap_ships
-    
-    # Migrate components
-    if 'components' in config:
-        # Create a clean components dictionary without duplicates
-        clean_components = {}
-        for component_name, component_data in config['components'].items():
-            clean_name = clean_key(component_name)
-            
-            # Convert legacy boolean format to dictionary
-            new_data = {}
-            if isinstance(component_data, bool):
-                new_data = {
-                    'owned': component_data,
-                    'invented': False,
-                    'me': 0,
-                    'te': 0
-                }
-            # Convert legacy string format to dictionary
-            elif isinstance(component_data, str):
-                new_data = {
-                    'owned': component_data == 'Owned',
-                    'invented': component_data == 'Invented',
-                    'me': 0,
-                    'te': 0
-                }
-            # Modern format - copy the dictionary
-            elif isinstance(component_data, dict):
-                new_data = component_data.copy()
-                # Ensure all expected keys exist
-                if 'owned' not in new_data:
-                    new_data['owned'] = False
-                if 'invented' not in new_data:
-                    new_data['invented'] = False
-                if 'me' not in new_data:
-                    new_data['me'] = 0
-                if 'te' not in new_data:
-                    new_data['te'] = 0
-            
-            # Store with clean name, overwriting any duplicates with the same clean name
-            clean_components[clean_name] = new_data
-            
-        # Replace components in new_config with cleaned dictionary
-        new_config['components'] = clean_components
-    
-    # Migrate component blueprints
-    if 'component_blueprints' in config:
-        # Create a clean component blueprints dictionary without duplicates
-        clean_component_blueprints = {}
-        for blueprint_name, blueprint_data in config['component_blueprints'].items():
-            clean_name = clean_key(blueprint_name)
-            
-            # Convert legacy boolean format to dictionary
-            new_data = {}
-            if isinstance(blueprint_data, bool):
-                new_data = {
-                    'owned': blueprint_data,
-                    'invented': False,
-                    'me': 0,
-                    'te': 0
-                }
-            # Convert legacy string format to dictionary
-            elif isinstance(blueprint_data, str):
-                new_data = {
-                    'owned': blueprint_data == 'Owned',
-                    'invented': blueprint_data == 'Invented',
-                    'me': 0,
-                    'te': 0
-                }
-            # Modern format - copy the dictionary
-            elif isinstance(blueprint_data, dict):
-                new_data = blueprint_data.copy()
-                # Ensure all expected keys exist
-                if 'owned' not in new_data:
-                    new_data['owned'] = False
-                if 'invented' not in new_data:
-                    new_data['invented'] = False
-                if 'me' not in new_data:
-                    new_data['me'] = 0
-                if 'te' not in new_data:
-                    new_data['te'] = 0
-            
-            # Store with clean name, overwriting any duplicates with the same clean name
-            clean_component_blueprints[clean_name] = new_data
-            
-        # Replace component_blueprints in new_config with cleaned dictionary
-        new_config['component_blueprints'] = clean_component_blueprints
+    # Legacy categories first, so current categories override them
+    sources = [(legacy, current) for legacy, current in LEGACY_CATEGORIES.items()]
+    sources += [(category, category) for category in new_config if category != 'schema_version']
     
-    # Save the migrated configuration to ensure it's cleaned up
-    success = save_blueprint_ownership(new_config)
-    if success:
-        debug_print("Configuration saved successfully.")
-    else:
-        debug_print("Failed to save configuration.")
+    for source_category, target_category in sources:
+        entries = config.get(source_category)
+        if not isinstance(entries, dict):
+            continue
+        for blueprint_name, blueprint_data in entries.items():
+            new_data = _migrate_blueprint_entry(blueprint_data)
+            if new_data is not None:
+                # Store with clean name, overwriting any duplicates with the same clean name
+                new_config[target_category][_clean_blueprint_name(blueprint_name)] = new_data
     
     return new_config
+
+def _clean_blueprint_name(name):
+    """Remove the '_data' suffix older files added to blueprint names"""
+    if name.endswith('_data'):
+        return name[:-5]
+    return name
+
+def _migrate_blueprint_entry(blueprint_data):
+    """
+    Convert one blueprint entry of any earlier format to a full dictionary
+    
+    Args:
+        blueprint_data: Legacy boolean, legacy 'Owned'/'Invented' string, or dictionary
+        
+    Returns:
+        Entry dictionary with owned, invented, me and te, or None if unreadable
+    """
+    # Convert legacy boolean format to dictionary
+    if isinstance(blueprint_data, bool):
+        new_data = _default_blueprint_entry()
+        new_data['owned'] = blueprint_data
+        return new_data
+    
+    # Convert legacy string format to dictionary
+    if isinstance(blueprint_data, str):
+        new_data = _default_blueprint_entry()
+        new_data['owned'] = blueprint_data == 'Owned'
+        new_data['invented'] = blueprint_data == 'Invented'
+        return new_data
+    
+    # Modern format - copy the dictionary and ensure all expected keys exist
+    if isinstance(blueprint_data, dict):
+        new_data = _default_blueprint_entry()
+        new_data.update(blueprint_data)
+        return new_data
+    
+    return None
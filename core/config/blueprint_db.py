@@ -0,0 +1,196 @@
+"""
+SQLite blueprint configuration backend for EVE Production Calculator
+
+Stores blueprint ownership, invention, ME and TE in one indexed table per
+configuration category. The calculator and the GUI keep working on the
+configuration dictionary; this backend only replaces how it is loaded, how
+edits are persisted, and lets filters such as "owned ships with ME below 10"
+run as SQL.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from core.utils.debug import debug_print
+
+DATABASE_FILENAME = "blueprint_ownership.db"
+
+# Configuration categories, each stored in a table of the same name
+CATEGORIES = ('ship_blueprints', 'capital_ship_blueprints', 'components', 'component_blueprints')
+
+# Blueprint attributes, stored as one integer column each
+ATTRIBUTES = ('owned', 'invented', 'me', 'te')
+
+def get_database_path(base_path: str) -> str:
+    """
+    Get the path of the blueprint database
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        Absolute path of the database file
+    """
+    return os.path.join(base_path, 'core', 'data', DATABASE_FILENAME)
+
+class BlueprintDatabase:
+    """SQLite store of blueprint settings, one table per configuration category"""
+
+    def __init__(self, path: str):
+        """
+        Open the database, creating the tables and indexes if needed
+
+        Args:
+            path: Path of the database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Edits are written from the write-behind thread, reads from the UI thread
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+
+        with self._lock, self._connection:
+            for category in CATEGORIES:
+                self._connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{category}" ('
+                    'name TEXT PRIMARY KEY, '
+                    'owned INTEGER NOT NULL DEFAULT 0, '
+                    'invented INTEGER NOT NULL DEFAULT 0, '
+                    'me INTEGER NOT NULL DEFAULT 0, '
+                    'te INTEGER NOT NULL DEFAULT 0)'
+                )
+                self._connection.execute(f'CREATE INDEX IF NOT EXISTS "{category}_owned_me" ON "{category}" (owned, me)')
+                self._connection.execute(f'CREATE INDEX IF NOT EXISTS "{category}_te" ON "{category}" (te)')
+
+    def is_empty(self) -> bool:
+        """
+        Check whether no blueprint has been stored yet
+
+        Returns:
+            True if every category table is empty
+        """
+        with self._lock:
+            return not any(self._connection.execute(f'SELECT 1 FROM "{category}" LIMIT 1').fetchone()
+                           for category in CATEGORIES)
+
+    def load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Read the whole configuration
+
+        Returns:
+            Blueprint configuration dictionary in the same format as the JSON file
+        """
+        config = {}
+        with self._lock:
+            for category in CATEGORIES:
+                rows = self._connection.execute(f'SELECT name, owned, invented, me, te FROM "{category}"')
+                config[category] = {
+                    name: {'owned': bool(owned), 'invented': bool(invented), 'me': me, 'te': te}
+                    for name, owned, invented, me, te in rows
+                }
+        return config
+
+    def write_records(self, records: Iterable[Tuple[str, str, str, Any]]) -> int:
+        """
+        Apply (category, blueprint, attribute, value) change records in one transaction
+
+        Args:
+            records: Change records as produced by the write-behind store
+
+        Returns:
+            Number of records applied
+        """
+        statements = []
+        for category, blueprint_name, attribute, value in records:
+            if category not in CATEGORIES or attribute not in ATTRIBUTES:
+                debug_print(f"Skipping blueprint change for unknown {category}/{attribute}")
+                continue
+            statements.append((
+                f'INSERT INTO "{category}" (name, {attribute}) VALUES (?, ?) '
+                f'ON CONFLICT(name) DO UPDATE SET {attribute} = excluded.{attribute}',
+                (blueprint_name, int(value))
+            ))
+
+        with self._lock, self._connection:
+            for sql, parameters in statements:
+                self._connection.execute(sql, parameters)
+        return len(statements)
+
+    def save_config(self, config: Dict[str, Any]) -> int:
+        """
+        Upsert every blueprint of a configuration in one transaction
+
+        Blueprints missing from the configuration are kept, like the merge done
+        for the JSON file.
+
+        Args:
+            config: Blueprint configuration dictionary
+
+        Returns:
+            Number of blueprints written
+        """
+        written = 0
+        with self._lock, self._connection:
+            for category in CATEGORIES:
+                entries = config.get(category)
+                if not isinstance(entries, dict):
+                    continue
+                rows = [
+                    (name, int(bool(data.get('owned', False))), int(bool(data.get('invented', False))),
+                     int(data.get('me', 0)), int(data.get('te', 0)))
+                    for name, data in entries.items() if isinstance(data, dict)
+                ]
+                self._connection.executemany(
+                    f'INSERT INTO "{category}" (name, owned, invented, me, te) VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET owned = excluded.owned, invented = excluded.invented, '
+                    'me = excluded.me, te = excluded.te',
+                    rows
+                )
+                written += len(rows)
+        return written
+
+    def query(self, category: str, owned: Optional[bool] = None, invented: Optional[bool] = None,
+              min_me: Optional[int] = None, max_me: Optional[int] = None,
+              min_te: Optional[int] = None, max_te: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find the blueprints of a category matching the given filters
+
+        Args:
+            category: Configuration category to search
+            owned: Only owned (True) or unowned (False) blueprints, None for both
+            invented: Only invented (True) or not invented (False), None for both
+            min_me: Lowest ME level to include
+            max_me: Highest ME level to include
+            min_te: Lowest TE level to include
+            max_te: Highest TE level to include
+
+        Returns:
+            List of dictionaries with name, owned, invented, me and te, sorted by name
+        """
+        if category not in CATEGORIES:
+            raise ValueError(f"Unknown blueprint category: {category}")
+
+        conditions = []
+        parameters = []
+        for column, operator, value in (('owned', '=', owned), ('invented', '=', invented),
+                                        ('me', '>=', min_me), ('me', '<=', max_me),
+                                        ('te', '>=', min_te), ('te', '<=', max_te)):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                parameters.append(int(value))
+
+        sql = f'SELECT name, owned, invented, me, te FROM "{category}"'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY name'
+
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [{'name': name, 'owned': bool(owned_value), 'invented': bool(invented_value), 'me': me, 'te': te}
+                for name, owned_value, invented_value, me, te in rows]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
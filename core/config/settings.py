@@ -17,7 +17,28 @@ def get_default_settings():
         "window_size": {
             "width": 900, 
             "height": 800
-        }
+        },
+        # Manufacturing job settings (bonuses are material reductions in percent)
+        "runs_per_job": 0,  # 0 builds the whole quantity as a single job
+        "manufacturing_slots": 1,  # Parallel manufacturing jobs available for build schedules
+        "structure_me_bonus": 0.0,
+        "rig_me_bonus": 0.0,
+        # Registry storage: "objects" keeps every item in memory, "mmap" maps
+        # a columnar item store and creates items on access (large datasets)
+        "registry_backend": "objects",
+        # Milliseconds blueprint edits are collected before they are written
+        "config_save_delay_ms": 500,
+        # Blueprint configuration storage: "json" (journaled JSON file) or "sqlite"
+        "blueprint_backend": "json",
+        # Ore reprocessing: facility base yield in percent (rigs, security and
+        # structure bonuses included), skill levels and implant bonus in percent
+        "refining_base_yield": 50.0,
+        "reprocessing_skill": 0,
+        "reprocessing_efficiency_skill": 0,
+        "ore_processing_skill": 0,
+        "refining_implant_bonus": 0.0,
+        # PI colony planning: P0 units one extractor control unit delivers per hour
+        "pi_extractor_units_per_hour": 5000
     }
 
 def load_settings(base_path=None):
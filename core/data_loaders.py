@@ -4,6 +4,7 @@ Data loaders for EVE Production Calculator
 This file contains functions for loading data from JSON files into the module registry
 """
 import os
+import re
 import json
 import importlib.util
 import sys
@@ -13,6 +14,8 @@ import glob
 from pathlib import Path
 
 from core.module_registry import ModuleRegistry
+from core.data_snapshot import load_snapshot, save_snapshot
+from core.pi_chain import PI_LEVELS, PI_INPUT_QUANTITIES, PI_BATCH_SIZES, PI_CYCLE_TIMES, get_pi_tier
 from core.models import ShipModule, CapitalShipModule, ComponentModule, PiMaterialModule
 
 # Cache for loaded JSON data to avoid repeated file reads
@@ -43,6 +46,51 @@ def _load_json_file(file_path: str) -> Dict[str, Any]:
         debug_print(f"Error loading file {file_path}: {str(e)}")
         return {}
 
+# One "<number><unit>" part of a build time such as "~2d 18h 40m"
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)\s*(days?|d|hours?|h|minutes?|min|m|seconds?|sec|s)\b', re.IGNORECASE)
+_UNIT_SECONDS = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+
+# "Base Build Time: ~18m" or "Build Time: ~3h;" inside a ship's details text
+_DETAILS_BUILD_TIME = re.compile(r'Build Time:\s*([^\n;]+)')
+
+def parse_build_time(text: Any) -> Optional[int]:
+    """
+    Parse a build time such as "3h 12m", "~18m" or "~14 days" into seconds
+    
+    Args:
+        text: Build time text, or a number of seconds
+        
+    Returns:
+        Build time in whole seconds, or None if the text holds no duration
+    """
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return int(text)
+    if not isinstance(text, str):
+        return None
+    
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    return int(round(sum(float(amount) * _UNIT_SECONDS[unit[0].lower()] for amount, unit in parts)))
+
+def _get_build_time(data: Dict[str, Any], details: str) -> Optional[int]:
+    """
+    Get the base build time of an item from its build_time field or its details text
+    
+    Args:
+        data: Item data dictionary
+        details: Details text of the item
+        
+    Returns:
+        Build time in seconds, or None if the data has none
+    """
+    build_time = parse_build_time(data.get('build_time'))
+    if build_time is None and details:
+        match = _DETAILS_BUILD_TIME.search(details)
+        if match:
+            build_time = parse_build_time(match.group(1))
+    return build_time
+
 def _process_array_ships(registry: ModuleRegistry, ships_data: List[Dict], faction: str) -> int:
     """
     Process ships data in array format
@@ -61,15 +109,16 @@ def _process_array_ships(registry: ModuleRegistry, ships_data: List[Dict], facti
             ship_name = ship_data.get("name", "Unknown Ship")
             
             # Create ship module
-            registry.ships[ship_name] = ShipModule(
+            registry.register_ship(ShipModule(
                 name=ship_name,
                 display_name=ship_name,
                 requirements=ship_data.get("materials", {}),
                 details=ship_data.get("description", ""),
                 faction=ship_data.get("faction", faction),
                 ship_type=ship_data.get("type", "Unknown"),
-                owned_status=False  # Default to unowned
-            )
+                owned_status=False,  # Default to unowned
+                build_time=_get_build_time(ship_data, ship_data.get("description", ""))
+            ))
             debug_print(f"Added ship: {ship_name} from faction {faction}")
             ships_loaded += 1
         except Exception as e:
@@ -115,25 +164,27 @@ def _add_ship_to_registry(registry: ModuleRegistry, ship_name: str, ship_data: D
         
         # Load ship into registry
         if faction == "capital_ships":
-            registry.capital_ships[ship_name] = CapitalShipModule(
+            registry.register_capital_ship(CapitalShipModule(
                 name=ship_name,
                 display_name=display_name,
                 requirements=ship_data.get('requirements', {}),
                 details=ship_data.get('details', ''),
                 faction=ship_faction,
                 ship_type=ship_type,
-                owned_status=False  # Default to unowned
-            )
+                owned_status=False,  # Default to unowned
+                build_time=_get_build_time(ship_data, ship_data.get('details', ''))
+            ))
         else:
-            registry.ships[ship_name] = ShipModule(
+            registry.register_ship(ShipModule(
                 name=ship_name,
                 display_name=display_name,
                 requirements=ship_data.get('requirements', {}),
                 details=ship_data.get('details', ''),
                 faction=ship_faction,
                 ship_type=ship_type,
-                owned_status=False  # Default to unowned
-            )
+                owned_status=False,  # Default to unowned
+                build_time=_get_build_time(ship_data, ship_data.get('details', ''))
+            ))
             
         debug_print(f"Added {'capital ' if faction == 'capital_ships' else ''}ship: {display_name} from faction {ship_faction}")
         return True
@@ -329,15 +380,16 @@ def load_components(registry: ModuleRegistry, base_path: str):
                         display_name=display_name,
                         requirements=component_data.get('requirements', {}),
                         details=component_data.get('details', ''),
-                        owned_status=False  # Default to unowned
+                        owned_status=False,  # Default to unowned
+                        build_time=_get_build_time(component_data, component_data.get('details', ''))
                     )
                     
                     # Add to appropriate registry
                     if is_capital:
-                        registry.capital_components[component_name] = component
+                        registry.register_capital_component(component)
                         total_capital += 1
                     else:
-                        registry.components[component_name] = component
+                        registry.register_component(component)
                         total_regular += 1
                     
                     file_components += 1
@@ -355,6 +407,10 @@ def load_pi_data(registry: ModuleRegistry, base_path: str):
     """
     Load PI data from JSON files in the PI folder
     
+    Each file holds one or more tier lists keyed like "P2_Refined_Commodities",
+    each a list of {name, inputs, ...} entries. Older files keyed
+    "p2_materials" with a dictionary of materials are read as well.
+    
     Args:
         registry: The module registry to populate
         base_path: Base path of the application
@@ -365,64 +421,119 @@ def load_pi_data(registry: ModuleRegistry, base_path: str):
         debug_print(f"PI folder not found: {pi_folder}")
         return
     
-    pi_files = glob.glob(os.path.join(pi_folder, "*.json"))
+    pi_files = sorted(glob.glob(os.path.join(pi_folder, "*.json")))
     
     if not pi_files:
         debug_print("No PI files found.")
         return
     
-    combined_pi_data = {
-        'p0_materials': {},
-        'p1_materials': {},
-        'p2_materials': {},
-        'p3_materials': {},
-        'p4_materials': {}
-    }
+    combined_pi_data = {f"{level.lower()}_materials": {} for level in PI_LEVELS}
     
     for pi_file in pi_files:
         try:
             pi_data = _load_json_file(pi_file)
             
-            # Merge data from this file into combined data
-            for tier_key in combined_pi_data.keys():
-                if tier_key in pi_data:
-                    combined_pi_data[tier_key].update(pi_data[tier_key])
+            # Merge every tier section of this file into the combined data
+            for section_key, entries in pi_data.items():
+                tier = get_pi_tier(section_key[:2])
+                if tier is None or section_key[2:3] != '_':
+                    debug_print(f"Skipping unknown PI section '{section_key}' in {os.path.basename(pi_file)}")
+                    continue
+                
+                materials = combined_pi_data[f"p{tier}_materials"]
+                if isinstance(entries, dict):
+                    materials.update(entries)
+                    continue
+                for entry in entries:
+                    if isinstance(entry, dict) and entry.get('name'):
+                        materials[entry['name']] = entry
         except Exception as e:
             debug_print(f"Error loading PI file {os.path.basename(pi_file)}: {e}")
     
     # Load the combined data into the registry
     load_pi_data_from_dict(registry, combined_pi_data)
 
+def _get_pi_inputs(material_data: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """
+    Get the inputs named by a PI entry
+    
+    Args:
+        material_data: PI material entry
+        
+    Returns:
+        Dictionary of input name -> units per cycle, None where the file gives no quantity
+    """
+    inputs = material_data.get('inputs')
+    if isinstance(inputs, dict):
+        return dict(inputs)
+    if isinstance(inputs, list):
+        return {input_name: None for input_name in inputs}
+    
+    # P1 entries name their single P0 resource instead
+    source = material_data.get('produced_from_P0')
+    return {source: None} if source else {}
+
 def load_pi_data_from_dict(registry: ModuleRegistry, pi_data: Dict[str, Any]):
     """
     Load PI data from a dictionary
     
+    Input quantities and batch sizes follow the standard PI schematics of
+    each tier unless an entry gives its inputs as a dictionary of quantities.
+    
     Args:
         registry: The module registry to populate
-        pi_data: Dictionary containing PI data
+        pi_data: Dictionary of tier key ("p0_materials" ...) -> materials by name
     """
     # Store raw PI data in registry
     for tier_key, materials in pi_data.items():
-        registry.pi_data[tier_key] = materials
+        registry.register_pi_data(tier_key, materials)
+    
+    # Tier of every material, so input quantities can follow the input's tier
+    levels = {}
+    for tier_key, materials in pi_data.items():
+        level = tier_key.replace('_materials', '').upper()
+        for material_name, material_data in materials.items():
+            levels[material_name] = level
+            levels[material_data.get('display_name', material_name)] = level
+    
+    requirements = {}
+    outputs: Dict[str, Dict[str, int]] = {}
+    for materials in pi_data.values():
+        for material_name, material_data in materials.items():
+            inputs = {}
+            for input_name, amount in _get_pi_inputs(material_data).items():
+                if amount is None:
+                    if levels.get(input_name) not in PI_INPUT_QUANTITIES:
+                        debug_print(f"PI material {material_name}: unknown input '{input_name}'")
+                        continue
+                    amount = PI_INPUT_QUANTITIES[levels[input_name]]
+                inputs[input_name] = amount
+                outputs.setdefault(input_name, {})[material_data.get('display_name', material_name)] = amount
+            requirements[material_name] = inputs
     
     # Extract all PI materials into a flat dictionary for easy access
     for tier_key, materials in pi_data.items():
+        level = tier_key.replace('_materials', '').upper()
         for material_name, material_data in materials.items():
             try:
-                # Get the tier from the key (p0, p1, etc.)
-                tier = tier_key.replace('_materials', '')
+                display_name = material_data.get('display_name', material_name)
+                details = material_data.get('details') or material_data.get('example_uses') or material_data.get('ultimate_use', '')
                 
                 # Create PI material module
                 pi_material = PiMaterialModule(
                     name=material_name,
-                    display_name=material_data.get('display_name', material_name),
-                    pi_level=tier,
-                    requirements=material_data.get('inputs', {}),
-                    details=material_data.get('details', '')
+                    display_name=display_name,
+                    pi_level=level,
+                    requirements=requirements[material_name],
+                    details=details,
+                    planet_types=material_data.get('harvestable_planet_types'),
+                    outputs=outputs.get(display_name),
+                    batch_size=int(material_data.get('batch_size', PI_BATCH_SIZES.get(level, 1))),
+                    cycle_time=int(material_data.get('cycle_time', PI_CYCLE_TIMES.get(level, 0)))
                 )
                 
                 # Add to PI materials registry
-                registry.pi_materials[material_name] = pi_material
+                registry.register_pi_material(pi_material)
             except Exception as e:
                 debug_print(f"Error loading PI material {material_name}: {e}")
 
@@ -443,9 +554,50 @@ def load_ore_data(registry: ModuleRegistry, base_path: str):
     try:
         ore_data = _load_json_file(ore_file)
         
-        # Store ore data directly in registry
-        registry.ores = ore_data
+        # Store ore data in the registry and index the ores by display name
+        registry.register_ores(ore_data)
         
         debug_print(f"Loaded ore data: {len(ore_data)} ore types")
     except Exception as e:
         debug_print(f"Error loading ore data: {e}")
+
+def load_registry(base_path: str, use_snapshot: bool = True, backend: str = "objects") -> ModuleRegistry:
+    """
+    Create a module registry and load every data source into it
+    
+    The precompiled data snapshot is used when it matches the JSON sources.
+    Otherwise the JSON is parsed and the snapshot is rewritten for next time.
+    
+    Args:
+        base_path: Base path of the application
+        use_snapshot: Whether to read and refresh the data snapshot
+        backend: "objects" for an in-memory registry, or "mmap" for a registry
+            backed by the memory-mapped item store (for very large datasets)
+        
+    Returns:
+        The populated ModuleRegistry with its material graph compiled
+    """
+    if backend == "mmap":
+        from core.mmap_store import load_mapped_registry
+        return load_mapped_registry(base_path)
+    
+    if use_snapshot:
+        registry = load_snapshot(base_path)
+        if registry is not None:
+            return registry
+    
+    registry = ModuleRegistry()
+    
+    load_ships(registry, base_path)
+    load_components(registry, base_path)
+    load_pi_data(registry, base_path)
+    load_ore_data(registry, base_path)
+    
+    # Compile the production graphs once all recipes and raw materials are known
+    registry.build_material_graph()
+    registry.build_pi_chain()
+    
+    if use_snapshot:
+        save_snapshot(registry, base_path)
+    
+    return registry
@@ -0,0 +1,192 @@
+"""
+Precompiled data snapshot for EVE Production Calculator
+
+This module stores a fully loaded module registry as a single versioned binary
+file so later launches can skip parsing the JSON data. The snapshot records a
+content hash of every JSON source and is only used while that hash matches.
+
+Build it explicitly with:
+    python -m core.data_snapshot
+"""
+import os
+import sys
+import glob
+import pickle
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from core.utils.debug import debug_print
+
+# Bump whenever the registry or model classes change shape
+SNAPSHOT_VERSION = 6
+SNAPSHOT_FILENAME = "registry_snapshot.pickle"
+
+# JSON sources read by the data loaders, relative to core/data
+SOURCE_PATTERNS = [
+    os.path.join('ships', '*.json'),
+    os.path.join('components', '*.json'),
+    'components.json',
+    'capitalcomponents.json',
+    os.path.join('PI', '*.json'),
+    'ore.json'
+]
+
+def get_snapshot_path(base_path: str) -> str:
+    """
+    Get the path of the snapshot file
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        Absolute path of the snapshot file
+    """
+    return os.path.join(base_path, 'core', 'data', SNAPSHOT_FILENAME)
+
+def get_source_files(base_path: str) -> List[str]:
+    """
+    List every JSON file the data loaders read, in a stable order
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        Sorted list of source file paths relative to core/data
+    """
+    data_path = os.path.join(base_path, 'core', 'data')
+    files = set()
+    for pattern in SOURCE_PATTERNS:
+        for file_path in glob.glob(os.path.join(data_path, pattern)):
+            files.add(os.path.relpath(file_path, data_path).replace(os.sep, '/'))
+    return sorted(files)
+
+def compute_source_hash(base_path: str, manifest: Optional[Dict[str, Tuple[int, int, str]]] = None) -> Tuple[str, Dict[str, Tuple[int, int, str]]]:
+    """
+    Compute the combined content hash of all JSON sources
+
+    File digests from a previous manifest are reused when a file's size and
+    modification time are unchanged, so an up-to-date check only stats the
+    files instead of reading them.
+
+    Args:
+        base_path: Base path of the application
+        manifest: Optional previous manifest of relative path -> (size, mtime_ns, sha256)
+
+    Returns:
+        Tuple of (combined sha256 hex digest, new manifest)
+    """
+    data_path = os.path.join(base_path, 'core', 'data')
+    manifest = manifest or {}
+    new_manifest = {}
+    combined = hashlib.sha256()
+
+    for relative_path in get_source_files(base_path):
+        stat = os.stat(os.path.join(data_path, relative_path))
+        previous = manifest.get(relative_path)
+        if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+            digest = previous[2]
+        else:
+            with open(os.path.join(data_path, relative_path), 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+
+        new_manifest[relative_path] = (stat.st_size, stat.st_mtime_ns, digest)
+        combined.update(f"{relative_path}\0{digest}\n".encode('utf-8'))
+
+    return combined.hexdigest(), new_manifest
+
+def save_snapshot(registry, base_path: str) -> bool:
+    """
+    Write a loaded registry to the snapshot file
+
+    The file is written to a temporary path first and then moved into place,
+    so a crash never leaves a truncated snapshot behind.
+
+    Args:
+        registry: The fully loaded ModuleRegistry
+        base_path: Base path of the application
+
+    Returns:
+        True if the snapshot was written
+    """
+    snapshot_path = get_snapshot_path(base_path)
+    source_hash, manifest = compute_source_hash(base_path)
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'source_hash': source_hash,
+        'manifest': manifest,
+        'registry': registry
+    }
+
+    temp_path = snapshot_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+        debug_print(f"Data snapshot written to {snapshot_path}")
+        return True
+    except Exception as e:
+        debug_print(f"Error writing data snapshot: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+def load_snapshot(base_path: str):
+    """
+    Load the registry from the snapshot if it matches the JSON sources
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        The snapshotted ModuleRegistry, or None if the snapshot is missing,
+        from another version or stale
+    """
+    snapshot_path = get_snapshot_path(base_path)
+    if not os.path.exists(snapshot_path):
+        debug_print("No data snapshot found")
+        return None
+
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        debug_print(f"Error reading data snapshot: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        debug_print("Data snapshot is from another version, ignoring it")
+        return None
+
+    source_hash, _ = compute_source_hash(base_path, snapshot.get('manifest'))
+    if source_hash != snapshot.get('source_hash'):
+        debug_print("Data snapshot is out of date with the JSON sources, ignoring it")
+        return None
+
+    debug_print(f"Loaded registry from data snapshot {snapshot_path}")
+    return snapshot['registry']
+
+def build_snapshot(base_path: str) -> bool:
+    """
+    Parse all JSON sources and write a fresh snapshot
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        True if the snapshot was written
+    """
+    from core.data_loaders import load_registry
+
+    registry = load_registry(base_path, use_snapshot=False)
+    return save_snapshot(registry, base_path)
+
+if __name__ == "__main__":
+    from core.utils.debug import set_debug_mode
+
+    set_debug_mode('--debug' in sys.argv, sys.stderr)
+    application_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if build_snapshot(application_path):
+        print(f"Snapshot written to {get_snapshot_path(application_path)}")
+    else:
+        print("Failed to write snapshot", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,266 @@
+"""
+Blueprint table widget for EVE Production Calculator
+
+A ttk.Treeview based table for the blueprint editor. Tk only draws the rows
+that are visible, so opening, filtering and scrolling cost the same whatever
+the number of blueprints. Rows are created once and filters only detach and
+reattach them. Cells are edited in place: clicking the ownership cell toggles
+it, and double-clicking an ME or TE cell opens a single entry over the cell.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Cells that are edited in place
+OWNED_COLUMN = 'owned'
+LEVEL_COLUMNS = ('me', 'te')
+
+# Text shown in the ownership column
+OWNED_TEXT = "Owned"
+UNOWNED_TEXT = "Unowned"
+
+class BlueprintTable:
+    """Scrollable blueprint table with in-place editing of ownership, ME and TE"""
+
+    def __init__(self,
+                 parent,
+                 name_heading: str,
+                 columns: Sequence[Tuple[str, str, int]],
+                 on_owned_change: Callable[[Any, bool], None],
+                 on_level_change: Callable[[Any, str, str], int],
+                 height: int = 20):
+        """
+        Create the table inside a parent widget
+
+        Args:
+            parent: Parent tkinter widget; the table packs itself into it
+            name_heading: Heading of the blueprint name column
+            columns: (key, heading, width) of every column after the name
+            on_owned_change: Called with (row payload, owned) when ownership is toggled
+            on_level_change: Called with (row payload, column key, entered text) when an
+                ME or TE cell is edited; returns the value to display
+            height: Number of visible rows
+        """
+        self.on_owned_change = on_owned_change
+        self.on_level_change = on_level_change
+        self.column_keys = tuple(key for key, _, _ in columns)
+        self._payloads: Dict[str, Any] = {}
+        self._order: List[str] = []
+        self._visible = 0
+        self._editor = None
+        self._editor_view = None
+
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.tree = ttk.Treeview(self.frame, columns=self.column_keys, height=height,
+                                 selectmode="extended")
+        self.tree.heading("#0", text=name_heading, anchor="w")
+        self.tree.column("#0", width=260, stretch=True, anchor="w")
+        for key, heading, width in columns:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, stretch=False, anchor="center")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Shown over the tree while it has no rows
+        self.empty_label = ttk.Label(self.tree)
+
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<space>", self._on_space)
+
+    def set_rows(self, rows: Iterable[Tuple[str, str, Dict[str, Any], Any]], empty_text: str = ""):
+        """
+        Replace the contents of the table
+
+        The rows are kept for the lifetime of the table; filters only hide and
+        show them with show_rows.
+
+        Args:
+            rows: (row id, display name, column values, payload) tuples in display order
+            empty_text: Message shown when there are no rows
+        """
+        self.cancel_edit()
+        self.tree.delete(*self._order)
+        self._payloads.clear()
+        for iid, text, values, payload in rows:
+            self.tree.insert("", "end", iid=iid, text=text, values=self._format_values(values))
+            self._payloads[iid] = payload
+        self._order = list(self._payloads)
+        self._visible = len(self._order)
+        self._show_empty_text(empty_text)
+
+    def show_rows(self, iids: Optional[Collection[str]] = None, empty_text: str = ""):
+        """
+        Show only some rows, keeping their display order
+
+        Hidden rows are detached from the tree rather than deleted, so showing
+        them again costs one reattach and no widget is created or destroyed.
+
+        Args:
+            iids: Ids of the rows to show, or None to show every row
+            empty_text: Message shown when no row is visible
+        """
+        self.cancel_edit()
+        if iids is None:
+            visible = self._order
+        else:
+            visible = [iid for iid in self._order if iid in iids]
+        # Replaces the root's children in one call; rows left out are detached
+        self.tree.set_children("", *visible)
+        self._visible = len(visible)
+        if visible:
+            self.tree.yview_moveto(0)
+        self._show_empty_text(empty_text)
+
+    def _show_empty_text(self, empty_text: str):
+        """Show a message over the tree while no row is visible"""
+        if self._visible or not empty_text:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.configure(text=empty_text)
+            self.empty_label.place(relx=0.5, rely=0.5, anchor="center")
+
+    def update_row(self, iid: str, values: Dict[str, Any]):
+        """
+        Change some column values of a row
+
+        Args:
+            iid: Row id
+            values: Column key -> new value
+        """
+        if not self.tree.exists(iid):
+            return
+        for key, value in values.items():
+            self.tree.set(iid, key, self._format_value(key, value))
+
+    def rows(self) -> Iterable[Tuple[str, Any]]:
+        """
+        Iterate over the rows of the table, hidden ones included
+
+        Returns:
+            Iterator of (row id, payload) pairs
+        """
+        return iter(self._payloads.items())
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _format_values(self, values: Dict[str, Any]) -> Tuple[str, ...]:
+        """Convert a row's column values to the strings shown in the tree"""
+        return tuple(self._format_value(key, values.get(key, "")) for key in self.column_keys)
+
+    @staticmethod
+    def _format_value(key: str, value: Any) -> str:
+        """Convert a single column value to the string shown in the tree"""
+        if key == OWNED_COLUMN:
+            return OWNED_TEXT if value else UNOWNED_TEXT
+        if value is None:
+            return "N/A"
+        return str(value)
+
+    def _column_at(self, x: int) -> Optional[str]:
+        """Get the column key under an x position, or None for the name column"""
+        column_id = self.tree.identify_column(x)
+        if not column_id or column_id == "#0":
+            return None
+        index = int(column_id[1:]) - 1
+        if 0 <= index < len(self.column_keys):
+            return self.column_keys[index]
+        return None
+
+    def _toggle_owned(self, iid: str):
+        """Flip the ownership of a row and report it"""
+        owned = self.tree.set(iid, OWNED_COLUMN) != OWNED_TEXT
+        self.tree.set(iid, OWNED_COLUMN, self._format_value(OWNED_COLUMN, owned))
+        self.on_owned_change(self._payloads[iid], owned)
+
+    def _on_click(self, event):
+        """Toggle ownership when the ownership cell is clicked"""
+        self.finish_edit()
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return
+        iid = self.tree.identify_row(event.y)
+        if iid and self._column_at(event.x) == OWNED_COLUMN and OWNED_COLUMN in self.column_keys:
+            self._toggle_owned(iid)
+
+    def _on_space(self, event):
+        """Toggle ownership of the selected rows"""
+        if OWNED_COLUMN not in self.column_keys:
+            return
+        for iid in self.tree.selection():
+            self._toggle_owned(iid)
+        return "break"
+
+    def _on_double_click(self, event):
+        """Open an editor over a double-clicked ME or TE cell"""
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return
+        iid = self.tree.identify_row(event.y)
+        column = self._column_at(event.x)
+        if iid and column in LEVEL_COLUMNS:
+            self.begin_edit(iid, column)
+        return "break"
+
+    def begin_edit(self, iid: str, column: str):
+        """
+        Open the in-place editor over a cell
+
+        Args:
+            iid: Row id
+            column: ME or TE column key
+        """
+        self.finish_edit()
+        self.tree.see(iid)
+        bbox = self.tree.bbox(iid, column)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+
+        editor = ttk.Entry(self.tree, justify="center")
+        editor.insert(0, self.tree.set(iid, column))
+        editor.select_range(0, tk.END)
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        editor.bind("<Return>", lambda event: self.finish_edit())
+        editor.bind("<KP_Enter>", lambda event: self.finish_edit())
+        editor.bind("<Escape>", lambda event: self.cancel_edit())
+        editor.bind("<FocusOut>", lambda event: self.finish_edit())
+
+        self._editor = (editor, iid, column)
+        self._editor_view = self.tree.yview()
+
+    def finish_edit(self):
+        """Commit and close the in-place editor, if one is open"""
+        if self._editor is None:
+            return
+        editor, iid, column = self._editor
+        text = editor.get()
+        self._close_editor()
+        if self.tree.exists(iid):
+            value = self.on_level_change(self._payloads[iid], column, text)
+            self.tree.set(iid, column, self._format_value(column, value))
+
+    def cancel_edit(self):
+        """Close the in-place editor without committing it"""
+        if self._editor is not None:
+            self._close_editor()
+
+    def _close_editor(self):
+        """Destroy the editor widget and return focus to the tree"""
+        editor = self._editor[0]
+        # Cleared first, so the FocusOut caused by destroying it commits nothing
+        self._editor = None
+        self._editor_view = None
+        editor.destroy()
+        self.tree.focus_set()
+
+    def _on_scroll(self, first, last):
+        """Keep the scrollbar in sync and commit an edit whose cell scrolled away"""
+        self.scrollbar.set(first, last)
+        if self._editor is not None and self.tree.yview() != self._editor_view:
+            self.finish_edit()
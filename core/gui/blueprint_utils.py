@@ -5,7 +5,6 @@ Provides functions for blueprint ownership management and integration with the m
 
 import tkinter as tk
 from tkinter import messagebox
-from core.gui.blueprints_gui import BlueprintManager
 
 def open_blueprint_editor(app, registry, blueprint_config, callback=None):
     """
@@ -26,6 +25,9 @@ def open_blueprint_editor(app, registry, blueprint_config, callback=None):
         return False
         
     try:
+        # The editor module is large, so it is only imported the first time it is opened
+        from core.gui.blueprints_gui import BlueprintManager
+        
         # Set the flag to prevent multiple windows
         app.ownership_editor_shown = True
         
@@ -112,7 +114,7 @@ def reset_ship_ownership(registry, blueprint_config, refresh_callback=None):
     
     # Reset ownership for all ships
     for ship_name, ship in registry.ships.items():
-        ship.owned_status = False
+        registry.set_owned_status('ships', ship_name, False)
         
         # Update the blueprint config
         if ship_name in blueprint_config.get('ship_blueprints', {}):
@@ -122,7 +124,7 @@ def reset_ship_ownership(registry, blueprint_config, refresh_callback=None):
     
     # Reset ownership for all capital ships
     for ship_name, ship in registry.capital_ships.items():
-        ship.owned_status = False
+        registry.set_owned_status('capital_ships', ship_name, False)
         
         # Update the blueprint config
         if ship_name in blueprint_config.get('capital_ship_blueprints', {}):
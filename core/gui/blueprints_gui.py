@@ -14,6 +14,9 @@ from core.config.blueprint_config import save_blueprint_ownership, update_bluepr
 from core.config.blueprint_config import get_blueprint_ownership, get_blueprint_me, get_blueprint_te
 from core.config.blueprint_config import update_blueprint_me, update_blueprint_te
 from core.utils.debug import debug_print
+from core.gui.ui_state import UiStateTable
+from core.gui.blueprint_table import BlueprintTable
+from core.calculator import REGISTRY_CATEGORIES
 
 class BlueprintManager:
     """
@@ -36,6 +39,12 @@ class BlueprintManager:
         self.blueprint_config = blueprint_config
         self.module_registry = module_registry
         
+        # Tkinter variables of the blueprint rows, kept off the model objects
+        self.ui_state = UiStateTable()
+        
+        # Blueprint tables, refreshed when the configuration changes under them
+        self.blueprint_tables = []
+        
         # Initialize status variable
         if hasattr(parent, 'status_var'):
             self.status_var = parent.status_var
@@ -99,143 +108,33 @@ class BlueprintManager:
         component_frame = ttk.LabelFrame(components_container, text="Component Blueprints")
         component_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Create scrollable canvas
-        canvas = tk.Canvas(component_frame)
-        scrollbar = ttk.Scrollbar(component_frame, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Create grid frame inside canvas
-        grid_frame = ttk.Frame(canvas)
-        canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-        
-        # Create headers for the grid
-        ttk.Label(grid_frame, text="Component Blueprint", font=("TkDefaultFont", 9, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="Unowned", font=("TkDefaultFont", 9, "bold")).grid(row=0, column=1, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="Owned", font=("TkDefaultFont", 9, "bold")).grid(row=0, column=2, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="ME%", font=("TkDefaultFont", 9, "bold")).grid(row=0, column=3, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="TE%", font=("TkDefaultFont", 9, "bold")).grid(row=0, column=4, padx=5, pady=5, sticky="w")
-        
-        row = 1
+        # Blueprint table; only the visible rows are drawn
+        table = BlueprintTable(
+            component_frame,
+            "Component Blueprint",
+            [('owned', "Ownership", 90), ('me', "ME%", 50), ('te', "TE%", 50)],
+            self.on_table_owned_change,
+            self.on_table_level_change
+        )
+        self.blueprint_tables.append(table)
+        
+        rows = []
         has_components = False
         
         # Add regular components
         if 'components' in self.discovered_modules and self.discovered_modules['components']:
             has_components = True
-            components = self.discovered_modules['components']
-            
-            for comp_name, comp_data in components.items():
-                # Display name
-                ttk.Label(grid_frame, text=comp_data.display_name).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                
-                # Set up ownership radio buttons
-                if not hasattr(comp_data, 'ownership_var'):
-                    comp_data.ownership_var = tk.StringVar()
-                
-                # Get ownership status
-                ownership_status = get_blueprint_ownership(self.blueprint_config, 'components', comp_name)
-                if ownership_status:
-                    comp_data.ownership_var.set("owned")
-                else:
-                    comp_data.ownership_var.set("unowned")
-                
-                # Unowned radio button
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="unowned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="unowned": self.update_component_ownership(n, d, v)
-                ).grid(row=row, column=1, padx=5, pady=2)
-                
-                # Owned radio button
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="owned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="owned": self.update_component_ownership(n, d, v)
-                ).grid(row=row, column=2, padx=5, pady=2)
-                
-                # ME% input field
-                if not hasattr(comp_data, 'me_var'):
-                    comp_data.me_var = tk.StringVar()
-                me_value = get_blueprint_me(self.blueprint_config, 'components', comp_name)
-                comp_data.me_var.set(str(me_value))
-                me_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.me_var)
-                me_entry.grid(row=row, column=3, padx=5, pady=2)
-                me_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_me(event, 'components', n))
-                
-                # TE% input field
-                if not hasattr(comp_data, 'te_var'):
-                    comp_data.te_var = tk.StringVar()
-                te_value = get_blueprint_te(self.blueprint_config, 'components', comp_name)
-                comp_data.te_var.set(str(te_value))
-                te_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.te_var)
-                te_entry.grid(row=row, column=4, padx=5, pady=2)
-                te_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_te(event, 'components', n))
-                
-                row += 1
+            for comp_name, comp_data in self.discovered_modules['components'].items():
+                rows.append(self.make_table_row(comp_name, comp_data, 'components'))
         
-        # Add capital components
+        # Add capital components - capital components use 'component_blueprints' config key
         if hasattr(self.module_registry, 'capital_components') and self.module_registry.capital_components:
             has_components = True
             self.discovered_modules['capital_components'] = self.module_registry.capital_components
-            capital_components = self.module_registry.capital_components
-            
-            for comp_name, comp_data in capital_components.items():
-                # Display name
-                ttk.Label(grid_frame, text=comp_data.display_name).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                
-                # Set up ownership radio buttons
-                if not hasattr(comp_data, 'ownership_var'):
-                    comp_data.ownership_var = tk.StringVar()
-                
-                # Get ownership status - capital components use 'component_blueprints' config key
-                ownership_status = get_blueprint_ownership(self.blueprint_config, 'component_blueprints', comp_name)
-                if ownership_status:
-                    comp_data.ownership_var.set("owned")
-                else:
-                    comp_data.ownership_var.set("unowned")
-                
-                # Unowned radio button
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="unowned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="unowned": self.update_cap_component_ownership(n, d, v)
-                ).grid(row=row, column=1, padx=5, pady=2)
-                
-                # Owned radio button
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="owned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="owned": self.update_cap_component_ownership(n, d, v)
-                ).grid(row=row, column=2, padx=5, pady=2)
-                
-                # ME% input field
-                if not hasattr(comp_data, 'me_var'):
-                    comp_data.me_var = tk.StringVar()
-                me_value = get_blueprint_me(self.blueprint_config, 'component_blueprints', comp_name)
-                comp_data.me_var.set(str(me_value))
-                me_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.me_var)
-                me_entry.grid(row=row, column=3, padx=5, pady=2)
-                me_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_capital_component_me(event, n))
-                
-                # TE% input field
-                if not hasattr(comp_data, 'te_var'):
-                    comp_data.te_var = tk.StringVar()
-                te_value = get_blueprint_te(self.blueprint_config, 'component_blueprints', comp_name)
-                comp_data.te_var.set(str(te_value))
-                te_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.te_var)
-                te_entry.grid(row=row, column=4, padx=5, pady=2)
-                te_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_capital_component_te(event, n))
-                
-                row += 1
+            for comp_name, comp_data in self.module_registry.capital_components.items():
+                rows.append(self.make_table_row(comp_name, comp_data, 'component_blueprints'))
         
-        # Configure the canvas to adjust scrolling based on the grid size
-        grid_frame.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
+        table.set_rows(rows)
         
         # Display message if no components found
         if not has_components:
@@ -287,376 +186,222 @@ class BlueprintManager:
         
         # Create a search button
         apply_filter_btn = ttk.Button(filter_frame, text="Apply Filter", 
-                                     command=lambda: self.populate_grid(grid_frame, modules_type, modules_dict, ship_type_var.get(), faction_var.get()))
+                                     command=lambda: self.apply_filter(table, modules_type, ship_type_var.get(), faction_var.get()))
         apply_filter_btn.grid(row=0, column=4, padx=15, pady=5)
         
+        # Filtering only hides and shows rows, so it is applied as soon as a filter changes
+        for dropdown in (ship_type_dropdown, faction_dropdown):
+            dropdown.bind("<<ComboboxSelected>>",
+                          lambda event: self.apply_filter(table, modules_type, ship_type_var.get(), faction_var.get()))
+        
         # Reset button
         reset_filter_btn = ttk.Button(filter_frame, text="Reset", 
-                                    command=lambda: self.reset_filter(ship_type_dropdown, faction_dropdown, grid_frame, modules_type, modules_dict))
+                                    command=lambda: self.reset_filter(ship_type_dropdown, faction_dropdown, table, modules_type))
         reset_filter_btn.grid(row=0, column=5, padx=5, pady=5)
         
-        # Add canvas and scrollbar
-        canvas_frame = ttk.Frame(container)
-        canvas_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        canvas = tk.Canvas(canvas_frame)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        h_scrollbar = ttk.Scrollbar(canvas_frame, orient="horizontal", command=canvas.xview)
-        
-        # Configure scrollbars
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        canvas.configure(yscrollcommand=scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        # Create frame for grid
-        grid_frame = ttk.Frame(canvas)
-        canvas_window = canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-        
-        # Add headers
-        ttk.Label(grid_frame, text=f"{modules_type} Blueprint", font=("Arial", 10, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="Ship Type", font=("Arial", 10, "bold")).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Label(grid_frame, text="Faction", font=("Arial", 10, "bold")).grid(row=0, column=2, padx=5, pady=5)
-        ttk.Label(grid_frame, text="Unowned", font=("Arial", 10, "bold")).grid(row=0, column=3, padx=5, pady=5)
-        ttk.Label(grid_frame, text="Owned", font=("Arial", 10, "bold")).grid(row=0, column=4, padx=5, pady=5)
-        ttk.Label(grid_frame, text="ME%", font=("Arial", 10, "bold")).grid(row=0, column=5, padx=5, pady=5)
-        ttk.Label(grid_frame, text="TE%", font=("Arial", 10, "bold")).grid(row=0, column=6, padx=5, pady=5)
-        
-        # Separator
-        separator = ttk.Separator(grid_frame, orient='horizontal')
-        separator.grid(row=1, column=0, columnspan=7, sticky="ew", padx=5, pady=2)
-        
-        # Populate the grid
-        self.populate_grid(grid_frame, modules_type, modules_dict)
-        
-        # Configure the canvas
-        def _configure_canvas(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            # Set min width to avoid shrinking
-            canvas.itemconfig(canvas_window, width=max(event.width, grid_frame.winfo_reqwidth()))
-        
-        grid_frame.bind("<Configure>", _configure_canvas)
-        canvas.bind("<Configure>", _configure_canvas)
+        # Blueprint table; only the visible rows are drawn
+        table = BlueprintTable(
+            container,
+            f"{modules_type} Blueprint",
+            [('ship_type', "Ship Type", 120), ('faction', "Faction", 120),
+             ('owned', "Ownership", 90), ('me', "ME%", 50), ('te', "TE%", 50)],
+            self.on_table_owned_change,
+            self.on_table_level_change
+        )
+        self.blueprint_tables.append(table)
+        
+        # Populate the table
+        self.populate_grid(table, modules_type, modules_dict)
         
     def create_component_blueprint_grid(self, parent):
         """Create a grid for component blueprints"""
         if 'components' in self.discovered_modules:
-            self.create_component_blueprint_grid_without_filters(parent, "Components", self.discovered_modules['components'])
+            self.create_component_blueprint_grid_without_filters(parent, "Components", self.discovered_modules['components'],
+                                                                 "Component Blueprint")
         else:
             ttk.Label(parent, text="No component modules discovered.").pack(padx=10, pady=10)
     
-    def create_component_blueprint_grid_without_filters(self, parent, modules_type, modules_dict):
-        """Create a grid view for blueprint management without ship filters"""
-        # Container with scrollbar
+    def create_component_blueprint_grid_without_filters(self, parent, modules_type, modules_dict, name_heading=None):
+        """
+        Create a blueprint table without ship filters
+        
+        Args:
+            parent: Parent widget
+            modules_type: Module type name, e.g. 'Components' or 'Capital Components'
+            modules_dict: Registry name -> module of the blueprints to list
+            name_heading: Heading of the name column (default: "<modules_type> Blueprint")
+        """
         container = ttk.Frame(parent)
         container.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Create a canvas with scrollbar
-        canvas = tk.Canvas(container)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Create frame for grid
-        grid_frame = ttk.Frame(canvas)
-        canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-        
-        # Add headers
-        ttk.Label(grid_frame, text="Component Blueprint", font=("Arial", 10, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="Unowned", font=("Arial", 10, "bold")).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Label(grid_frame, text="Owned", font=("Arial", 10, "bold")).grid(row=0, column=2, padx=5, pady=5)
-        ttk.Label(grid_frame, text="ME%", font=("Arial", 10, "bold")).grid(row=0, column=3, padx=5, pady=5)
-        ttk.Label(grid_frame, text="TE%", font=("Arial", 10, "bold")).grid(row=0, column=4, padx=5, pady=5)
-        
-        # Add separator
-        separator = ttk.Separator(grid_frame, orient='horizontal')
-        separator.grid(row=1, column=0, columnspan=5, sticky="ew", pady=5)
-        
-        # Populate grid with components
-        row = 2
-        for comp_name, comp_data in sorted(modules_dict.items()):
-            # Component name
-            ttk.Label(grid_frame, text=comp_data.display_name).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-            
-            # Ownership RadioButtons
-            # Check if the comp_data already has an ownership_var attribute, if not create one
-            if not hasattr(comp_data, 'ownership_var'):
-                # Get ownership value from blueprint config
-                ownership_status = get_blueprint_ownership(self.blueprint_config, 'components', comp_name)
-                # Convert to lowercase to match the values expected by our radio buttons
-                ownership_value = "owned" if ownership_status == "Owned" else "unowned"
-                comp_data.ownership_var = tk.StringVar(value=ownership_value)
-            
-            # Unowned radiobutton
-            ttk.Radiobutton(
-                grid_frame, 
-                value="unowned", 
-                variable=comp_data.ownership_var,
-                command=lambda n=comp_name, v="unowned": update_blueprint_ownership(self.blueprint_config, 'components', n, v)
-            ).grid(row=row, column=1, padx=5, pady=2)
-            
-            # Owned radiobutton
-            ttk.Radiobutton(
-                grid_frame, 
-                value="owned", 
-                variable=comp_data.ownership_var,
-                command=lambda n=comp_name, v="owned": update_blueprint_ownership(self.blueprint_config, 'components', n, v)
-            ).grid(row=row, column=2, padx=5, pady=2)
-            
-            # ME% input field
-            if not hasattr(comp_data, 'me_var'):
-                comp_data.me_var = tk.StringVar()
-            me_value = get_blueprint_me(self.blueprint_config, 'components', comp_name)
-            comp_data.me_var.set(str(me_value))
-            me_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.me_var)
-            me_entry.grid(row=row, column=3, padx=5, pady=2)
-            me_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_me(event, 'components', n))
-            
-            # TE% input field
-            if not hasattr(comp_data, 'te_var'):
-                comp_data.te_var = tk.StringVar()
-            te_value = get_blueprint_te(self.blueprint_config, 'components', comp_name)
-            comp_data.te_var.set(str(te_value))
-            te_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.te_var)
-            te_entry.grid(row=row, column=4, padx=5, pady=2)
-            te_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_te(event, 'components', n))
-            
-            row += 1
+        # Blueprint table; only the visible rows are drawn
+        table = BlueprintTable(
+            container,
+            name_heading or f"{modules_type} Blueprint",
+            [('owned', "Ownership", 90), ('me', "ME%", 50), ('te', "TE%", 50)],
+            self.on_table_owned_change,
+            self.on_table_level_change
+        )
+        self.blueprint_tables.append(table)
         
-        # Configure the canvas to adjust scrolling based on the grid size
-        grid_frame.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
+        self.populate_grid(table, modules_type, modules_dict)
     
     def create_capital_component_blueprint_grid(self, parent_tab):
         """Create a grid for capital component blueprints"""
-        # Create a frame with scrollbar
-        frame = ttk.Frame(parent_tab)
-        frame.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Create scrollable canvas
-        canvas = tk.Canvas(frame)
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-        scrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Create a frame for grid contents
-        grid_frame = ttk.Frame(canvas)
-        canvas_window = canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-        
-        # Add headers
-        ttk.Label(grid_frame, text="Capital Component Blueprint", font=("Arial", 10, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        ttk.Label(grid_frame, text="Unowned", font=("Arial", 10, "bold")).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Label(grid_frame, text="Owned", font=("Arial", 10, "bold")).grid(row=0, column=2, padx=5, pady=5)
-        ttk.Label(grid_frame, text="ME%", font=("Arial", 10, "bold")).grid(row=0, column=3, padx=5, pady=5)
-        ttk.Label(grid_frame, text="TE%", font=("Arial", 10, "bold")).grid(row=0, column=4, padx=5, pady=5)
-        
-        # Add separator
-        separator = ttk.Separator(grid_frame, orient='horizontal')
-        separator.grid(row=1, column=0, columnspan=5, sticky="ew", pady=5)
-        
-        # Populate grid with capital component blueprints
-        row = 2
-        if 'capital_components' in self.discovered_modules:
-            for comp_name, comp_data in sorted(self.discovered_modules['capital_components'].items()):
-                # Display name
-                ttk.Label(grid_frame, text=comp_data.display_name).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-                
-                # Create ownership variable if it doesn't exist
-                if not hasattr(comp_data, 'ownership_var'):
-                    # Get ownership value from blueprint config
-                    ownership_status = get_blueprint_ownership(self.blueprint_config, 'component_blueprints', comp_name)
-                    # Convert to lowercase to match the values expected by our radio buttons
-                    ownership_value = "owned" if ownership_status == "Owned" else "unowned"
-                    comp_data.ownership_var = tk.StringVar(value=ownership_value)
-                
-                # Unowned radiobutton
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="unowned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="unowned": self.update_cap_component_ownership(n, d, v)
-                ).grid(row=row, column=1, padx=5, pady=2)
-                
-                # Owned radiobutton
-                ttk.Radiobutton(
-                    grid_frame, 
-                    value="owned", 
-                    variable=comp_data.ownership_var,
-                    command=lambda n=comp_name, d=comp_data, v="owned": self.update_cap_component_ownership(n, d, v)
-                ).grid(row=row, column=2, padx=5, pady=2)
-                
-                # ME% input field
-                if not hasattr(comp_data, 'me_var'):
-                    comp_data.me_var = tk.StringVar()
-                me_value = get_blueprint_me(self.blueprint_config, 'component_blueprints', comp_name)
-                comp_data.me_var.set(str(me_value))
-                me_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.me_var)
-                me_entry.grid(row=row, column=3, padx=5, pady=2)
-                me_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_capital_component_me(event, n))
-                
-                # TE% input field
-                if not hasattr(comp_data, 'te_var'):
-                    comp_data.te_var = tk.StringVar()
-                te_value = get_blueprint_te(self.blueprint_config, 'component_blueprints', comp_name)
-                comp_data.te_var.set(str(te_value))
-                te_entry = ttk.Entry(grid_frame, width=4, textvariable=comp_data.te_var)
-                te_entry.grid(row=row, column=4, padx=5, pady=2)
-                te_entry.bind("<FocusOut>", lambda event, n=comp_name: self.validate_capital_component_te(event, n))
-                
-                row += 1
-        
-        # Configure the canvas to adjust scrolling based on the grid size
-        grid_frame.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
-        
-        # Make sure the canvas size changes with window size
-        def _configure_canvas(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            canvas.itemconfig(canvas_window, width=event.width)
-            
-        frame.bind("<Configure>", _configure_canvas)
+        self.create_component_blueprint_grid_without_filters(
+            parent_tab, "Capital Components", self.discovered_modules.get('capital_components', {}),
+            "Capital Component Blueprint")
     
-    def populate_grid(self, grid_frame, modules_type, modules_dict, ship_type_filter="All", faction_filter="All"):
-        """Populate the grid with modules that match the filter criteria"""
-        # Clear existing grid content (except headers and separator)
-        for widget in grid_frame.winfo_children():
-            grid_info = widget.grid_info()
-            if grid_info and int(grid_info['row']) > 1:  # Skip headers and separator
-                widget.destroy()
-        
+    def populate_grid(self, table, modules_type, modules_dict, ship_type_filter="All", faction_filter="All"):
+        """Create one persistent table row per module, then apply the filter criteria"""
         # For clarity on UI - show message if empty
         if len(modules_dict) == 0:
-            empty_label = ttk.Label(grid_frame, text=f"No {modules_type} found. Module dictionary is empty.")
-            empty_label.grid(row=2, column=0, columnspan=7, padx=5, pady=5, sticky="w")
+            table.set_rows((), empty_text=f"No {modules_type} found. Module dictionary is empty.")
             return
         
-        row = 2
-        module_count = 0
-        
         # Get category for config lookup based on module type
         config_category = self.get_category_from_module_type(modules_type)
         
         debug_print(f"Populating grid for {modules_type}, config category: {config_category}")
         
-        # Iterate through modules and add to grid if they match filter criteria
+        rows = []
         for module_name, module in sorted(modules_dict.items(), key=lambda x: x[1].display_name):
-            # Apply ship type filter
-            if ship_type_filter != "All" and hasattr(module, 'ship_type') and module.ship_type != ship_type_filter:
-                continue
-                
-            # Apply faction filter
-            if faction_filter != "All" and hasattr(module, 'faction') and module.faction != faction_filter:
-                continue
-            
-            # Display module name
-            ttk.Label(grid_frame, text=module.display_name).grid(row=row, column=0, padx=5, pady=2, sticky="w")
-            
-            # Display ship type if available
-            if hasattr(module, 'ship_type'):
-                ttk.Label(grid_frame, text=module.ship_type).grid(row=row, column=1, padx=5, pady=2)
-            else:
-                ttk.Label(grid_frame, text="N/A").grid(row=row, column=1, padx=5, pady=2)
-                
-            # Display faction if available
-            if hasattr(module, 'faction'):
-                ttk.Label(grid_frame, text=module.faction).grid(row=row, column=2, padx=5, pady=2)
-            else:
-                ttk.Label(grid_frame, text="N/A").grid(row=row, column=2, padx=5, pady=2)
-                
-            # Create ownership variable if it doesn't exist
-            if not hasattr(module, 'ownership_var'):
-                module.ownership_var = tk.StringVar()
-            
             # For ships tab, need to determine correct category based on ship type
             category_for_module = config_category
-            if modules_type == "Ships" and hasattr(module, 'is_capital_ship') and module.is_capital_ship:
+            if modules_type == "Ships" and getattr(module, 'module_type', None) == 'capital_ship':
                 category_for_module = "capital_ship_blueprints"
             
-            # Get ownership status with the correct category
-            ownership = get_blueprint_ownership(self.blueprint_config, category_for_module, module_name)
-            
-            debug_print(f"Module {module_name} - Config category: {category_for_module} - Status: {ownership}")
-            
-            # Set the correct radio button based on ownership
-            if ownership == "Owned":
-                module.ownership_var.set("owned")
-                debug_print(f"Setting {module_name} radio to 'owned'")
-            else:
-                module.ownership_var.set("unowned")
-                debug_print(f"Setting {module_name} radio to 'unowned'")
-            
-            # Store the correct category with the module for later use
-            module.config_category = category_for_module
-            
-            # Unowned radio button
-            ttk.Radiobutton(
-                grid_frame, 
-                value="unowned", 
-                variable=module.ownership_var,
-                command=lambda n=module_name, m=module, v="unowned": self.update_ownership(n, m.config_category, v)
-            ).grid(row=row, column=3, padx=5, pady=2)
+            rows.append(self.make_table_row(module_name, module, category_for_module))
+        
+        table.set_rows(rows)
+        
+        if ship_type_filter != "All" or faction_filter != "All":
+            self.apply_filter(table, modules_type, ship_type_filter, faction_filter)
+    
+    def make_table_row(self, module_name, module, config_category):
+        """
+        Build a blueprint table row from the blueprint configuration
+        
+        Args:
+            module_name: Registry name of the module
+            module: The module object
+            config_category: Blueprint config category of the module
             
-            # Owned radio button
-            ttk.Radiobutton(
-                grid_frame, 
-                value="owned", 
-                variable=module.ownership_var,
-                command=lambda n=module_name, m=module, v="owned": self.update_ownership(n, m.config_category, v)
-            ).grid(row=row, column=4, padx=5, pady=2)
+        Returns:
+            Tuple of (row id, display name, column values, payload) for BlueprintTable
+        """
+        values = {
+            'ship_type': getattr(module, 'ship_type', None),
+            'faction': getattr(module, 'faction', None),
+            'owned': get_blueprint_ownership(self.blueprint_config, config_category, module_name) == "Owned",
+            'me': get_blueprint_me(self.blueprint_config, config_category, module_name),
+            'te': get_blueprint_te(self.blueprint_config, config_category, module_name)
+        }
+        return (f"{config_category}/{module_name}", module.display_name, values,
+                (module_name, module, config_category))
+    
+    def on_table_owned_change(self, row, owned):
+        """
+        Store an ownership toggled in a blueprint table
+        
+        Args:
+            row: Row payload of (module name, module, config category)
+            owned: Whether the blueprint is now owned
+        """
+        module_name, module, config_category = row
+        value = "owned" if owned else "unowned"
+        if config_category in ("ship_blueprints", "capital_ship_blueprints"):
+            self.update_ship_ownership(module_name, module, value)
+        elif config_category == "component_blueprints":
+            self.update_cap_component_ownership(module_name, module, value)
+        else:
+            self.update_component_ownership(module_name, module, value)
+    
+    def on_table_level_change(self, row, column, text):
+        """
+        Validate and store an ME% or TE% value edited in a blueprint table
+        
+        Args:
+            row: Row payload of (module name, module, config category)
+            column: 'me' or 'te'
+            text: Text entered in the cell
             
-            # ME% input field
-            if not hasattr(module, 'me_var'):
-                module.me_var = tk.StringVar()
-                
-            me_value = get_blueprint_me(self.blueprint_config, category_for_module, module_name)
-            module.me_var.set(str(me_value))
+        Returns:
+            The stored value, clamped to 0-10 for ME and 0-20 for TE
+        """
+        module_name, module, config_category = row
+        maximum = 10 if column == 'me' else 20
+        try:
+            value = min(max(int(text), 0), maximum)
+        except ValueError:
+            # Reset to 0 if invalid
+            value = 0
+        
+        if column == 'me':
+            update_blueprint_me(self.blueprint_config, config_category, module_name, value)
+        else:
+            update_blueprint_te(self.blueprint_config, config_category, module_name, value)
+        return value
+    
+    def refresh_tables(self):
+        """Reload every blueprint table row from the blueprint configuration"""
+        for table in self.blueprint_tables:
+            for iid, (module_name, module, config_category) in table.rows():
+                table.update_row(iid, self.make_table_row(module_name, module, config_category)[2])
+        
+    def apply_filter(self, table, modules_type, ship_type_filter, faction_filter):
+        """Show only the table rows that match the filter criteria"""
+        row_ids = self.get_filtered_row_ids(table, ship_type_filter, faction_filter)
+        table.show_rows(row_ids, empty_text=f"No {modules_type} match the selected filters.")
+        
+    def get_filtered_row_ids(self, table, ship_type_filter, faction_filter):
+        """
+        Find the table rows that match the filter criteria
+        
+        Rows of registry categories are looked up in the registry's faction and
+        ship type bitmaps; other rows are checked one by one.
+        
+        Args:
+            table: The BlueprintTable to filter
+            ship_type_filter: Ship type to show, or "All"
+            faction_filter: Faction to show, or "All"
             
-            me_entry = ttk.Entry(grid_frame, width=4, textvariable=module.me_var)
-            me_entry.grid(row=row, column=5, padx=5, pady=2)
-            me_entry.bind("<FocusOut>", lambda event, n=module_name, c=category_for_module: self.validate_me(event, c, n))
+        Returns:
+            Set of matching row ids, or None if every row matches
+        """
+        if ship_type_filter == "All" and faction_filter == "All":
+            return None
+        
+        registry = self.module_registry
+        indexed_categories = getattr(registry, 'INDEXED_CATEGORIES', ())
+        matching_names = {}
+        row_ids = set()
+        for iid, (module_name, module, config_category) in table.rows():
+            registry_category = REGISTRY_CATEGORIES.get(config_category)
+            if registry_category in indexed_categories:
+                if registry_category not in matching_names:
+                    matching_names[registry_category] = set(
+                        registry.get_names_by_filter(registry_category, faction_filter, ship_type_filter))
+                if module_name in matching_names[registry_category]:
+                    row_ids.add(iid)
+                continue
             
-            # TE% input field
-            if not hasattr(module, 'te_var'):
-                module.te_var = tk.StringVar()
-                
-            te_value = get_blueprint_te(self.blueprint_config, category_for_module, module_name)
-            module.te_var.set(str(te_value))
+            # Apply ship type filter
+            if ship_type_filter != "All" and hasattr(module, 'ship_type') and module.ship_type != ship_type_filter:
+                continue
             
-            te_entry = ttk.Entry(grid_frame, width=4, textvariable=module.te_var)
-            te_entry.grid(row=row, column=6, padx=5, pady=2)
-            te_entry.bind("<FocusOut>", lambda event, n=module_name, c=category_for_module: self.validate_te(event, c, n))
+            # Apply faction filter
+            if faction_filter != "All" and hasattr(module, 'faction') and module.faction != faction_filter:
+                continue
             
-            row += 1
-            module_count += 1
+            row_ids.add(iid)
+        return row_ids
         
-        if module_count == 0:
-            # No modules match the filter criteria
-            empty_label = ttk.Label(grid_frame, text=f"No {modules_type} match the selected filters.")
-            empty_label.grid(row=2, column=0, columnspan=7, padx=5, pady=5, sticky="w")
-            
-        # Update grid frame to recalculate size
-        grid_frame.update_idletasks()
-    
-    def apply_filter(self, grid_frame, modules_dict, ship_type_filter, faction_filter):
-        """Apply filter to the blueprint grid"""
-        # Get the modules_type from grid_frame's master window title
-        parent = grid_frame.master.master.master  # Canvas > Frame > Container
-        modules_type = None
-        for item in parent.winfo_children():
-            if isinstance(item, ttk.LabelFrame):
-                modules_type = item.cget("text").replace(" Blueprints", "")
-                break
-        
-        if modules_type:
-            self.populate_grid(grid_frame, modules_type, modules_dict, ship_type_filter, faction_filter)
-        
-    def reset_filter(self, ship_type_dropdown, faction_dropdown, grid_frame, modules_type, modules_dict):
+    def reset_filter(self, ship_type_dropdown, faction_dropdown, table, modules_type):
         """Reset filters to show all modules"""
         ship_type_dropdown.set("All")
         faction_dropdown.set("All")
-        self.populate_grid(grid_frame, modules_type, modules_dict)
+        self.apply_filter(table, modules_type, "All", "All")
             
     def get_category_from_module_type(self, module_type):
         """
@@ -684,9 +429,10 @@ class BlueprintManager:
         Args:
             module: Module with ME% entry to validate
         """
+        state = self.ui_state.get(module)
         try:
             # Get ME% value
-            me_value = int(module.me_var.get())
+            me_value = int(state.me_var.get())
             
             # Validate ME% (0-10 is typical range in EVE)
             if me_value < 0:
@@ -695,7 +441,7 @@ class BlueprintManager:
                 me_value = 10
                 
             # Set validated value
-            module.me_var.set(str(me_value))
+            state.me_var.set(str(me_value))
             
             # Get the category for this module
             for category_type, modules in self.discovered_modules.items():
@@ -707,7 +453,7 @@ class BlueprintManager:
             
         except ValueError:
             # Reset to 0 if invalid
-            module.me_var.set("0")
+            state.me_var.set("0")
     
     def validate_te_entry(self, module):
         """
@@ -716,9 +462,10 @@ class BlueprintManager:
         Args:
             module: Module with TE% entry to validate
         """
+        state = self.ui_state.get(module)
         try:
             # Get TE% value
-            te_value = int(module.te_var.get())
+            te_value = int(state.te_var.get())
             
             # Validate TE% (0-20 is typical range in EVE)
             if te_value < 0:
@@ -727,7 +474,7 @@ class BlueprintManager:
                 te_value = 20
                 
             # Set validated value
-            module.te_var.set(str(te_value))
+            state.te_var.set(str(te_value))
             
             # Get the category for this module
             for category_type, modules in self.discovered_modules.items():
@@ -739,69 +486,7 @@ class BlueprintManager:
             
         except ValueError:
             # Reset to 0 if invalid
-            module.te_var.set("0")
-    
-    def validate_capital_component_me(self, event, comp_name):
-        """
-        Validate ME% entry for capital components
-        
-        Args:
-            event: FocusOut event
-            comp_name: Name of the capital component
-        """
-        try:
-            # Get ME% value from the entry widget
-            me_entry = event.widget
-            me_value = int(me_entry.get())
-            
-            # Validate ME% (0-10 is typical range in EVE)
-            if me_value < 0:
-                me_value = 0
-            elif me_value > 10:
-                me_value = 10
-                
-            # Set validated value
-            me_entry.delete(0, tk.END)
-            me_entry.insert(0, str(me_value))
-            
-            # Update blueprint config
-            update_blueprint_me(self.blueprint_config, 'component_blueprints', comp_name, me_value)
-            
-        except ValueError:
-            # Reset to 0 if invalid
-            me_entry.delete(0, tk.END)
-            me_entry.insert(0, "0")
-    
-    def validate_capital_component_te(self, event, comp_name):
-        """
-        Validate TE% entry for capital components
-        
-        Args:
-            event: FocusOut event
-            comp_name: Name of the capital component
-        """
-        try:
-            # Get TE% value from the entry widget
-            te_entry = event.widget
-            te_value = int(te_entry.get())
-            
-            # Validate TE% (0-20 is typical range in EVE)
-            if te_value < 0:
-                te_value = 0
-            elif te_value > 20:
-                te_value = 20
-                
-            # Set validated value
-            te_entry.delete(0, tk.END)
-            te_entry.insert(0, str(te_value))
-            
-            # Update blueprint config
-            update_blueprint_te(self.blueprint_config, 'component_blueprints', comp_name, te_value)
-            
-        except ValueError:
-            # Reset to 0 if invalid
-            te_entry.delete(0, tk.END)
-            te_entry.insert(0, "0")
+            state.te_var.set("0")
     
     def create_blueprint_window(self, blueprint_window):
         """Create the blueprint management window interface"""
@@ -923,11 +608,12 @@ class BlueprintManager:
                 continue
             
             for module_name, module in modules.items():
+                state = self.ui_state.find(module)
                 # Special handling for capital components
                 if category_name == 'capital_components':
-                    if hasattr(module, 'ownership_var'):
+                    if state is not None and state.ownership_var is not None:
                         try:
-                            ownership_status = module.ownership_var.get()
+                            ownership_status = state.ownership_var.get()
                             is_owned = (ownership_status == "owned")
                             
                             # Make sure the category exists
@@ -949,20 +635,15 @@ class BlueprintManager:
                             pass
                 
                 # Ships, Capital Ships, and Components
-                elif hasattr(module, 'ownership_var'):
+                elif state is not None and state.ownership_var is not None:
                     try:
                         # Get the ownership status from the UI variable
-                        var_value = module.ownership_var.get()
+                        var_value = state.ownership_var.get()
                         is_owned = (var_value == "owned")
                         
-                        invented_var = getattr(module, 'invented_var', None)
-                        is_invented = invented_var.get() if invented_var else False
-                        
-                        me_var = getattr(module, 'me_var', None)
-                        me_value = int(me_var.get()) if me_var and me_var.get().isdigit() else 0
-                        
-                        te_var = getattr(module, 'te_var', None)
-                        te_value = int(te_var.get()) if te_var and te_var.get().isdigit() else 0
+                        is_invented = state.invented_var.get() if state.invented_var else False
+                        me_value = int(state.me_var.get()) if state.me_var and state.me_var.get().isdigit() else 0
+                        te_value = int(state.te_var.get()) if state.te_var and state.te_var.get().isdigit() else 0
                         
                         # Make sure the category exists
                         if category not in self.blueprint_config:
@@ -992,13 +673,14 @@ class BlueprintManager:
         for category_name, modules in self.discovered_modules.items():
             category = self.get_category_from_module_type(category_name)
             for module_name, module in modules.items():
-                if hasattr(module, 'me_var'):
+                state = self.ui_state.find(module)
+                if state is not None and state.me_var is not None:
                     try:
-                        me_value = int(module.me_var.get())
+                        me_value = int(state.me_var.get())
                         # Ensure ME is not negative
                         if me_value < 0:
                             me_value = 0
-                            module.me_var.set("0")
+                            state.me_var.set("0")
                         
                         # Special handling for capital components
                         if category_name == 'capital_components':
@@ -1018,7 +700,7 @@ class BlueprintManager:
                             update_blueprint_me(self.blueprint_config, category, module_name, me_value)
                     except ValueError:
                         # Invalid ME value, set to 0
-                        module.me_var.set("0")
+                        state.me_var.set("0")
                         if category_name == 'capital_components':
                             if 'component_blueprints' in self.blueprint_config and module_name in self.blueprint_config['component_blueprints']:
                                 self.blueprint_config['component_blueprints'][module_name]['me'] = 0
@@ -1029,13 +711,14 @@ class BlueprintManager:
         for category_name, modules in self.discovered_modules.items():
             category = self.get_category_from_module_type(category_name)
             for module_name, module in modules.items():
-                if hasattr(module, 'te_var'):
+                state = self.ui_state.find(module)
+                if state is not None and state.te_var is not None:
                     try:
-                        te_value = int(module.te_var.get())
+                        te_value = int(state.te_var.get())
                         # Ensure TE is not negative
                         if te_value < 0:
                             te_value = 0
-                            module.te_var.set("0")
+                            state.te_var.set("0")
                         
                         # Special handling for capital components
                         if category_name == 'capital_components':
@@ -1055,7 +738,7 @@ class BlueprintManager:
                             update_blueprint_te(self.blueprint_config, category, module_name, te_value)
                     except ValueError:
                         # Invalid TE value, set to 0
-                        module.te_var.set("0")
+                        state.te_var.set("0")
                         if category_name == 'capital_components':
                             if 'component_blueprints' in self.blueprint_config and module_name in self.blueprint_config['component_blueprints']:
                                 self.blueprint_config['component_blueprints'][module_name]['te'] = 0
@@ -1078,8 +761,7 @@ class BlueprintManager:
             # Reset ships
             if hasattr(self.module_registry, 'ships'):
                 for ship_name, ship in self.module_registry.ships.items():
-                    if hasattr(ship, 'owned_status'):
-                        ship.owned_status = False
+                    self.module_registry.set_owned_status('ships', ship_name, False)
                         
                     # Also update the blueprint config
                     if 'ship_blueprints' in self.blueprint_config and ship_name in self.blueprint_config['ship_blueprints']:
@@ -1088,13 +770,15 @@ class BlueprintManager:
             # Reset capital ships
             if hasattr(self.module_registry, 'capital_ships'):
                 for ship_name, ship in self.module_registry.capital_ships.items():
-                    if hasattr(ship, 'owned_status'):
-                        ship.owned_status = False
+                    self.module_registry.set_owned_status('capital_ships', ship_name, False)
                         
                     # Also update the blueprint config
                     if 'capital_ship_blueprints' in self.blueprint_config and ship_name in self.blueprint_config['capital_ship_blueprints']:
                         self.blueprint_config['capital_ship_blueprints'][ship_name]['owned'] = False
             
+            # Show the reset in the open tables
+            self.refresh_tables()
+            
             # Save the updated configuration
             from core.config.blueprint_config import save_blueprint_ownership
             success = save_blueprint_ownership(self.blueprint_config)
@@ -1139,14 +823,31 @@ class BlueprintManager:
             # Update in config
             update_blueprint_ownership(self.blueprint_config, category, module_name, config_value)
             # Update module state
-            module.owned_status = (config_value == "Owned")
+            self._set_owned_status(REGISTRY_CATEGORIES.get(category), module_name, module, config_value == "Owned")
             # Update status
             self.status_var.set(f"Updated {module.display_name} ownership to {config_value}")
         
+    def _set_owned_status(self, registry_category, module_name, module, owned):
+        """
+        Set a module's ownership, keeping the registry's ownership index current
+        
+        Args:
+            registry_category: Registry collection of the module, or None if unknown
+            module_name: Registry name of the module
+            module: The module object
+            owned: Whether the blueprint is owned
+        """
+        registry = self.module_registry
+        if registry is not None and registry_category in getattr(registry, 'INDEXED_CATEGORIES', ()):
+            if registry.set_owned_status(registry_category, module_name, owned):
+                return
+        if hasattr(module, 'owned_status'):
+            module.owned_status = owned
+        
     def update_ship_ownership(self, module_name, module, value):
         """Update ship blueprint ownership in configuration"""
         # For ships tab, determine if this is a regular ship or a capital ship
-        if hasattr(module, 'is_capital_ship') and module.is_capital_ship:
+        if getattr(module, 'module_type', None) == 'capital_ship':
             category = "capital_ship_blueprints"
         else:
             category = "ship_blueprints"
@@ -1158,7 +859,7 @@ class BlueprintManager:
         update_blueprint_ownership(self.blueprint_config, category, module_name, config_value)
         
         # Update module state
-        module.owned_status = (config_value == "Owned")
+        self._set_owned_status(REGISTRY_CATEGORIES[category], module_name, module, config_value == "Owned")
         
         # Update status
         self.status_var.set(f"Updated {module.display_name} ownership to {config_value}")
@@ -1172,7 +873,7 @@ class BlueprintManager:
         update_blueprint_ownership(self.blueprint_config, 'components', module_name, config_value)
         
         # Update module state
-        module.owned_status = (config_value == "Owned")
+        self._set_owned_status('components', module_name, module, config_value == "Owned")
         
         # Update status
         self.status_var.set(f"Updated {module.display_name} ownership to {config_value}")
@@ -1186,69 +887,11 @@ class BlueprintManager:
         update_blueprint_ownership(self.blueprint_config, 'component_blueprints', module_name, config_value)
         
         # Update module state
-        module.owned_status = (config_value == "Owned")
+        self._set_owned_status('capital_components', module_name, module, config_value == "Owned")
         
         # Update status
         self.status_var.set(f"Updated {module.display_name} ownership to {config_value}")
 
-    def validate_me(self, event, category, module_name):
-        """Validate and update ME% value"""
-        entry_widget = event.widget
-        value = entry_widget.get()
-        
-        try:
-            # Validate as a number between 0 and 10
-            me_value = int(value)
-            if me_value < 0:
-                me_value = 0
-            elif me_value > 10:
-                me_value = 10
-                
-            # Update the entry with validated value
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, str(me_value))
-            
-            # Update the config
-            update_blueprint_me(self.blueprint_config, category, module_name, me_value)
-            
-        except ValueError:
-            # Reset to 0 if invalid
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, "0")
-            update_blueprint_me(self.blueprint_config, category, module_name, 0)
-            
-        # Update GUI if needed
-        self.refresh_registry_if_needed()
-            
-    def validate_te(self, event, category, module_name):
-        """Validate and update TE% value"""
-        entry_widget = event.widget
-        value = entry_widget.get()
-        
-        try:
-            # Validate as a number between 0 and 20
-            te_value = int(value)
-            if te_value < 0:
-                te_value = 0
-            elif te_value > 20:
-                te_value = 20
-                
-            # Update the entry with validated value
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, str(te_value))
-            
-            # Update the config
-            update_blueprint_te(self.blueprint_config, category, module_name, te_value)
-            
-        except ValueError:
-            # Reset to 0 if invalid
-            entry_widget.delete(0, tk.END)
-            entry_widget.insert(0, "0")
-            update_blueprint_te(self.blueprint_config, category, module_name, 0)
-            
-        # Update GUI if needed
-        self.refresh_registry_if_needed()
-        
     def refresh_registry_if_needed(self, initial_load=False):
         """Refresh the module registry if it's available"""
         if hasattr(self, 'module_registry') and self.module_registry:
@@ -1259,13 +902,13 @@ class BlueprintManager:
                 if hasattr(self.module_registry, 'ships'):
                     for ship_name, ship in self.module_registry.ships.items():
                         if 'ship_blueprints' in self.blueprint_config and ship_name in self.blueprint_config['ship_blueprints']:
-                            ship.owned_status = self.blueprint_config['ship_blueprints'][ship_name].get('owned', False)
+                            self.module_registry.set_owned_status('ships', ship_name, self.blueprint_config['ship_blueprints'][ship_name].get('owned', False))
                             debug_print(f"Updated registry ship {ship_name} to owned_status={ship.owned_status}")
                 
                 if hasattr(self.module_registry, 'capital_ships'):
                     for ship_name, ship in self.module_registry.capital_ships.items():
                         if 'capital_ship_blueprints' in self.blueprint_config and ship_name in self.blueprint_config['capital_ship_blueprints']:
-                            ship.owned_status = self.blueprint_config['capital_ship_blueprints'][ship_name].get('owned', False)
+                            self.module_registry.set_owned_status('capital_ships', ship_name, self.blueprint_config['capital_ship_blueprints'][ship_name].get('owned', False))
                             debug_print(f"Updated registry capital ship {ship_name} to owned_status={ship.owned_status}")
             
             # Also update objects in discovered_modules to match config on initial load
@@ -1274,21 +917,19 @@ class BlueprintManager:
                 config_category = self.get_category_from_module_type(category_name)
                 
                 for module_name, module in modules.items():
+                    state = self.ui_state.find(module)
                     if config_category in self.blueprint_config and module_name in self.blueprint_config[config_category]:
                         is_owned = self.blueprint_config[config_category][module_name].get('owned', False)
                         
                         # Update module object ownership attribute
-                        if hasattr(module, 'owned_status'):
-                            module.owned_status = is_owned
-                        elif hasattr(module, 'blueprint_owned'):
-                            module.blueprint_owned = is_owned
+                        self._set_owned_status(category_name, module_name, module, is_owned)
                         
                         # Update UI StringVar only on initial load
-                        if initial_load and hasattr(module, 'ownership_var'):
+                        if initial_load and state is not None and state.ownership_var is not None:
                             ownership_value = "owned" if is_owned else "unowned"
-                            if module.ownership_var.get() != ownership_value:
-                                debug_print(f"Updating UI element for {module_name}, setting ownership_var from {module.ownership_var.get()} to {ownership_value}")
-                                module.ownership_var.set(ownership_value)
+                            if state.ownership_var.get() != ownership_value:
+                                debug_print(f"Updating UI element for {module_name}, setting ownership_var from {state.ownership_var.get()} to {ownership_value}")
+                                state.ownership_var.set(ownership_value)
 
     def get_combined_ships_dict(self):
         """Get a combined dictionary of ships and capital ships"""
@@ -1336,6 +977,11 @@ class BlueprintManager:
             
             # Configure the Spinbox with proper contrast
             style.configure("TSpinbox", fieldbackground="#3c3c3c", foreground="#ffffff")
+            
+            # Configure the blueprint tables
+            style.configure("Treeview", background="#3c3c3c", fieldbackground="#3c3c3c", foreground="#ffffff")
+            style.configure("Treeview.Heading", background="#2e2e2e", foreground="#ffffff")
+            style.map("Treeview", background=[("selected", "#4c4c4c")])
         else:
             # Reset to default theme
             style = ttk.Style(window)
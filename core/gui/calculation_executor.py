@@ -0,0 +1,205 @@
+"""
+Background calculation executor for EVE Production Calculator
+
+Heavy calculations run on a worker thread so the window keeps responding.
+Tkinter may only be used from the thread that created it, so workers never
+touch widgets: finished jobs are put on a queue, and the Tk thread drains it
+through after() polling and runs the result callbacks itself.
+
+A thread is used rather than a process because the calculator, its caches
+and the registry live in this process and are updated in place; a process
+pool would have to pickle the registry for every job.
+"""
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Any, Callable, Dict, Optional
+
+from core.utils.debug import debug_print
+
+class CalculationJob:
+    """A submitted calculation and the callbacks for its result"""
+    __slots__ = ('job_id', 'tag', 'description', 'on_done', 'on_error', 'future', 'cancelled')
+
+    def __init__(self, job_id: int, tag: str, description: str,
+                 on_done: Optional[Callable[[Any], None]], on_error: Optional[Callable[[BaseException], None]]):
+        self.job_id = job_id
+        self.tag = tag
+        self.description = description
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+class CalculationExecutor:
+    """
+    Runs calculations on a worker thread and hands results back to the Tk thread
+
+    Jobs are grouped by tag. Submitting a job cancels the previous job with the
+    same tag, so only the latest calculation of, for example, the output pane
+    is ever displayed. A job that is already running cannot be interrupted; it
+    is marked as cancelled and its result is dropped when it finishes.
+    """
+
+    def __init__(self, widget, max_workers: int = 1, poll_interval_ms: int = 50,
+                 on_busy_change: Optional[Callable[[bool, str], None]] = None):
+        """
+        Create the executor
+
+        Args:
+            widget: Any tkinter widget, used to schedule after() polling
+            max_workers: Number of worker threads; one keeps jobs from racing
+                each other on the calculator's caches
+            poll_interval_ms: How often finished jobs are collected while any are pending
+            on_busy_change: Called on the Tk thread with (busy, description) whenever
+                the executor starts or stops having pending jobs, and when a job
+                is submitted while it is already busy
+        """
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self.on_busy_change = on_busy_change
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="calculation")
+        self._finished: "queue.Queue[CalculationJob]" = queue.Queue()
+        self._pending: Dict[int, CalculationJob] = {}
+        self._job_ids = itertools.count(1)
+        self._poll_id = None
+        self._closed = False
+        self._reported_busy = False
+
+    @property
+    def busy(self) -> bool:
+        """True while any job that has not been cancelled is waiting or running"""
+        return any(not job.cancelled for job in self._pending.values())
+
+    def submit(self, tag: str, function: Callable[[], Any],
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               description: str = "") -> int:
+        """
+        Run a calculation on the worker thread
+
+        Must be called from the Tk thread. The callbacks also run on the Tk thread.
+
+        Args:
+            tag: Group of the job; a pending job with the same tag is cancelled
+            function: Zero-argument callable doing the calculation
+            on_done: Called with the function's return value
+            on_error: Called with the exception if the function raised
+            description: Text describing the job for the progress indicator
+
+        Returns:
+            The job ID
+        """
+        if self._closed:
+            raise RuntimeError("Calculation executor has been shut down")
+
+        # Replaced without reporting an idle state in between
+        self._cancel_jobs(tag)
+
+        job = CalculationJob(next(self._job_ids), tag, description, on_done, on_error)
+        self._pending[job.job_id] = job
+        job.future = self._pool.submit(function)
+        # Runs on the worker thread (or right here if the job already finished)
+        job.future.add_done_callback(lambda future, job=job: self._finished.put(job))
+
+        debug_print(f"Submitted calculation job {job.job_id} ({tag}): {description}")
+        self._update_busy(description)
+        self._schedule_poll()
+        return job.job_id
+
+    def cancel(self, tag: Optional[str] = None) -> int:
+        """
+        Cancel pending jobs
+
+        Jobs that have not started are removed from the queue; running jobs are
+        left to finish and their results are discarded.
+
+        Args:
+            tag: Only cancel jobs with this tag, or None for every job
+
+        Returns:
+            Number of jobs cancelled
+        """
+        cancelled = self._cancel_jobs(tag)
+        if cancelled:
+            self._update_busy("")
+        return cancelled
+
+    def _cancel_jobs(self, tag: Optional[str]) -> int:
+        """Mark jobs as cancelled without reporting the busy state"""
+        cancelled = 0
+        for job in list(self._pending.values()):
+            if tag is not None and job.tag != tag or job.cancelled:
+                continue
+            job.cancelled = True
+            if job.future.cancel():
+                # Never started, so there is nothing left to collect
+                del self._pending[job.job_id]
+            cancelled += 1
+            debug_print(f"Cancelled calculation job {job.job_id} ({job.tag})")
+        return cancelled
+
+    def shutdown(self):
+        """Cancel every job and stop the worker thread without waiting for it"""
+        self._closed = True
+        self.cancel()
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._pending.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_poll(self):
+        """Start after() polling if it is not already running"""
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.widget.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """Hand the results of finished jobs to their callbacks, on the Tk thread"""
+        self._poll_id = None
+        try:
+            while True:
+                try:
+                    job = self._finished.get_nowait()
+                except queue.Empty:
+                    break
+                if self._pending.pop(job.job_id, None) is None:
+                    continue
+                self._deliver(job)
+        finally:
+            # Keep polling even if a result callback raised
+            if self._pending:
+                self._schedule_poll()
+            self._update_busy("")
+
+    def _deliver(self, job: CalculationJob):
+        """Run the callback of one finished job"""
+        if job.cancelled:
+            debug_print(f"Dropped result of cancelled calculation job {job.job_id}")
+            return
+
+        try:
+            result = job.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            debug_print(f"Calculation job {job.job_id} failed: {e}")
+            if job.on_error is not None:
+                job.on_error(e)
+            return
+
+        if job.on_done is not None:
+            job.on_done(result)
+
+    def _update_busy(self, description: str):
+        """Report the busy state if it changed, or a new job started while busy"""
+        busy = self.busy
+        if self._closed or busy == self._reported_busy and not (busy and description):
+            return
+        self._reported_busy = busy
+        if self.on_busy_change is not None:
+            self.on_busy_change(busy, description)
@@ -0,0 +1,87 @@
+"""
+Help and About dialogs for EVE Production Calculator
+
+Imported by the main window the first time one of the dialogs is opened
+"""
+
+import tkinter as tk
+from tkinter import messagebox
+
+HELP_TEXT = """
+EVE Production Calculator Help
+
+Ship Tab:
+- Select a faction and ship type to filter the ship list
+- Choose a ship from the dropdown to view its details
+- Enter the quantity and click Calculate to see the resource requirements
+
+Components Tab:
+- Select a component to view its details
+- Enter the quantity and click Calculate to see the resource requirements
+
+PI Materials Tab:
+- Select a PI level to filter the materials
+- Choose a material to view its details
+- Enter the quantity and click Calculate to see the resource requirements
+
+Blueprint Ownership:
+- Access the Blueprint Ownership Editor from the Blueprints menu
+- Set which blueprints you own by using the radio buttons
+- Ownership status affects which ships appear in the "Only Owned" filter
+
+Settings:
+- Change theme between light and dark mode
+- Export or import your settings to backup your configuration
+"""
+
+ABOUT_TEXT = """
+EVE Production Calculator
+
+Version: 1.0.0
+
+A tool for calculating resource requirements for manufacturing ships, 
+components, and managing Planetary Interaction (PI) materials in EVE Online.
+
+Features:
+- Ship production calculation
+- Component production calculation
+- PI material processing
+- Blueprint ownership management
+- Dark mode support
+- Settings import/export
+
+ 2025 EVE Production Calculator
+"""
+
+def show_help(parent, theme='light'):
+    """
+    Display help information in its own window
+    
+    Args:
+        parent: Parent window
+        theme: Current theme name ('light' or 'dark')
+    """
+    help_window = tk.Toplevel(parent)
+    help_window.title("Help")
+    help_window.geometry("600x500")
+    help_window.minsize(500, 400)
+    
+    # Help text widget
+    help_text_widget = tk.Text(help_window, wrap="word", padx=10, pady=10)
+    help_text_widget.pack(fill="both", expand=True)
+    help_text_widget.insert("1.0", HELP_TEXT)
+    help_text_widget.config(state="disabled")
+    
+    # Apply current theme to help window
+    if theme == 'dark':
+        help_window.config(bg="#2e2e2e")
+        help_text_widget.config(bg="#3c3c3c", fg="#ffffff")
+
+def show_about(parent=None):
+    """
+    Display about information
+    
+    Args:
+        parent: Parent window (optional)
+    """
+    messagebox.showinfo("About", ABOUT_TEXT, parent=parent)
@@ -3,15 +3,15 @@ Refactored GUI for EVE Production Calculator
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox
+import functools
 import json
 import os
-import shutil
 
 from core.utils.debug import debug_print
 
 from core.module_registry import ModuleRegistry, ShipModule, CapitalShipModule, ComponentModule
-from core.calculator import RequirementsCalculator
+from core.calculator import RequirementsCalculator, REGISTRY_CATEGORIES
 from core.gui.gui_utils import (
     create_labeled_dropdown,
     create_labeled_entry,
@@ -21,10 +21,12 @@ from core.gui.gui_utils import (
     set_text_content,
     create_grid_view
 )
-from core.gui.blueprints_gui import BlueprintManager
-from core.gui.settings_gui import SettingsWindow
-from core.gui.blueprint_utils import open_blueprint_editor, reset_ship_ownership, apply_blueprint_changes
 from core.config.settings import load_settings, save_settings
+from core.config.blueprint_config import close_blueprint_store
+from core.gui.calculation_executor import CalculationExecutor
+
+# The blueprint editor, settings window, file dialogs and help/about dialogs are
+# imported inside the methods that open them, so they cost nothing at startup.
 
 class EveProductionCalculator(tk.Tk):
     """Main GUI application for EVE Production Calculator"""
@@ -73,6 +75,12 @@ class EveProductionCalculator(tk.Tk):
         # Ownership editor shown flag
         self.ownership_editor_shown = False
         
+        # Status bar text, also used by the blueprint editor
+        self.status_var = tk.StringVar(value="Ready")
+        
+        # Calculations run on a worker thread; results come back through after() polling
+        self.executor = CalculationExecutor(self, on_busy_change=self._on_calculation_busy)
+        
         # Create UI
         self.create_ui()
         
@@ -119,6 +127,15 @@ class EveProductionCalculator(tk.Tk):
         self.rowconfigure(0, weight=2)  # Notebook gets more space
         self.rowconfigure(1, weight=3)  # Output frame gets more space
         
+        # Status bar with a progress indicator for background calculations
+        status_frame = ttk.Frame(self)
+        status_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 5))
+        status_frame.columnconfigure(0, weight=1)
+        ttk.Label(status_frame, textvariable=self.status_var, anchor="w").grid(row=0, column=0, sticky="ew")
+        self.progress_bar = ttk.Progressbar(status_frame, mode="indeterminate", length=150)
+        self.progress_bar.grid(row=0, column=1, sticky="e")
+        self.progress_bar.grid_remove()
+        
         # Create content for each tab
         self.create_ship_tab()
         self.create_component_tab()
@@ -134,6 +151,9 @@ class EveProductionCalculator(tk.Tk):
         """Handle tab changes to update the shared output areas"""
         tab_index = self.notebook.index(self.notebook.select())
         
+        # The running calculation was for the previous tab's selection
+        self.cancel_calculation()
+        
         # Clear output areas
         set_text_content(self.output_text, "")
         
@@ -330,6 +350,9 @@ class EveProductionCalculator(tk.Tk):
             item_name: Name of the item to display details for
             getter_func: Function to retrieve the item from registry
         """
+        # A calculation for the previous selection is no longer wanted
+        self.cancel_calculation()
+        
         if not item_name:
             set_text_content(self.output_text, f"No {item_type} selected.")
             return
@@ -399,14 +422,15 @@ class EveProductionCalculator(tk.Tk):
         # Calculate requirements based on item type
         is_capital_ship = isinstance(item, CapitalShipModule)
         config_category = 'capital_ship_blueprints' if is_capital_ship else 'ship_blueprints'
-        
-        if is_capital_ship:
-            requirements = self.calculator.calculate_capital_ship_requirements(item.name)
-        else:
-            requirements = self.calculator.calculate_ship_requirements(item.name)
-            
-        # Format and display requirements with proper quantity
-        self._display_requirements(item, requirements, config_category, int(quantity_var.get()))
+        registry_category = 'capital_ships' if is_capital_ship else 'ships'
+        quantity = int(quantity_var.get())
+        
+        # Round once per job like the game does instead of per unit
+        self._start_calculation(
+            item, config_category, quantity,
+            functools.partial(self.calculator.calculate_job_requirements,
+                              registry_category, item.name, quantity, **self._get_job_bonuses())
+        )
     
     def calculate_component_requirements(self):
         """Calculate and display component material requirements"""
@@ -419,11 +443,13 @@ class EveProductionCalculator(tk.Tk):
         # Find component in registry
         item = self.registry.get_component_by_display_name(selected_item)
         
-        # Calculate requirements
-        requirements = self.calculator.calculate_component_requirements(item.name)
-        
-        # Format and display requirements with proper quantity
-        self._display_requirements(item, requirements, 'components', int(quantity_var.get()))
+        # Calculate requirements, rounding once per job like the game does
+        quantity = int(quantity_var.get())
+        self._start_calculation(
+            item, 'components', quantity,
+            functools.partial(self.calculator.calculate_job_requirements,
+                              'components', item.name, quantity, **self._get_job_bonuses())
+        )
     
     def calculate_pi_requirements(self):
         """Calculate and display PI material requirements"""
@@ -436,11 +462,74 @@ class EveProductionCalculator(tk.Tk):
         # Find PI material in registry
         item = self.registry.get_pi_material_by_display_name(selected_item)
         
-        # Calculate requirements
-        requirements = self.calculator.calculate_pi_requirements(item.name)
+        # Calculate requirements in whole factory cycles
+        quantity = int(quantity_var.get())
+        self._start_calculation(
+            item, 'pi_materials', quantity,
+            functools.partial(self.calculator.calculate_pi_requirements, item.name, quantity)
+        )
+    
+    def _start_calculation(self, item, config_category, quantity, calculate):
+        """
+        Run a requirements calculation in the background and display its result
+        
+        Args:
+            item: The item module being calculated
+            config_category: The configuration category for ME/TE retrieval
+            quantity: The number of items to produce
+            calculate: Zero-argument callable returning the requirements dictionary
+        """
+        self.executor.submit(
+            'requirements',
+            calculate,
+            on_done=lambda requirements: self._display_requirements(item, requirements, config_category, quantity),
+            on_error=self._on_calculation_error,
+            description=f"Calculating {quantity}x {item.display_name}..."
+        )
+    
+    def cancel_calculation(self):
+        """Cancel the requirements calculation in progress, if any"""
+        if self.executor.cancel('requirements'):
+            self.status_var.set("Calculation cancelled")
+    
+    def _on_calculation_busy(self, busy, description):
+        """
+        Show or hide the progress indicator when calculations start or stop
+        
+        Args:
+            busy: Whether a calculation is pending
+            description: Text describing the calculation that started
+        """
+        if busy:
+            self.status_var.set(description)
+            self.progress_bar.grid()
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.grid_remove()
+    
+    def _on_calculation_error(self, error):
+        """
+        Report a calculation that raised an exception
+        
+        Args:
+            error: The exception raised by the calculation
+        """
+        self.status_var.set("Calculation failed")
+        messagebox.showerror("Error", f"Calculation failed: {error}")
+    
+    def _get_job_bonuses(self):
+        """
+        Get the structure and rig material bonuses for job calculations
         
-        # Format and display requirements with proper quantity
-        self._display_requirements(item, requirements, 'pi_materials', int(quantity_var.get()))
+        Returns:
+            dict: Keyword arguments for RequirementsCalculator.calculate_job_requirements
+        """
+        return {
+            'runs_per_job': self.settings.get('runs_per_job') or None,
+            'structure_bonus': float(self.settings.get('structure_me_bonus', 0.0)),
+            'rig_bonus': float(self.settings.get('rig_me_bonus', 0.0))
+        }
     
     def _validate_calculation_input(self, selected_item, item_type, quantity_var):
         """
@@ -476,7 +565,7 @@ class EveProductionCalculator(tk.Tk):
         
         Args:
             item: The item module
-            requirements: The calculated requirements dictionary
+            requirements: The calculated requirements dictionary for the whole quantity
             config_category: The configuration category for ME/TE retrieval
             quantity: The number of items to produce
         """
@@ -484,31 +573,40 @@ class EveProductionCalculator(tk.Tk):
         me_level = self.calculator.get_me_level(config_category, item.name)
         te_level = self.calculator.get_te_level(config_category, item.name)
         
-        # Calculate production time
-        base_time = getattr(item, 'production_time', 3600)  # Default to 1 hour if not specified
-        production_time = self.calculator.calculate_production_time(base_time, te_level)
+        # Production time of one run from the parsed build time, PI cycle time for PI materials
+        if config_category == 'pi_materials':
+            time_label = "Cycle Time per Batch"
+            production_time = item.cycle_time or None
+        else:
+            time_label = "Production Time per Unit"
+            production_time = self.calculator.calculate_job_duration(
+                REGISTRY_CATEGORIES.get(config_category, config_category), item.name)
         
         # Format time for display
-        hours, remainder = divmod(production_time, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        time_str = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
+        if production_time is None:
+            time_str = "N/A"
+        else:
+            hours, remainder = divmod(production_time, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            time_str = f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
         
         # Format requirements for display
         requirements_text = f"Material Requirements for {quantity}x {item.display_name} (ME: {me_level}%, TE: {te_level}%):\n\n"
-        requirements_text += f"Production Time per Unit: {time_str}\n\n"
+        requirements_text += f"{time_label}: {time_str}\n\n"
         
         # Sort materials alphabetically
         sorted_materials = sorted(requirements.items())
         
-        for material, material_quantity in sorted_materials:
-            # Multiply by quantity
-            total_quantity = material_quantity * quantity
+        for material, total_quantity in sorted_materials:
             requirements_text += f"{material}: {total_quantity:,.2f}\n"
             
         set_text_content(self.output_text, requirements_text)
+        self.status_var.set(f"Calculated {quantity}x {item.display_name}")
     
     def edit_blueprint_ownership(self):
         """Open the Blueprint Ownership Editor"""
+        from core.gui.blueprint_utils import open_blueprint_editor
+        
         open_blueprint_editor(
             self, 
             self.registry, 
@@ -518,6 +616,8 @@ class EveProductionCalculator(tk.Tk):
     
     def reset_ship_ownership(self):
         """Reset ownership status for all ships"""
+        from core.gui.blueprint_utils import reset_ship_ownership
+        
         # Define refresh function
         def refresh_ui():
             current_tab = self.notebook.index(self.notebook.select())
@@ -537,6 +637,7 @@ class EveProductionCalculator(tk.Tk):
         self.ownership_editor_shown = False
         
         # Apply the changes
+        from core.gui.blueprint_utils import apply_blueprint_changes
         apply_blueprint_changes(self.blueprint_config, self.registry)
         
         # Refresh the UI based on the current tab
@@ -601,6 +702,8 @@ class EveProductionCalculator(tk.Tk):
     
     def open_settings(self):
         """Open the settings window"""
+        from core.gui.settings_gui import SettingsWindow
+        
         settings_window = SettingsWindow(self, self.registry, self.calculator, self.blueprint_config)
     
     def apply_theme(self, theme):
@@ -659,6 +762,8 @@ class EveProductionCalculator(tk.Tk):
     
     def export_settings(self):
         """Export settings to a JSON file"""
+        from tkinter import filedialog
+        
         # Ask for file location
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
@@ -684,6 +789,8 @@ class EveProductionCalculator(tk.Tk):
     
     def import_settings(self):
         """Import settings from a JSON file"""
+        from tkinter import filedialog
+        
         # Ask for file location
         file_path = filedialog.askopenfilename(
             defaultextension=".json",
@@ -724,75 +831,21 @@ class EveProductionCalculator(tk.Tk):
         
     def show_help(self):
         """Display help information"""
-        help_text = """
-EVE Production Calculator Help
-
-Ship Tab:
-- Select a faction and ship type to filter the ship list
-- Choose a ship from the dropdown to view its details
-- Enter the quantity and click Calculate to see the resource requirements
-
-Components Tab:
-- Select a component to view its details
-- Enter the quantity and click Calculate to see the resource requirements
-
-PI Materials Tab:
-- Select a PI level to filter the materials
-- Choose a material to view its details
-- Enter the quantity and click Calculate to see the resource requirements
-
-Blueprint Ownership:
-- Access the Blueprint Ownership Editor from the Blueprints menu
-- Set which blueprints you own by using the radio buttons
-- Ownership status affects which ships appear in the "Only Owned" filter
-
-Settings:
-- Change theme between light and dark mode
-- Export or import your settings to backup your configuration
-"""
-        help_window = tk.Toplevel(self)
-        help_window.title("Help")
-        help_window.geometry("600x500")
-        help_window.minsize(500, 400)
-        
-        # Help text widget
-        help_text_widget = tk.Text(help_window, wrap="word", padx=10, pady=10)
-        help_text_widget.pack(fill="both", expand=True)
-        help_text_widget.insert("1.0", help_text)
-        help_text_widget.config(state="disabled")
-        
-        # Apply current theme to help window
-        if self.settings.get('theme') == 'dark':
-            help_window.config(bg="#2e2e2e")
-            help_text_widget.config(bg="#3c3c3c", fg="#ffffff")
+        from core.gui.dialogs import show_help
+        show_help(self, self.settings.get('theme'))
     
     def show_about(self):
         """Display about information"""
-        about_text = """
-EVE Production Calculator
-
-Version: 1.0.0
-
-A tool for calculating resource requirements for manufacturing ships, 
-components, and managing Planetary Interaction (PI) materials in EVE Online.
-
-Features:
-- Ship production calculation
-- Component production calculation
-- PI material processing
-- Blueprint ownership management
-- Dark mode support
-- Settings import/export
-
- 2025 EVE Production Calculator
-"""
-        messagebox.showinfo("About", about_text)
+        from core.gui.dialogs import show_about
+        show_about(self)
         
     def on_close(self):
         """Handle window close event"""
-        # Save blueprint configuration
-        with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'blueprint_ownership.json'), 'w') as f:
-            json.dump(self.blueprint_config, f, indent=4)
+        # Drop calculations still waiting for the worker thread
+        self.executor.shutdown()
+        
+        # Write blueprint edits still waiting in the write-behind store
+        close_blueprint_store()
         
         # Save settings
         save_settings(self.settings)
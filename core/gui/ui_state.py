@@ -0,0 +1,59 @@
+"""
+UI state side table for EVE Production Calculator
+
+Tkinter variables for the blueprint editor are kept here, keyed by item,
+instead of being attached to the model objects. The models stay slotted and
+free of GUI references, and a registry loaded without the GUI carries no UI
+state at all.
+"""
+from typing import Dict, Optional, Tuple
+
+class BlueprintUiState:
+    """Tkinter variables and settings of one blueprint row"""
+    __slots__ = ('ownership_var', 'me_var', 'te_var', 'invented_var', 'config_category')
+
+    def __init__(self):
+        self.ownership_var = None
+        self.me_var = None
+        self.te_var = None
+        self.invented_var = None
+        self.config_category = None
+
+class UiStateTable:
+    """UI state of blueprint rows, keyed by (module type, registry name)"""
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], BlueprintUiState] = {}
+
+    def get(self, module) -> BlueprintUiState:
+        """
+        Get the UI state of a module, creating an empty one if needed
+
+        Args:
+            module: Model object with module_type and name
+
+        Returns:
+            The module's BlueprintUiState
+        """
+        key = (module.module_type, module.name)
+        state = self._states.get(key)
+        if state is None:
+            state = BlueprintUiState()
+            self._states[key] = state
+        return state
+
+    def find(self, module) -> Optional[BlueprintUiState]:
+        """
+        Get the UI state of a module if a row was ever created for it
+
+        Args:
+            module: Model object with module_type and name
+
+        Returns:
+            The module's BlueprintUiState, or None
+        """
+        return self._states.get((module.module_type, module.name))
+
+    def clear(self):
+        """Drop all UI state"""
+        self._states.clear()
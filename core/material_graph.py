@@ -0,0 +1,356 @@
+"""
+Material graph for EVE Production Calculator
+
+This module compiles the recipes held by the module registry into an indexed
+production graph so full bill-of-materials expansions run as a single pass
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple, Callable, Sequence, Union
+
+from core.utils.debug import debug_print
+
+class MaterialGraph:
+    """
+    Compiled production graph of every item and material in the registry
+
+    Every buildable item and every referenced raw material is interned to an
+    integer node ID. Recipes are stored as compressed sparse rows: the inputs of
+    node ``n`` are ``inputs[offsets[n]:offsets[n + 1]]`` with the matching base
+    quantities in ``quantities``. ``topo_order`` lists the nodes so that every
+    product comes before all of its inputs.
+    """
+    def __init__(self):
+        self.names: List[str] = []  # Node ID -> display name
+        self.items: List[Optional[Tuple[str, str]]] = []  # Node ID -> (category, name), None for raw materials
+        self.ids: Dict[str, int] = {}  # Material or display name -> node ID
+        self.item_ids: Dict[Tuple[str, str], int] = {}  # (category, name) -> node ID
+
+        self.offsets = array('l', [0])
+        self.inputs = array('l')
+        self.quantities = array('d')
+
+        self.topo_order = array('l')
+        self._users: Optional[List[List[int]]] = None  # Reverse adjacency, built on first use
+        self.cyclic: set = set()  # Nodes on a cycle, never expanded
+        self.cycles: List[List[str]] = []
+        self.dangling: List[str] = []
+
+    @property
+    def node_count(self) -> int:
+        """Number of interned nodes"""
+        return len(self.names)
+
+    def has_recipe(self, node_id: int) -> bool:
+        """
+        Check if a node is built from other materials
+
+        Args:
+            node_id: ID of the node to check
+
+        Returns:
+            True if the node has inputs and is not part of a cycle
+        """
+        return self.offsets[node_id + 1] > self.offsets[node_id] and node_id not in self.cyclic
+
+    def get_node_id(self, category: str, name: str) -> Optional[int]:
+        """
+        Get the node ID of a registry item
+
+        Args:
+            category: Registry collection of the item
+            name: Registry name of the item
+
+        Returns:
+            Node ID if the item is in the graph, None otherwise
+        """
+        return self.item_ids.get((category, name))
+
+    def get_inputs(self, node_id: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """
+        Get the inputs of a node and their base quantities
+
+        Args:
+            node_id: ID of the node
+
+        Returns:
+            Tuple of (input node IDs, base quantities per unit)
+        """
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return self.inputs[start:end], self.quantities[start:end]
+
+    def get_dependents(self, node_id: int) -> set:
+        """
+        Get every product that uses a node directly or further up the tree
+
+        Args:
+            node_id: ID of the node
+
+        Returns:
+            Set of node IDs whose bill of materials includes this node
+        """
+        users = self._users
+        if users is None:
+            # Published only once complete, so a concurrent caller never sees a
+            # half-built index; at worst both threads build it
+            users = [[] for _ in range(self.node_count)]
+            for product in range(self.node_count):
+                for index in range(self.offsets[product], self.offsets[product + 1]):
+                    users[self.inputs[index]].append(product)
+            self._users = users
+
+        dependents = set()
+        pending = [node_id]
+        while pending:
+            for product in users[pending.pop()]:
+                if product not in dependents:
+                    dependents.add(product)
+                    pending.append(product)
+
+        dependents.discard(node_id)
+        return dependents
+
+    def expand(self, demand: Dict[int, Union[int, float]], input_quantities: Optional[Callable[[int, Union[int, float]], Sequence[float]]] = None) -> Dict[int, Union[int, float]]:
+        """
+        Push a demand vector down the graph to raw materials in one pass
+
+        Args:
+            demand: Dictionary of node ID -> quantity to build
+            input_quantities: Optional function taking a node ID and the total
+                quantity of it to build, and returning the total quantity of
+                each input (e.g. with ME and per-job rounding applied).
+                Defaults to the base recipe quantities times the amount.
+
+        Returns:
+            Dictionary of node ID -> total quantity, covering the requested
+            nodes, every intermediate and every raw material reached
+        """
+        totals = dict(demand)
+        offsets, inputs, base_quantities = self.offsets, self.inputs, self.quantities
+
+        for node_id in self.topo_order:
+            amount = totals.get(node_id)
+            if not amount or node_id in self.cyclic:
+                continue
+
+            start, end = offsets[node_id], offsets[node_id + 1]
+            if start == end:
+                continue
+
+            if input_quantities is not None:
+                for child, quantity in zip(inputs[start:end], input_quantities(node_id, amount)):
+                    totals[child] = totals.get(child, 0) + quantity
+            else:
+                for index in range(start, end):
+                    child = inputs[index]
+                    totals[child] = totals.get(child, 0) + base_quantities[index] * amount
+
+        return totals
+
+    def _intern(self, name: str, item: Optional[Tuple[str, str]] = None) -> int:
+        """
+        Get or create the node ID for a name
+
+        Args:
+            name: Display name or raw material name
+            item: (category, name) of the registry item, if buildable
+
+        Returns:
+            The interned node ID
+        """
+        if item is not None and item in self.item_ids:
+            return self.item_ids[item]
+        if item is None and name in self.ids:
+            return self.ids[name]
+
+        node_id = len(self.names)
+        self.names.append(name)
+        self.items.append(item)
+        self.ids.setdefault(name, node_id)
+        if item is not None:
+            self.item_ids[item] = node_id
+        return node_id
+
+    @classmethod
+    def from_registry(cls, registry, raw_materials: Optional[set] = None) -> 'MaterialGraph':
+        """
+        Compile the production graph from a module registry
+
+        Args:
+            registry: The ModuleRegistry to compile
+            raw_materials: Optional set of known raw material names; references
+                that are neither buildable nor in this set are reported as dangling
+
+        Returns:
+            The compiled MaterialGraph
+        """
+        graph = cls()
+
+        # Intern every buildable item first so they get stable low IDs
+        buildables = []
+        for category in registry.BUILDABLE_CATEGORIES:
+            for name, module in getattr(registry, category).items():
+                node_id = graph._intern(module.display_name, (category, name))
+                graph.ids.setdefault(name, node_id)
+                buildables.append((node_id, module))
+
+        # Resolve each requirement reference once and build the adjacency rows
+        resolved: Dict[str, int] = {}
+        dangling = set()
+        rows: Dict[int, List[Tuple[int, float]]] = {}
+        for node_id, module in buildables:
+            row = []
+            for material, amount in module.requirements.items():
+                child = resolved.get(material)
+                if child is None:
+                    category, sub_module = registry.find_buildable(material)
+                    if sub_module is not None:
+                        child = graph.item_ids[(category, sub_module.name)]
+                    else:
+                        child = graph._intern(material)
+                        if raw_materials is not None and material not in raw_materials:
+                            dangling.add(material)
+                    resolved[material] = child
+                row.append((child, amount))
+            rows[node_id] = row
+
+        graph._finish(rows, dangling)
+        return graph
+
+    @classmethod
+    def from_recipe_table(cls, items: Sequence[Tuple[str, str, str]], material_names: Sequence[str],
+                          material_items: Sequence[int], offsets: Sequence[int], inputs: Sequence[int],
+                          quantities: Sequence[float], raw_materials: Optional[set] = None) -> 'MaterialGraph':
+        """
+        Compile the production graph from recipes already stored as sparse rows
+
+        Used by storage backends that keep recipes in CSR form, so the graph can
+        be built without creating a model object for every item.
+
+        Args:
+            items: (category, name, display name) of every buildable item, by row
+            material_names: Requirement reference of every material table entry
+            material_items: Item row each material entry resolves to, or -1 for raw materials
+            offsets: Recipe row offsets, one more than the number of items
+            inputs: Material table index of every recipe entry
+            quantities: Base quantity of every recipe entry
+            raw_materials: Optional set of known raw material names, as in from_registry
+
+        Returns:
+            The compiled MaterialGraph
+        """
+        graph = cls()
+
+        for category, name, display_name in items:
+            node_id = graph._intern(display_name, (category, name))
+            graph.ids.setdefault(name, node_id)
+
+        dangling = set()
+        material_nodes = []
+        for material, item_row in zip(material_names, material_items):
+            if item_row >= 0:
+                material_nodes.append(item_row)
+                continue
+            material_nodes.append(graph._intern(material))
+            if raw_materials is not None and material not in raw_materials:
+                dangling.add(material)
+
+        rows = {}
+        for row in range(len(items)):
+            rows[row] = [(material_nodes[inputs[index]], quantities[index])
+                         for index in range(offsets[row], offsets[row + 1])]
+
+        graph._finish(rows, dangling)
+        return graph
+
+    def _finish(self, rows: Dict[int, List[Tuple[int, float]]], dangling: set):
+        """
+        Store the adjacency rows, order the graph and report problems
+
+        Args:
+            rows: Dictionary of node ID -> list of (input node ID, base quantity)
+            dangling: Referenced materials with no recipe or raw source
+        """
+        for node_id in range(self.node_count):
+            for child, amount in rows.get(node_id, ()):
+                self.inputs.append(child)
+                self.quantities.append(amount)
+            self.offsets.append(len(self.inputs))
+
+        self.dangling = sorted(dangling)
+        self._compute_topological_order()
+
+        if self.cycles:
+            debug_print(f"Material graph contains {len(self.cycles)} cycle(s): "
+                        + "; ".join(" -> ".join(cycle) for cycle in self.cycles))
+        if self.dangling:
+            debug_print(f"Material graph has {len(self.dangling)} material(s) with no recipe or raw source: "
+                        + ", ".join(self.dangling))
+        debug_print(f"Compiled material graph: {self.node_count} nodes, {len(self.inputs)} edges")
+
+    def _compute_topological_order(self):
+        """
+        Order nodes products-first and record any cycles
+
+        Uses an iterative Tarjan strongly-connected-components pass: components
+        come out inputs-first, so reversing them gives the production order.
+        Components with more than one node (or a self-reference) are cycles.
+        """
+        node_count = self.node_count
+        offsets, inputs = self.offsets, self.inputs
+        index_of = [-1] * node_count
+        lowlink = [0] * node_count
+        on_stack = [False] * node_count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        next_index = 0
+
+        for root in range(node_count):
+            if index_of[root] != -1:
+                continue
+
+            work = [(root, offsets[root])]
+            index_of[root] = lowlink[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node_id, edge = work[-1]
+                if edge < offsets[node_id + 1]:
+                    work[-1] = (node_id, edge + 1)
+                    child = inputs[edge]
+                    if index_of[child] == -1:
+                        index_of[child] = lowlink[child] = next_index
+                        next_index += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        work.append((child, offsets[child]))
+                    elif on_stack[child]:
+                        lowlink[node_id] = min(lowlink[node_id], index_of[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+
+                if lowlink[node_id] == index_of[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+
+        order = array('l')
+        for component in reversed(components):
+            order.extend(component)
+            self_loop = len(component) == 1 and component[0] in self.get_inputs(component[0])[0]
+            if len(component) > 1 or self_loop:
+                self.cyclic.update(component)
+                names = [self.names[node_id] for node_id in reversed(component)]
+                self.cycles.append(names + [names[0]])
+
+        self.topo_order = order
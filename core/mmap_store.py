@@ -0,0 +1,628 @@
+"""
+Memory-mapped item store for EVE Production Calculator
+
+This module provides an alternative registry backend for very large datasets.
+The registry is written once to a columnar binary file (string table, item
+table, material table and CSR recipe arrays) which is then memory-mapped.
+Model objects are only created when an item is actually accessed, so memory
+use and startup time stay small however big the catalog is.
+
+File layout (all integers little-endian):
+    header      magic, format version, section count, sha256 of the JSON sources
+    directory   (name, offset, length) of every section
+    sections    8-byte aligned arrays, read through memoryview casts
+"""
+import os
+import json
+import mmap
+import struct
+import bisect
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Optional, Iterator, Tuple
+
+from core.models import ShipModule, CapitalShipModule, ComponentModule, PiMaterialModule
+from core.module_registry import ModuleRegistry, is_owned
+from core.material_graph import MaterialGraph
+from core.data_snapshot import compute_source_hash
+from core.utils.debug import debug_print
+
+STORE_MAGIC = b'EVEMMAP\0'
+# Bump whenever the file layout or the stored model fields change
+STORE_VERSION = 3
+STORE_FILENAME = "registry_store.bin"
+
+_HEADER = struct.Struct('<8sII32s')
+_SECTION = struct.Struct('<16sQQ')
+
+# Item table categories in row order. Buildable categories come first, in the
+# order of ModuleRegistry.BUILDABLE_CATEGORIES, so item rows double as material
+# graph node IDs.
+STORE_CATEGORIES = ModuleRegistry.BUILDABLE_CATEGORIES + ('pi_materials',)
+
+CATEGORY_MODELS = {
+    'ships': ShipModule,
+    'capital_ships': CapitalShipModule,
+    'components': ComponentModule,
+    'capital_components': ComponentModule,
+    'pi_materials': PiMaterialModule
+}
+
+# Constructor arguments stored as a JSON string per item, beyond the common columns
+EXTRA_FIELDS = {
+    'ships': ('build_time',),
+    'capital_ships': ('capital_component_data', 'build_time'),
+    'components': ('build_time',),
+    'capital_components': ('build_time',),
+    'pi_materials': ('pi_level', 'planet_types', 'outputs', 'batch_size', 'cycle_time')
+}
+
+SHIP_CATEGORIES = ('ships', 'capital_ships')
+
+def get_store_path(base_path: str) -> str:
+    """
+    Get the path of the memory-mapped store file
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        Absolute path of the store file
+    """
+    return os.path.join(base_path, 'core', 'data', STORE_FILENAME)
+
+def _to_json_value(value):
+    """Convert read-only model containers (RequirementMap, tuples) to JSON-friendly types"""
+    if isinstance(value, Mapping):
+        return {key: _to_json_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_to_json_value(item) for item in value]
+    return value
+
+def write_store(registry: ModuleRegistry, path: str, source_hash: str = '',
+                manifest: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Write a loaded registry to a columnar store file
+
+    Args:
+        registry: The fully loaded ModuleRegistry
+        path: Path of the store file to write
+        source_hash: Hex sha256 of the JSON sources the registry was loaded from
+        manifest: Source manifest from compute_source_hash, so later up-to-date
+            checks only stat the sources
+
+    Returns:
+        True if the store was written
+    """
+    strings: Dict[str, int] = {}
+    string_offsets = array('q', [0])
+    string_data = bytearray()
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        sid = strings.get(value)
+        if sid is None:
+            sid = len(strings)
+            strings[value] = sid
+            string_data.extend(value.encode('utf-8'))
+            string_offsets.append(len(string_data))
+        return sid
+
+    columns = {column: array('i') for column in ('name', 'display', 'details', 'faction', 'ship_type', 'extra')}
+    category_offsets = array('q', [0])
+    sorted_rows = array('i')
+    modules = []
+
+    for category in STORE_CATEGORIES:
+        collection = getattr(registry, category)
+        start = len(modules)
+        for name, module in collection.items():
+            modules.append((category, name, module))
+            columns['name'].append(intern(name))
+            columns['display'].append(intern(module.display_name))
+            columns['details'].append(intern(module.details or ''))
+            is_ship = category in SHIP_CATEGORIES
+            columns['faction'].append(intern(module.faction) if is_ship else -1)
+            columns['ship_type'].append(intern(module.ship_type) if is_ship else -1)
+            extra = {field: _to_json_value(getattr(module, field)) for field in EXTRA_FIELDS.get(category, ())}
+            columns['extra'].append(intern(json.dumps(extra)) if extra else -1)
+        category_offsets.append(len(modules))
+
+        # Rows of this category ordered by name, for binary search lookups
+        sorted_rows.extend(sorted(range(start, len(modules)), key=lambda row: modules[row][1]))
+
+    row_of = {(category, name): row for row, (category, name, _) in enumerate(modules)}
+
+    # Material table: every distinct requirement reference, resolved once
+    materials: Dict[str, int] = {}
+    material_names = array('i')
+    material_items = array('i')
+    recipe_offsets = array('q', [0])
+    recipe_inputs = array('i')
+    recipe_quantities = array('d')
+
+    for category, name, module in modules:
+        for material, amount in module.requirements.items():
+            index = materials.get(material)
+            if index is None:
+                index = len(materials)
+                materials[material] = index
+                material_names.append(intern(material))
+                target_category, target = registry.find_buildable(material)
+                material_items.append(row_of[(target_category, target.name)] if target is not None else -1)
+            recipe_inputs.append(index)
+            recipe_quantities.append(amount)
+        recipe_offsets.append(len(recipe_inputs))
+
+    meta = {
+        'ores': registry.ores,
+        'pi_data': registry.pi_data,
+        'factions': sorted(registry.factions),
+        'ship_types': sorted(registry.ship_types),
+        'manifest': manifest or {}
+    }
+
+    sections = [
+        ('string_offsets', string_offsets.tobytes()),
+        ('string_data', bytes(string_data)),
+        ('category_offsets', category_offsets.tobytes()),
+        ('sorted_rows', sorted_rows.tobytes())
+    ]
+    sections.extend((f'item_{column}', values.tobytes()) for column, values in columns.items())
+    sections.extend([
+        ('material_names', material_names.tobytes()),
+        ('material_items', material_items.tobytes()),
+        ('recipe_offsets', recipe_offsets.tobytes()),
+        ('recipe_inputs', recipe_inputs.tobytes()),
+        ('recipe_quantity', recipe_quantities.tobytes()),
+        ('meta', json.dumps(meta).encode('utf-8'))
+    ])
+
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            offset = _HEADER.size + _SECTION.size * len(sections)
+            directory = []
+            for name, data in sections:
+                offset += -offset % 8
+                directory.append((name, offset, len(data)))
+                offset += len(data)
+
+            f.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION, len(sections), bytes.fromhex(source_hash or '0' * 64)))
+            for name, offset, length in directory:
+                f.write(_SECTION.pack(name.encode('ascii'), offset, length))
+            for (_, data), (_, offset, _) in zip(sections, directory):
+                f.write(b'\0' * (offset - f.tell()))
+                f.write(data)
+
+        os.replace(temp_path, path)
+        debug_print(f"Item store written to {path}: {len(modules)} items, {len(materials)} materials, "
+                    f"{len(recipe_inputs)} recipe entries")
+        return True
+    except Exception as e:
+        debug_print(f"Error writing item store: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+class MappedItemStore:
+    """Read-only view of a memory-mapped store file"""
+    def __init__(self, path: str):
+        """
+        Map a store file into memory
+
+        Args:
+            path: Path of the store file
+
+        Raises:
+            ValueError: If the file is not a store file of the current version
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._map)
+
+        magic, version, section_count, source_hash = _HEADER.unpack_from(buffer, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            buffer.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a version {STORE_VERSION} item store")
+        self.source_hash = source_hash.hex()
+
+        # Every view into the map is kept so close() can release them all
+        self._views = [buffer]
+        sections = {}
+        for index in range(section_count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + index * _SECTION.size)
+            sections[name.rstrip(b'\0').decode('ascii')] = self._view(buffer[offset:offset + length])
+
+        self._string_offsets = self._view(sections['string_offsets'].cast('q'))
+        self._string_data = sections['string_data']
+        self.category_offsets = self._view(sections['category_offsets'].cast('q'))
+        self.sorted_rows = self._view(sections['sorted_rows'].cast('i'))
+        self.columns = {column: self._view(sections[f'item_{column}'].cast('i'))
+                        for column in ('name', 'display', 'details', 'faction', 'ship_type', 'extra')}
+        self.material_names = self._view(sections['material_names'].cast('i'))
+        self.material_items = self._view(sections['material_items'].cast('i'))
+        self.recipe_offsets = self._view(sections['recipe_offsets'].cast('q'))
+        self.recipe_inputs = self._view(sections['recipe_inputs'].cast('i'))
+        self.recipe_quantities = self._view(sections['recipe_quantity'].cast('d'))
+        self.meta = json.loads(bytes(sections['meta']).decode('utf-8'))
+
+    def _view(self, view: memoryview) -> memoryview:
+        """Track a view into the map and return it"""
+        self._views.append(view)
+        return view
+
+    def get_string(self, sid: int) -> Optional[str]:
+        """
+        Decode a string from the string table
+
+        Args:
+            sid: String ID, or -1 for no value
+
+        Returns:
+            The decoded string, or None for -1
+        """
+        if sid < 0:
+            return None
+        return bytes(self._string_data[self._string_offsets[sid]:self._string_offsets[sid + 1]]).decode('utf-8')
+
+    def get_category_rows(self, category: str) -> range:
+        """
+        Get the item rows of a category
+
+        Args:
+            category: One of STORE_CATEGORIES
+
+        Returns:
+            Range of item row numbers
+        """
+        index = STORE_CATEGORIES.index(category)
+        return range(self.category_offsets[index], self.category_offsets[index + 1])
+
+    def get_name(self, row: int) -> str:
+        """Get the registry name of an item row"""
+        return self.get_string(self.columns['name'][row])
+
+    def find_row(self, category: str, name: str) -> Optional[int]:
+        """
+        Binary search an item by registry name
+
+        Args:
+            category: Category to search
+            name: Registry name of the item
+
+        Returns:
+            Item row, or None if not found
+        """
+        rows = self.get_category_rows(category)
+        names = _SortedNames(self, rows)
+        position = bisect.bisect_left(names, name)
+        if position < len(rows):
+            row = self.sorted_rows[rows.start + position]
+            if self.get_name(row) == name:
+                return row
+        return None
+
+    def get_requirements(self, row: int) -> Dict[str, Any]:
+        """
+        Build the requirements dictionary of an item row
+
+        Args:
+            row: Item row
+
+        Returns:
+            Dictionary of requirement references and quantities, in file order
+        """
+        requirements = {}
+        for index in range(self.recipe_offsets[row], self.recipe_offsets[row + 1]):
+            amount = self.recipe_quantities[index]
+            material = self.get_string(self.material_names[self.recipe_inputs[index]])
+            requirements[material] = int(amount) if amount.is_integer() else amount
+        return requirements
+
+    def materialize(self, category: str, row: int):
+        """
+        Create the model object of an item row
+
+        Args:
+            category: Category of the item
+            row: Item row
+
+        Returns:
+            A ShipModule, CapitalShipModule, ComponentModule or PiMaterialModule
+        """
+        kwargs = {
+            'name': self.get_name(row),
+            'display_name': self.get_string(self.columns['display'][row]),
+            'requirements': self.get_requirements(row),
+            'details': self.get_string(self.columns['details'][row])
+        }
+        if category in SHIP_CATEGORIES:
+            kwargs['faction'] = self.get_string(self.columns['faction'][row])
+            kwargs['ship_type'] = self.get_string(self.columns['ship_type'][row])
+        extra = self.get_string(self.columns['extra'][row])
+        if extra:
+            kwargs.update(json.loads(extra))
+        if category != 'pi_materials':
+            kwargs['owned_status'] = False
+
+        return CATEGORY_MODELS[category](**kwargs)
+
+    def close(self):
+        """Release the memory map"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+class _SortedNames:
+    """Sequence of the names of a category in sorted order, decoded on demand for bisect"""
+    def __init__(self, store: MappedItemStore, rows: range):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, position: int) -> str:
+        return self.store.get_name(self.store.sorted_rows[self.rows.start + position])
+
+class LazyItemMapping(MutableMapping):
+    """
+    Dictionary-like view of one category of a mapped store
+
+    Models are created on first access and kept, so attributes set on them
+    (such as ownership) persist. Ownership set before an item's model exists
+    is held aside and applied when the model is created. Items registered at
+    runtime are held in the same cache.
+    """
+    def __init__(self, store: MappedItemStore, category: str):
+        self.store = store
+        self.category = category
+        self._rows = store.get_category_rows(category)
+        self._cache: Dict[str, Any] = {}
+        self._removed: set = set()
+        self._owned: Dict[str, Any] = {}  # Ownership of items whose models do not exist yet
+        self.added: set = set()  # Names registered at runtime that are not in the store
+
+    def __getitem__(self, name: str):
+        module = self._cache.get(name)
+        if module is not None:
+            return module
+        if name not in self._removed:
+            row = self.store.find_row(self.category, name)
+            if row is not None:
+                module = self.store.materialize(self.category, row)
+                if name in self._owned:
+                    module.owned_status = self._owned.pop(name)
+                self._cache[name] = module
+                return module
+        raise KeyError(name)
+
+    def __setitem__(self, name: str, module):
+        if self.store.find_row(self.category, name) is None:
+            self.added.add(name)
+        self._cache[name] = module
+        self._removed.discard(name)
+
+    def __delitem__(self, name: str):
+        if name not in self:
+            raise KeyError(name)
+        self._cache.pop(name, None)
+        self._owned.pop(name, None)
+        self.added.discard(name)
+        self._removed.add(name)
+
+    def __contains__(self, name) -> bool:
+        if name in self._cache:
+            return True
+        return name not in self._removed and self.store.find_row(self.category, name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for row in self._rows:
+            name = self.store.get_name(row)
+            seen.add(name)
+            if name not in self._removed:
+                yield name
+        for name in list(self._cache):
+            if name not in seen:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def set_owned_status(self, name: str, owned_status) -> bool:
+        """
+        Set the ownership of an item without creating its model
+
+        Args:
+            name: Registry name of the item
+            owned_status: New ownership, True/False or "Owned"/"Unowned"
+
+        Returns:
+            True if the item was found
+        """
+        module = self._cache.get(name)
+        if module is not None:
+            module.owned_status = owned_status
+            return True
+        if name in self._removed or self.store.find_row(self.category, name) is None:
+            return False
+        self._owned[name] = owned_status
+        return True
+
+    def owned_statuses(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (name, ownership) for every item that has a model or a pending ownership"""
+        yield from self._owned.items()
+        for name, module in self._cache.items():
+            yield name, getattr(module, 'owned_status', False)
+
+    @property
+    def materialized_count(self) -> int:
+        """Number of models created so far"""
+        return len(self._cache)
+
+class MappedModuleRegistry(ModuleRegistry):
+    """
+    Module registry backed by a memory-mapped item store
+
+    Behaves like ModuleRegistry, but its collections are lazy views that only
+    create model objects for the items actually accessed, and the material
+    graph is compiled straight from the stored recipe arrays. The name and
+    filter indexes are built from the string table the first time one of
+    them is used.
+    """
+    # Index attributes of ModuleRegistry, created together on first access
+    LAZY_INDEXES = ('display_name_index', 'ship_display_name_index', 'normalized_name_index',
+                    'item_names', 'item_ids', 'faction_bitmaps', 'ship_type_bitmaps', 'owned_bitmaps')
+
+    def __init__(self, store: MappedItemStore):
+        """
+        Initialize the registry over an open store
+
+        Args:
+            store: The mapped store to read items from
+        """
+        super().__init__()
+        self.store = store
+
+        self.ships = LazyItemMapping(store, 'ships')
+        self.capital_ships = LazyItemMapping(store, 'capital_ships')
+        self.components = LazyItemMapping(store, 'components')
+        self.capital_components = LazyItemMapping(store, 'capital_components')
+        self.pi_materials = LazyItemMapping(store, 'pi_materials')
+
+        self.register_ores(store.meta['ores'])
+        self.pi_data = store.meta['pi_data']
+        self.factions = set(store.meta['factions'])
+        self.ship_types = set(store.meta['ship_types'])
+
+    def _init_indexes(self):
+        """Defer the indexes until one of them is first accessed"""
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not set yet, i.e. before the indexes are built
+        if name not in self.LAZY_INDEXES:
+            raise AttributeError(name)
+        self._build_indexes()
+        return self.__dict__[name]
+
+    def _build_indexes(self):
+        """
+        Build the name and filter indexes of every stored item
+
+        Display names, factions and ship types come straight from the string
+        table and ownership from the lazy views, so indexing creates no model
+        objects.
+        """
+        ModuleRegistry._init_indexes(self)
+        store = self.store
+        columns = store.columns
+        for category in self.INDEXED_CATEGORIES:
+            is_ship = category in SHIP_CATEGORIES
+            for row in store.get_category_rows(category):
+                name = store.get_name(row)
+                self._index_item(category, name, store.get_string(columns['display'][row]))
+                if is_ship:
+                    self._index_attributes(category, name, store.get_string(columns['faction'][row]),
+                                           store.get_string(columns['ship_type'][row]), False)
+                else:
+                    self._get_item_id(category, name)
+            for name, owned_status in getattr(self, category).owned_statuses():
+                if is_owned(owned_status):
+                    self._set_owned_bit(category, name, owned_status)
+
+    def set_owned_status(self, category: str, name: str, owned_status) -> bool:
+        """
+        Set the blueprint ownership of a registered item
+
+        The model is only updated if it already exists; otherwise the lazy view
+        applies the ownership when the item is first accessed. The ownership
+        bitmap is updated if the indexes have been built, and picks the
+        ownership up from the views when they are.
+
+        Args:
+            category: Registry collection of the item ('ships', 'capital_ships', ...)
+            name: Registry name of the item
+            owned_status: New ownership, True/False or "Owned"/"Unowned"
+
+        Returns:
+            True if the item was found
+        """
+        if not getattr(self, category).set_owned_status(name, owned_status):
+            return False
+        if 'owned_bitmaps' in self.__dict__:
+            self._set_owned_bit(category, name, owned_status)
+        return True
+
+    def build_material_graph(self) -> MaterialGraph:
+        """
+        Compile the production graph from the stored recipe arrays
+
+        Falls back to the generic build if items were registered at runtime.
+
+        Returns:
+            The compiled MaterialGraph
+        """
+        store = self.store
+        buildable_rows = store.category_offsets[len(self.BUILDABLE_CATEGORIES)]
+        if any(getattr(self, category).added or getattr(self, category)._removed
+               for category in self.BUILDABLE_CATEGORIES):
+            return super().build_material_graph()
+
+        items = []
+        for category in self.BUILDABLE_CATEGORIES:
+            for row in store.get_category_rows(category):
+                items.append((category, store.get_name(row), store.get_string(store.columns['display'][row])))
+
+        self.material_graph = MaterialGraph.from_recipe_table(
+            items,
+            [store.get_string(sid) for sid in store.material_names],
+            store.material_items,
+            store.recipe_offsets[:buildable_rows + 1],
+            store.recipe_inputs,
+            store.recipe_quantities,
+            self.get_raw_material_names()
+        )
+        return self.material_graph
+
+def load_mapped_registry(base_path: str) -> MappedModuleRegistry:
+    """
+    Open the memory-mapped registry, rebuilding the store if it is stale
+
+    Args:
+        base_path: Base path of the application
+
+    Returns:
+        A MappedModuleRegistry over the current data
+    """
+    store_path = get_store_path(base_path)
+
+    store = None
+    manifest = None
+    if os.path.exists(store_path):
+        try:
+            store = MappedItemStore(store_path)
+            manifest = store.meta.get('manifest')
+        except Exception as e:
+            debug_print(f"Error opening item store: {e}")
+            store = None
+
+    source_hash, manifest = compute_source_hash(base_path, manifest)
+    if store is not None and store.source_hash != source_hash:
+        debug_print("Item store is out of date with the JSON sources, rebuilding it")
+        store.close()
+        store = None
+
+    if store is None:
+        from core.data_loaders import load_registry
+
+        write_store(load_registry(base_path, use_snapshot=False), store_path, source_hash, manifest)
+        store = MappedItemStore(store_path)
+
+    debug_print(f"Opened memory-mapped item store {store_path}")
+    return MappedModuleRegistry(store)
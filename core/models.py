@@ -1,80 +1,179 @@
 """
 Module models for EVE Production Calculator
 
-This file contains the data model classes for ships, components, and PI materials
+This file contains the data model classes for ships, components, and PI materials.
+The models use __slots__ and share interned requirement maps, so a registry of
+many items stays compact. UI state is not stored on the models.
 """
-from typing import Dict, List, Any, Optional, Set, Tuple
+import sys
+import weakref
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
+
+class RequirementMap(Mapping):
+    """
+    Immutable, interned mapping of material name -> quantity
+
+    Materials and quantities are kept as two parallel tuples, and identical
+    requirement sets share a single instance, so items with the same recipe
+    cost no extra memory. The pool only holds maps weakly, so maps of
+    discarded registries are freed. Behaves like a read-only dict.
+    """
+    __slots__ = ('_materials', '_amounts', '_index', '__weakref__')
+
+    # Maps with more entries than this get a material -> quantity dict on first lookup
+    INDEX_THRESHOLD = 8
+
+    _pool: 'weakref.WeakValueDictionary[Tuple[Tuple[str, ...], Tuple[Union[int, float], ...]], RequirementMap]' = \
+        weakref.WeakValueDictionary()
+
+    def __new__(cls, requirements=()):
+        if isinstance(requirements, RequirementMap):
+            return requirements
+
+        pairs = requirements.items() if isinstance(requirements, Mapping) else requirements
+        materials = []
+        amounts = []
+        for material, amount in pairs:
+            materials.append(sys.intern(str(material)))
+            amounts.append(amount)
+        key = (tuple(materials), tuple(amounts))
+
+        instance = cls._pool.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance._materials, instance._amounts = key
+            instance._index = None
+            cls._pool[key] = instance
+        return instance
+
+    def __getitem__(self, material: str) -> Union[int, float]:
+        if len(self._materials) > self.INDEX_THRESHOLD:
+            if self._index is None:
+                self._index = dict(zip(self._materials, self._amounts))
+            return self._index[material]
+        for name, amount in zip(self._materials, self._amounts):
+            if name == material:
+                return amount
+        raise KeyError(material)
+
+    def __iter__(self):
+        return iter(self._materials)
+
+    def __len__(self) -> int:
+        return len(self._materials)
+
+    def items(self):
+        """Get the (material, quantity) pairs in recipe order"""
+        return zip(self._materials, self._amounts)
+
+    def __hash__(self) -> int:
+        return hash((self._materials, self._amounts))
+
+    def __reduce__(self):
+        return (RequirementMap, (tuple(self.items()),))
+
+    def __repr__(self) -> str:
+        return f"RequirementMap({dict(self.items())!r})"
+
+# Shared read-only empty mapping for models without optional data
+EMPTY_MAPPING = RequirementMap()
 
 class ShipModule:
     """Representation of a ship with all its attributes and requirements"""
-    def __init__(self, 
-                 name: str, 
-                 display_name: str, 
-                 requirements: Dict[str, int], 
-                 details: str, 
-                 faction: Optional[str] = None, 
-                 ship_type: Optional[str] = None, 
-                 owned_status: Optional[str] = None):
-        self.name = name
-        self.display_name = display_name
-        self.requirements = requirements
+    __slots__ = ('name', 'display_name', 'requirements', 'details', 'faction', 'ship_type', 'owned_status',
+                 'build_time')
+
+    module_type = 'ship'  # Always 'ship' for this class
+
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 requirements: Dict[str, int],
+                 details: str,
+                 faction: Optional[str] = None,
+                 ship_type: Optional[str] = None,
+                 owned_status: Optional[str] = None,
+                 build_time: Optional[int] = None):
+        self.name = sys.intern(name)
+        self.display_name = sys.intern(display_name)
+        self.requirements = RequirementMap(requirements)
         self.details = details
-        self.faction = faction
-        self.ship_type = ship_type
+        self.faction = sys.intern(faction) if faction else faction
+        self.ship_type = sys.intern(ship_type) if ship_type else ship_type
         self.owned_status = owned_status
-        self.module_type = 'ship'  # Always 'ship' for this class
+        self.build_time = build_time  # Base build time of one run in seconds, None if unknown
 
 class CapitalShipModule:
     """Representation of a capital ship with all its attributes and components"""
-    def __init__(self, 
-                 name: str, 
-                 display_name: str, 
-                 requirements: Dict[str, int], 
+    __slots__ = ('name', 'display_name', 'requirements', 'details', 'faction', 'ship_type',
+                 'capital_component_data', 'owned_status', 'build_time')
+
+    module_type = 'capital_ship'  # Always 'capital_ship' for this class
+
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 requirements: Dict[str, int],
                  details: str,
                  faction: Optional[str] = None,
                  ship_type: Optional[str] = None,
                  capital_component_data: Dict[str, Dict[str, Any]] = None,
-                 owned_status: Optional[str] = None):
-        self.name = name
-        self.display_name = display_name
-        self.requirements = requirements
+                 owned_status: Optional[str] = None,
+                 build_time: Optional[int] = None):
+        self.name = sys.intern(name)
+        self.display_name = sys.intern(display_name)
+        self.requirements = RequirementMap(requirements)
         self.details = details
-        self.faction = faction
-        self.ship_type = ship_type
-        self.capital_component_data = capital_component_data or {}
+        self.faction = sys.intern(faction) if faction else faction
+        self.ship_type = sys.intern(ship_type) if ship_type else ship_type
+        self.capital_component_data = capital_component_data or EMPTY_MAPPING
         self.owned_status = owned_status
-        self.module_type = 'capital_ship'  # Always 'capital_ship' for this class
+        self.build_time = build_time  # Base build time of one run in seconds, None if unknown
 
 class ComponentModule:
     """Representation of a component with all its attributes and requirements"""
-    def __init__(self, 
-                 name: str, 
-                 display_name: str, 
-                 requirements: Dict[str, int], 
+    __slots__ = ('name', 'display_name', 'requirements', 'details', 'owned_status', 'build_time')
+
+    module_type = 'component'  # Always 'component' for this class
+
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 requirements: Dict[str, int],
                  details: str,
-                 owned_status: Optional[str] = None):
-        self.name = name
-        self.display_name = display_name
-        self.requirements = requirements
+                 owned_status: Optional[str] = None,
+                 build_time: Optional[int] = None):
+        self.name = sys.intern(name)
+        self.display_name = sys.intern(display_name)
+        self.requirements = RequirementMap(requirements)
         self.details = details
         self.owned_status = owned_status
-        self.module_type = 'component'  # Always 'component' for this class
+        self.build_time = build_time  # Base build time of one run in seconds, None if unknown
 
 class PiMaterialModule:
     """Representation of a PI material with all its attributes and requirements"""
-    def __init__(self, 
-                 name: str, 
-                 display_name: str, 
-                 requirements: Dict[str, int], 
+    __slots__ = ('name', 'display_name', 'requirements', 'details', 'pi_level', 'planet_types', 'outputs',
+                 'batch_size', 'cycle_time')
+
+    module_type = 'pi_material'  # Always 'pi_material' for this class
+
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 requirements: Dict[str, int],
                  details: str,
                  pi_level: str,
                  planet_types: List[str] = None,
-                 outputs: Dict[str, int] = None):
-        self.name = name
-        self.display_name = display_name
-        self.requirements = requirements or {}
+                 outputs: Dict[str, int] = None,
+                 batch_size: int = 1,
+                 cycle_time: int = 0):
+        self.name = sys.intern(name)
+        self.display_name = sys.intern(display_name)
+        self.requirements = RequirementMap(requirements or {})  # Units of each input per production cycle
         self.details = details
         self.pi_level = pi_level  # P0, P1, P2, P3, P4
-        self.planet_types = planet_types or []  # Types of planets the material can be harvested from
-        self.outputs = outputs or {}  # What this material produces if processed
-        self.module_type = 'pi_material'  # Always 'pi_material' for this class
+        self.planet_types = tuple(planet_types or ())  # Types of planets the material can be harvested from
+        self.outputs = RequirementMap(outputs or {})  # Products made from this material -> units used per cycle
+        self.batch_size = batch_size  # Units produced per production cycle
+        self.cycle_time = cycle_time  # Seconds per production cycle, 0 for extracted P0 resources
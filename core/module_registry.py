@@ -7,6 +7,38 @@ import os
 from typing import Dict, List, Any, Optional, Set, Tuple
 
 from core.models import ShipModule, CapitalShipModule, ComponentModule, PiMaterialModule
+from core.material_graph import MaterialGraph
+from core.pi_chain import PiChain
+from core.utils.bits import iter_bits
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a display or registry name for matching user input
+
+    Case, underscores and repeated whitespace are ignored, so "capital armor
+    plates", "Capital_Armor_Plates" and "Capital  Armor Plates" all match.
+
+    Args:
+        name: The name to normalize
+
+    Returns:
+        The normalized name
+    """
+    return " ".join(name.replace("_", " ").split()).casefold()
+
+def is_owned(owned_status) -> bool:
+    """
+    Check whether an owned_status value means the blueprint is owned
+    
+    Args:
+        owned_status: True/False, or an "Owned"/"Unowned" string
+        
+    Returns:
+        True if the blueprint is owned
+    """
+    if isinstance(owned_status, str):
+        return owned_status.lower() == "owned"
+    return owned_status is True
 
 class ModuleRegistry:
     """Central registry for all modules in the application.
@@ -14,6 +46,13 @@ class ModuleRegistry:
     This class provides a unified interface for accessing ships, components,
     capital ships, and PI materials.
     """
+    # Registry collections holding items that are built from a recipe, in the
+    # order a requirement name is resolved against them
+    BUILDABLE_CATEGORIES = ('capital_components', 'components', 'capital_ships', 'ships')
+
+    # Collections with display-name indexes
+    INDEXED_CATEGORIES = BUILDABLE_CATEGORIES + ('pi_materials',)
+
     def __init__(self):
         self.ships: Dict[str, ShipModule] = {}
         self.capital_ships: Dict[str, CapitalShipModule] = {}
@@ -32,6 +71,152 @@ class ModuleRegistry:
         # Track available factions and ship types for filtering
         self.factions: Set[str] = set(["All"])
         self.ship_types: Set[str] = set(["All"])
+        
+        # Compiled production graph, built after loading and dropped on registration
+        self.material_graph: Optional[MaterialGraph] = None
+        # Compiled PI production chain, built like the material graph
+        self.pi_chain: Optional[PiChain] = None
+        
+        # Ore display name -> ore data dictionary, and normalized variant
+        self.ore_index: Dict[str, Dict[str, Any]] = {}
+        self.normalized_ore_index: Dict[str, Dict[str, Any]] = {}
+        
+        self._init_indexes()
+    
+    def _init_indexes(self):
+        """Create the empty name and filter indexes"""
+        # Display name -> registry name, per category, kept up to date by register_*
+        self.display_name_index: Dict[str, Dict[str, str]] = {category: {} for category in self.INDEXED_CATEGORIES}
+        # Display name -> (category, registry name) for ships and capital ships;
+        # regular ships win when both share a display name
+        self.ship_display_name_index: Dict[str, Tuple[str, str]] = {}
+        # Normalized display and registry names -> registry name, per category
+        self.normalized_name_index: Dict[str, Dict[str, str]] = {category: {} for category in self.INDEXED_CATEGORIES}
+        
+        # Every item gets a dense ID per category in registration order. The
+        # filter indexes are bitmaps (Python ints) over those IDs, so filters
+        # are bitwise ANDs instead of scans.
+        self.item_names: Dict[str, List[str]] = {category: [] for category in self.INDEXED_CATEGORIES}
+        self.item_ids: Dict[str, Dict[str, int]] = {category: {} for category in self.INDEXED_CATEGORIES}
+        self.faction_bitmaps: Dict[str, Dict[str, int]] = {category: {} for category in self.INDEXED_CATEGORIES}
+        self.ship_type_bitmaps: Dict[str, Dict[str, int]] = {category: {} for category in self.INDEXED_CATEGORIES}
+        self.owned_bitmaps: Dict[str, int] = {category: 0 for category in self.INDEXED_CATEGORIES}
+    
+    def _get_item_id(self, category: str, name: str) -> int:
+        """
+        Get the bitmap ID of an item, assigning the next free one if it is new
+        
+        Args:
+            category: Registry collection the item belongs to
+            name: Registry name of the item
+            
+        Returns:
+            The item's ID within its category
+        """
+        ids = self.item_ids[category]
+        item_id = ids.get(name)
+        if item_id is None:
+            item_id = len(self.item_names[category])
+            ids[name] = item_id
+            self.item_names[category].append(name)
+        return item_id
+    
+    def _index_attributes(self, category: str, name: str, faction: Optional[str], ship_type: Optional[str], owned: bool):
+        """
+        Set an item's bits in the faction, ship type and ownership bitmaps
+        
+        Args:
+            category: Registry collection the item belongs to
+            name: Registry name of the item
+            faction: Faction of the item, or None
+            ship_type: Ship type of the item, or None
+            owned: Whether the item's blueprint is owned
+        """
+        bit = 1 << self._get_item_id(category, name)
+        if faction:
+            factions = self.faction_bitmaps[category]
+            factions[faction] = factions.get(faction, 0) | bit
+        if ship_type:
+            ship_types = self.ship_type_bitmaps[category]
+            ship_types[ship_type] = ship_types.get(ship_type, 0) | bit
+        if owned:
+            self.owned_bitmaps[category] |= bit
+    
+    def _unindex_attributes(self, category: str, module):
+        """
+        Clear an item's bits in the faction, ship type and ownership bitmaps
+        
+        Args:
+            category: Registry collection the item belongs to
+            module: The registered module being replaced
+        """
+        mask = ~(1 << self._get_item_id(category, module.name))
+        for bitmaps, key in ((self.faction_bitmaps[category], getattr(module, 'faction', None)),
+                             (self.ship_type_bitmaps[category], getattr(module, 'ship_type', None))):
+            if key in bitmaps:
+                bitmaps[key] &= mask
+        self.owned_bitmaps[category] &= mask
+    
+    def _index_item(self, category: str, name: str, display_name: str):
+        """
+        Add an item to the display-name indexes
+        
+        Args:
+            category: Registry collection the item belongs to
+            name: Registry name of the item
+            display_name: Display name of the item
+        """
+        self.display_name_index[category][display_name] = name
+        normalized = self.normalized_name_index[category]
+        normalized[normalize_name(display_name)] = name
+        normalized.setdefault(normalize_name(name), name)
+        
+        if category == 'ships':
+            self.ship_display_name_index[display_name] = (category, name)
+        elif category == 'capital_ships':
+            self.ship_display_name_index.setdefault(display_name, (category, name))
+    
+    def _unindex_item(self, category: str, module):
+        """
+        Remove an item that is about to be replaced from the display-name indexes
+        
+        Args:
+            category: Registry collection the item belongs to
+            module: The registered module being replaced
+        """
+        display_names = self.display_name_index[category]
+        if display_names.get(module.display_name) == module.name:
+            del display_names[module.display_name]
+        
+        normalized = self.normalized_name_index[category]
+        for key in (normalize_name(module.display_name), normalize_name(module.name)):
+            if normalized.get(key) == module.name:
+                del normalized[key]
+        
+        if self.ship_display_name_index.get(module.display_name) == (category, module.name):
+            del self.ship_display_name_index[module.display_name]
+    
+    def _add_item(self, category: str, module):
+        """
+        Store a module in a collection and update its display-name indexes
+        
+        Args:
+            category: Registry collection to store the module in
+            module: The module to store
+        """
+        collection = getattr(self, category)
+        previous = collection.get(module.name)
+        if previous is not None:
+            self._unindex_item(category, previous)
+            self._unindex_attributes(category, previous)
+        
+        collection[module.name] = module
+        self._index_item(category, module.name, module.display_name)
+        self._index_attributes(category, module.name, getattr(module, 'faction', None),
+                               getattr(module, 'ship_type', None), is_owned(getattr(module, 'owned_status', None)))
+        self.material_graph = None
+        if category == 'pi_materials':
+            self.pi_chain = None
     
     def register_ship(self, ship: ShipModule):
         """
@@ -40,7 +225,7 @@ class ModuleRegistry:
         Args:
             ship: The ship to register
         """
-        self.ships[ship.name] = ship
+        self._add_item('ships', ship)
         
         # Add faction to available factions
         if ship.faction and ship.faction not in self.factions:
@@ -57,7 +242,7 @@ class ModuleRegistry:
         Args:
             capital_ship: The capital ship to register
         """
-        self.capital_ships[capital_ship.name] = capital_ship
+        self._add_item('capital_ships', capital_ship)
         
         # Add faction to available factions if not already present
         if capital_ship.faction and capital_ship.faction not in self.factions:
@@ -74,7 +259,7 @@ class ModuleRegistry:
         Args:
             component: The component to register
         """
-        self.components[component.name] = component
+        self._add_item('components', component)
     
     def register_capital_component(self, component: ComponentModule):
         """
@@ -83,7 +268,7 @@ class ModuleRegistry:
         Args:
             component: The capital component to register
         """
-        self.capital_components[component.name] = component
+        self._add_item('capital_components', component)
     
     def register_pi_data(self, pi_level: str, materials: Dict[str, Any]):
         """
@@ -102,7 +287,180 @@ class ModuleRegistry:
         Args:
             pi_material: The PI material to register
         """
-        self.pi_materials[pi_material.name] = pi_material
+        self._add_item('pi_materials', pi_material)
+    
+    def register_ores(self, ore_data: Dict[str, Any]):
+        """
+        Register the ore data and index every ore by display name
+        
+        Args:
+            ore_data: Ore data as loaded from ore.json, nested by security band
+        """
+        self.ores = ore_data
+        self.ore_index = {}
+        self.normalized_ore_index = {}
+        self.material_graph = None
+        
+        # Ore data is nested by security band: {'ores': {band: {ore: {'yields': {...}}}}}
+        pending = [ore_data]
+        while pending:
+            node = pending.pop()
+            if not isinstance(node, dict):
+                continue
+            if isinstance(node.get('yields'), dict):
+                display_name = node.get('display_name')
+                if display_name:
+                    self.ore_index[display_name] = node
+                    self.normalized_ore_index[normalize_name(display_name)] = node
+            else:
+                pending.extend(node.values())
+    
+    def set_owned_status(self, category: str, name: str, owned_status) -> bool:
+        """
+        Set the blueprint ownership of a registered item
+        
+        Updates the item and its bit in the ownership bitmap in place, so the
+        filter indexes never need a rebuild.
+        
+        Args:
+            category: Registry collection of the item ('ships', 'capital_ships', ...)
+            name: Registry name of the item
+            owned_status: New ownership, True/False or "Owned"/"Unowned"
+            
+        Returns:
+            True if the item was found
+        """
+        module = getattr(self, category).get(name)
+        if module is None:
+            return False
+        
+        module.owned_status = owned_status
+        self._set_owned_bit(category, name, owned_status)
+        return True
+    
+    def _set_owned_bit(self, category: str, name: str, owned_status):
+        """
+        Set or clear an item's bit in the ownership bitmap
+        
+        Args:
+            category: Registry collection the item belongs to
+            name: Registry name of the item
+            owned_status: New ownership, True/False or "Owned"/"Unowned"
+        """
+        bit = 1 << self._get_item_id(category, name)
+        if is_owned(owned_status):
+            self.owned_bitmaps[category] |= bit
+        else:
+            self.owned_bitmaps[category] &= ~bit
+    
+    def _filter_bitmap(self, category: str, faction: Optional[str] = None, ship_type: Optional[str] = None,
+                       owned_only: bool = False) -> int:
+        """
+        Combine the filter indexes of a category into one bitmap
+        
+        Args:
+            category: Registry collection to filter
+            faction: Faction to filter by, or None/"All" for no filtering
+            ship_type: Ship type to filter by, or None/"All" for no filtering
+            owned_only: If True, only keep owned items
+            
+        Returns:
+            Bitmap of the matching item IDs
+        """
+        bitmap = (1 << len(self.item_names[category])) - 1
+        if faction and faction != "All":
+            bitmap &= self.faction_bitmaps[category].get(faction, 0)
+        if ship_type and ship_type != "All":
+            bitmap &= self.ship_type_bitmaps[category].get(ship_type, 0)
+        if owned_only:
+            bitmap &= self.owned_bitmaps[category]
+        return bitmap
+    
+    def _modules_from_bitmap(self, category: str, bitmap: int):
+        """
+        Get the modules whose IDs are set in a bitmap, in registration order
+        
+        Args:
+            category: Registry collection the IDs belong to
+            bitmap: Bitmap of item IDs
+            
+        Returns:
+            List of (name, module) tuples
+        """
+        names = self.item_names[category]
+        collection = getattr(self, category)
+        modules = []
+        for item_id in iter_bits(bitmap):
+            module = collection.get(names[item_id])
+            if module is not None:
+                modules.append((names[item_id], module))
+        return modules
+    
+    def build_material_graph(self) -> MaterialGraph:
+        """
+        Compile the production graph for all registered recipes
+        
+        Cycles and references to unknown materials are reported once here.
+        
+        Returns:
+            The compiled MaterialGraph
+        """
+        self.material_graph = MaterialGraph.from_registry(self, self.get_raw_material_names())
+        return self.material_graph
+    
+    def get_material_graph(self) -> MaterialGraph:
+        """
+        Get the compiled production graph, building it if needed
+        
+        Returns:
+            The compiled MaterialGraph
+        """
+        if self.material_graph is None:
+            return self.build_material_graph()
+        return self.material_graph
+    
+    def build_pi_chain(self) -> PiChain:
+        """
+        Compile the P0 -> P4 production chain of the registered PI materials
+        
+        Returns:
+            The compiled PiChain
+        """
+        self.pi_chain = PiChain.from_registry(self)
+        return self.pi_chain
+    
+    def get_pi_chain(self) -> PiChain:
+        """
+        Get the compiled PI production chain, building it if needed
+        
+        Returns:
+            The compiled PiChain
+        """
+        if self.pi_chain is None:
+            return self.build_pi_chain()
+        return self.pi_chain
+    
+    def get_raw_material_names(self) -> Set[str]:
+        """
+        Get the names of all materials with a known raw source
+        
+        Returns:
+            Set of mineral names from ore yields and PI material names
+        """
+        raw_materials = set(material.display_name for material in self.pi_materials.values())
+        
+        # Ore data is nested by security band: {'ores': {band: {ore: {'yields': {...}}}}}
+        pending = [self.ores]
+        while pending:
+            node = pending.pop()
+            if not isinstance(node, dict):
+                continue
+            if isinstance(node.get('yields'), dict):
+                raw_materials.update(node['yields'])
+            else:
+                pending.extend(node.values())
+        
+        return raw_materials
     
     def get_ship(self, name: str):
         """
@@ -174,10 +532,7 @@ class ModuleRegistry:
         Returns:
             PiMaterialModule if found, None otherwise
         """
-        for material in self.pi_materials.values():
-            if material.display_name == display_name:
-                return material
-        return None
+        return self._get_by_display_name('pi_materials', display_name)
     
     def get_pi_materials_by_level(self, pi_level: Optional[str] = None):
         """
@@ -258,21 +613,7 @@ class ModuleRegistry:
         Returns:
             Dictionary of ships matching the filter criteria
         """
-        filtered_ships = {}
-        
-        for name, ship in self.ships.items():
-            # Apply faction filter if not "All"
-            if faction != "All" and ship.faction != faction:
-                continue
-                
-            # Apply ship type filter if not "All"
-            if ship_type != "All" and ship.ship_type != ship_type:
-                continue
-                
-            # Ship passed all filters, add it to filtered_ships
-            filtered_ships[name] = ship
-            
-        return filtered_ships
+        return dict(self._modules_from_bitmap('ships', self._filter_bitmap('ships', faction, ship_type)))
     
     def get_ships_by_filter(self, faction: Optional[str] = None, ship_type: Optional[str] = None, owned_only: bool = False):
         """
@@ -286,12 +627,8 @@ class ModuleRegistry:
         Returns:
             List of ShipModule objects matching the filter criteria
         """
-        return [ship for ship in self.ships.values() 
-                if (not faction or faction == "All" or ship.faction == faction) and
-                   (not ship_type or ship_type == "All" or ship.ship_type == ship_type) and
-                   (not owned_only or 
-                    (isinstance(ship.owned_status, bool) and ship.owned_status) or
-                    (isinstance(ship.owned_status, str) and ship.owned_status.lower() == "owned"))]
+        bitmap = self._filter_bitmap('ships', faction, ship_type, owned_only)
+        return [ship for _, ship in self._modules_from_bitmap('ships', bitmap)]
     
     def get_capital_ships_by_filter(self, faction: Optional[str] = None, ship_type: Optional[str] = None, owned_only: bool = False):
         """
@@ -305,12 +642,8 @@ class ModuleRegistry:
         Returns:
             List of CapitalShipModule objects matching the filter criteria
         """
-        return [ship for ship in self.capital_ships.values() 
-                if (not faction or faction == "All" or ship.faction == faction) and
-                   (not ship_type or ship_type == "All" or ship.ship_type == ship_type) and
-                   (not owned_only or 
-                    (isinstance(ship.owned_status, bool) and ship.owned_status) or
-                    (isinstance(ship.owned_status, str) and ship.owned_status.lower() == "owned"))]
+        bitmap = self._filter_bitmap('capital_ships', faction, ship_type, owned_only)
+        return [ship for _, ship in self._modules_from_bitmap('capital_ships', bitmap)]
     
     def get_ships_combined_by_filter(self, faction: Optional[str] = None, ship_type: Optional[str] = None, owned_only: bool = False):
         """
@@ -332,6 +665,25 @@ class ModuleRegistry:
         
         # Combine the results
         return filtered_ships + filtered_capital_ships
+    
+    def get_names_by_filter(self, category: str, faction: Optional[str] = None, ship_type: Optional[str] = None,
+                            owned_only: bool = False) -> List[str]:
+        """
+        Get the registry names of the items of a category matching a filter
+        
+        Reads only the filter bitmaps and the ID table, so no module is built.
+        
+        Args:
+            category: Registry collection to filter
+            faction: Optional faction to filter by, or None/"All" for no filtering
+            ship_type: Optional ship type to filter by, or None/"All" for no filtering
+            owned_only: If True, only return owned items
+            
+        Returns:
+            List of item names in registration order
+        """
+        names = self.item_names[category]
+        return [names[item_id] for item_id in iter_bits(self._filter_bitmap(category, faction, ship_type, owned_only))]
         
     def get_factions(self):
         """
@@ -361,7 +713,7 @@ class ModuleRegistry:
         Returns:
             ShipModule if found, None otherwise
         """
-        return next((ship for ship in self.ships.values() if ship.display_name == display_name), None)
+        return self._get_by_display_name('ships', display_name)
     
     def get_capital_ship_by_display_name(self, display_name: str):
         """
@@ -373,7 +725,7 @@ class ModuleRegistry:
         Returns:
             CapitalShipModule if found, None otherwise
         """
-        return next((ship for ship in self.capital_ships.values() if ship.display_name == display_name), None)
+        return self._get_by_display_name('capital_ships', display_name)
     
     def get_ship_by_display_name_combined(self, display_name: str):
         """
@@ -385,13 +737,11 @@ class ModuleRegistry:
         Returns:
             ShipModule or CapitalShipModule if found, None otherwise
         """
-        # First check regular ships
-        ship = self.get_ship_by_display_name(display_name)
-        if ship:
-            return ship
-            
-        # If not found, check capital ships
-        return self.get_capital_ship_by_display_name(display_name)
+        entry = self.ship_display_name_index.get(display_name)
+        if entry is None:
+            return None
+        category, name = entry
+        return getattr(self, category).get(name)
     
     def get_component_by_display_name(self, display_name: str):
         """
@@ -403,7 +753,7 @@ class ModuleRegistry:
         Returns:
             ComponentModule if found, None otherwise
         """
-        return next((comp for comp in self.components.values() if comp.display_name == display_name), None)
+        return self._get_by_display_name('components', display_name)
     
     def get_capital_component_by_display_name(self, display_name: str):
         """
@@ -415,28 +765,100 @@ class ModuleRegistry:
         Returns:
             ComponentModule if found, None otherwise
         """
-        return next((comp for comp in self.capital_components.values() if comp.display_name == display_name), None)
-    
+        return self._get_by_display_name('capital_components', display_name)
+
+    def _get_by_display_name(self, category: str, display_name: str):
+        """
+        Look up an item of one category in the display-name index
+        
+        Args:
+            category: Registry collection to search
+            display_name: The exact display name
+            
+        Returns:
+            The module if found, None otherwise
+        """
+        name = self.display_name_index[category].get(display_name)
+        if name is None:
+            return None
+        return getattr(self, category).get(name)
+
+    def find_buildable(self, material_name: str):
+        """
+        Find the manufacturable item a requirement entry refers to
+
+        Requirement dictionaries reference sub-components either by display name
+        ("Capital Armor Plates") or by registry name ("capital_armor_plates"), so
+        both are tried for each buildable category in BUILDABLE_CATEGORIES order.
+
+        Args:
+            material_name: The material name as it appears in a requirements dict
+
+        Returns:
+            Tuple of (category, module) if found, (None, None) for raw materials
+        """
+        for category in self.BUILDABLE_CATEGORIES:
+            module = self._get_by_display_name(category, material_name)
+            if module is None:
+                module = getattr(self, category).get(material_name)
+            if module is not None:
+                return category, module
+        return None, None
+
+    def find_by_name(self, name: str, categories: Optional[Tuple[str, ...]] = None):
+        """
+        Find an item from user input
+        
+        An exact display or registry name is tried first, then the normalized
+        name, so input that differs only in case, underscores or spacing still
+        matches.
+        
+        Args:
+            name: Display or registry name typed by the user
+            categories: Registry collections to search, default INDEXED_CATEGORIES
+            
+        Returns:
+            Tuple of (category, module) if found, (None, None) otherwise
+        """
+        categories = categories or self.INDEXED_CATEGORIES
+        for category in categories:
+            module = self._get_by_display_name(category, name) or getattr(self, category).get(name)
+            if module is not None:
+                return category, module
+        
+        normalized = normalize_name(name)
+        for category in categories:
+            registry_name = self.normalized_name_index[category].get(normalized)
+            if registry_name is not None:
+                module = getattr(self, category).get(registry_name)
+                if module is not None:
+                    return category, module
+        return None, None
+
     def get_ore_by_display_name(self, display_name: str):
         """
         Get an ore by its display name
         
         Args:
-            display_name: The display name of the ore to find
+            display_name: The display name of the ore to find, matched exactly
+                or after normalization
             
         Returns:
-            OreModule if found, None otherwise
+            Ore data dictionary (display_name, security_level, yields) if found, None otherwise
         """
-        return next((ore for ore in self.ores.values() if getattr(ore, 'display_name', None) == display_name), None)
+        ore = self.ore_index.get(display_name)
+        if ore is None:
+            ore = self.normalized_ore_index.get(normalize_name(display_name))
+        return ore
     
     def get_all_ores(self):
         """
         Get all registered ores
         
         Returns:
-            List of OreModule objects
+            List of ore data dictionaries
         """
-        return list(self.ores.values())
+        return list(self.ore_index.values())
     
     def get_components_by_filter(self, owned_only: bool = False):
         """
@@ -448,7 +870,5 @@ class ModuleRegistry:
         Returns:
             List of ComponentModule objects matching the filter criteria
         """
-        return [comp for comp in self.components.values() 
-                if (not owned_only or 
-                   (isinstance(comp.owned_status, bool) and comp.owned_status) or
-                   (isinstance(comp.owned_status, str) and comp.owned_status.lower() == "owned"))]
+        bitmap = self._filter_bitmap('components', owned_only=owned_only)
+        return [comp for _, comp in self._modules_from_bitmap('components', bitmap)]
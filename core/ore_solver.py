@@ -0,0 +1,391 @@
+"""
+Ore mix solver for EVE Production Calculator
+
+Finds the ores to refine for a mineral shopping list at the lowest cost, where
+the cost of an ore is its volume, its unit count or a price per unit.
+
+The mix is an integer program over whole portions: minimize cost . portions
+subject to the refined minerals covering the requirements. Its linear
+relaxation is solved with a small simplex on the dual problem; all constraints
+are ">=" with non-negative costs, so the dual starts feasible at the origin and
+needs no phase one. A short branch and bound on the portion counts closes the
+gap left by rounding, with every relaxation rounded up, topped up where the
+game's per-mineral rounding leaves a shortfall and trimmed of portions that are
+not needed. The search is capped at a number of relaxations; a mix found when
+the cap is hit is reported with status 'node-limit' and the lower bound the
+open nodes still allow, so callers can tell how far from optimal it may be. With at most a few dozen ores a solve takes a few milliseconds, so
+the mix can be re-solved on every ME or quantity change.
+"""
+import math
+from typing import Dict, List, Iterable, Mapping, Optional, Tuple
+
+from core.refining import RefiningEngine
+from core.utils.debug import debug_print
+
+# Supported cost measures when no prices are given
+OBJECTIVES = ('volume', 'units')
+
+_EPSILON = 1e-9
+
+# Branch and bound stops when the best mix is within this fraction of the
+# bound, or by default after this many relaxations, to stay fast on large orders
+_GAP_TOLERANCE = 1e-4
+_MAX_NODES = 100
+
+# Search outcome of an ore mix solve
+STATUS_OPTIMAL = 'optimal'
+STATUS_NODE_LIMIT = 'node-limit'
+
+def _security_key(level: str) -> str:
+    """Normalize a security level so "High-sec", "high sec" and "highsec" match"""
+    return "".join(character for character in level.casefold() if character.isalnum())
+
+class OreMix:
+    """Result of an ore mix solve"""
+    __slots__ = ('ores', 'portions', 'minerals', 'surplus', 'cost', 'relaxed_cost', 'bound',
+                 'status', 'nodes', 'missing')
+
+    def __init__(self):
+        self.ores: Dict[str, int] = {}  # Ore display name -> units to refine
+        self.portions: Dict[str, int] = {}  # Ore display name -> portions to refine
+        self.minerals: Dict[str, int] = {}  # Minerals the mix refines into
+        self.surplus: Dict[str, int] = {}  # Minerals produced beyond the requirement
+        self.cost = 0.0  # Cost of the rounded mix
+        self.relaxed_cost = 0.0  # Cost of the fractional optimum, a lower bound
+        self.bound = 0.0  # Best lower bound on the cost of any whole mix
+        self.status = STATUS_OPTIMAL  # STATUS_OPTIMAL or STATUS_NODE_LIMIT
+        self.nodes = 0  # Relaxations solved by branch and bound
+        self.missing: List[str] = []  # Required minerals no allowed ore yields
+
+    @property
+    def feasible(self) -> bool:
+        """True if the mix covers every required mineral"""
+        return not self.missing
+
+    @property
+    def gap(self) -> float:
+        """Fraction by which the mix may cost more than the optimum, 0.0 when proven optimal"""
+        if self.cost <= 0:
+            return 0.0
+        return max(0.0, (self.cost - self.bound) / self.cost)
+
+class OreMixSolver:
+    """Solves ore mixes over the yield matrix of a RefiningEngine"""
+
+    def __init__(self, engine: RefiningEngine):
+        """
+        Create a solver
+
+        Args:
+            engine: Refining engine providing yields, portion sizes and volumes
+        """
+        self.engine = engine
+
+    def solve(self, requirements: Mapping[str, int], efficiency: float,
+              objective: str = 'volume',
+              prices: Optional[Mapping[str, float]] = None,
+              security_levels: Optional[Iterable[str]] = None,
+              max_nodes: Optional[int] = None) -> OreMix:
+        """
+        Find the cheapest ore mix refining into at least the required minerals
+
+        Args:
+            requirements: Dictionary of mineral -> quantity needed; materials
+                that are not minerals are ignored
+            efficiency: Reprocessing efficiency as a fraction
+            objective: 'volume' (m3 to haul) or 'units' (ore units); ignored when prices are given
+            prices: Optional price per unit of each ore; ores without a price are not used
+            security_levels: Optional security levels (e.g. "High-sec") the ores must come from
+            max_nodes: Optional cap on the relaxations branch and bound may solve
+
+        Returns:
+            The OreMix; check feasible/missing for minerals that cannot be covered
+            and status/gap for a search stopped by the node limit
+        """
+        if max_nodes is None:
+            max_nodes = _MAX_NODES
+        elif max_nodes < 1:
+            raise ValueError("The node limit must be at least 1")
+        engine = self.engine
+        mix = OreMix()
+
+        demand = {}
+        for mineral, quantity in requirements.items():
+            column = engine.mineral_columns.get(mineral)
+            if column is not None and quantity > 0:
+                demand[column] = demand.get(column, 0) + int(math.ceil(quantity))
+        if not demand:
+            return mix
+
+        rows, costs = self._candidate_ores(objective, prices, security_levels)
+        columns = sorted(demand)
+
+        # Effective minerals per portion of every candidate ore
+        yields = [[efficiency * engine.yield_matrix[row][column] for column in columns] for row in rows]
+
+        mix.missing = [engine.minerals[column] for k, column in enumerate(columns)
+                       if not any(ore_yields[k] > _EPSILON for ore_yields in yields)]
+        if mix.missing:
+            debug_print(f"Ore mix: no allowed ore yields {', '.join(mix.missing)}")
+            return mix
+
+        targets = [demand[column] for column in columns]
+        portions, mix.relaxed_cost, mix.bound, mix.nodes = self._branch_and_bound(
+            yields, costs, targets, rows, columns, efficiency, max_nodes)
+
+        for row, count in zip(rows, portions):
+            if not count:
+                continue
+            name = engine.ore_names[row]
+            mix.portions[name] = count
+            mix.ores[name] = count * engine.portion_sizes[row]
+        produced, _ = engine.refine(mix.ores, efficiency)
+        mix.minerals = produced
+        mix.surplus = {engine.minerals[column]: produced.get(engine.minerals[column], 0) - demand[column]
+                       for column in columns if produced.get(engine.minerals[column], 0) > demand[column]}
+        mix.cost = sum(cost * count for cost, count in zip(costs, portions))
+        if mix.cost - mix.bound > _GAP_TOLERANCE * mix.cost:
+            mix.status = STATUS_NODE_LIMIT
+        return mix
+
+    def _candidate_ores(self, objective: str, prices: Optional[Mapping[str, float]],
+                        security_levels: Optional[Iterable[str]]) -> Tuple[List[int], List[float]]:
+        """
+        Get the ores allowed in the mix and the cost of one portion of each
+
+        Returns:
+            Tuple of (engine rows, cost per portion)
+        """
+        engine = self.engine
+        if prices is None and objective not in OBJECTIVES:
+            raise ValueError(f"Unknown ore mix objective: {objective}")
+
+        allowed = None
+        if security_levels is not None:
+            allowed = {_security_key(level) for level in security_levels}
+
+        unit_prices = {}
+        if prices is not None:
+            for ore_name, price in prices.items():
+                row = engine.find_ore(ore_name)
+                if row is not None:
+                    unit_prices[row] = float(price)
+
+        rows = []
+        costs = []
+        for row, name in enumerate(engine.ore_names):
+            level = engine.security_levels[row]
+            if allowed is not None and (level is None or _security_key(level) not in allowed):
+                continue
+
+            if prices is not None:
+                unit_cost = unit_prices.get(row)
+            elif objective == 'volume':
+                unit_cost = engine.volumes[row]
+            else:
+                unit_cost = 1.0
+            if unit_cost is None or unit_cost <= 0:
+                continue
+
+            rows.append(row)
+            costs.append(unit_cost * engine.portion_sizes[row])
+        return rows, costs
+
+    def _branch_and_bound(self, yields: List[List[float]], costs: List[float], targets: List[int],
+                          rows: List[int], columns: List[int], efficiency: float,
+                          max_nodes: int) -> Tuple[List[int], float, float, int]:
+        """
+        Search for the cheapest whole number of portions of every ore
+
+        Each node solves the linear relaxation with bounds on the portion
+        counts, rounds its solution into a sufficient mix to improve the best
+        mix found so far, and branches on the most fractional count. Nodes whose
+        relaxation cannot beat the best mix are pruned, and the search stops
+        after max_nodes nodes; the best mix found by then is returned together
+        with the lowest bound of the nodes left open or pruned, which no whole
+        mix can undercut.
+
+        Returns:
+            Tuple of (portions of every candidate ore, cost of the unbounded
+            relaxation, lower bound on the optimal cost, nodes solved)
+        """
+        ore_count = len(rows)
+        # With whole-number costs a mix costs a multiple of their GCD, so the
+        # bound of a node can be rounded up to that step before pruning
+        step = 0
+        if all(abs(cost - round(cost)) <= _EPSILON * max(1.0, cost) for cost in costs):
+            step = math.gcd(*(int(round(cost)) for cost in costs))
+        best_portions = None
+        best_cost = math.inf
+        relaxed_cost = 0.0
+        # Lowest bound of a node pruned against an earlier, dearer best mix
+        pruned_bound = math.inf
+        nodes = 0
+
+        # Nodes are (lower bounds, upper bounds, bound of the parent); None means unbounded
+        stack = [([0] * ore_count, [None] * ore_count, 0.0)]
+        while stack and nodes < max_nodes:
+            lower, upper, _ = stack.pop()
+            nodes += 1
+
+            # Lower bounds are substituted out: x = lower + x', x' >= 0
+            residual = [max(0.0, target - sum(bound * ore_yields[k] for bound, ore_yields in zip(lower, yields)))
+                        for k, target in enumerate(targets)]
+            ranges = [None if high is None else high - low for low, high in zip(lower, upper)]
+            relaxed = _solve_covering_lp(yields, costs, residual, ranges)
+            if relaxed is None:
+                continue
+            relaxed = [low + amount for low, amount in zip(lower, relaxed)]
+            cost = sum(ore_cost * amount for ore_cost, amount in zip(costs, relaxed))
+            if nodes == 1:
+                relaxed_cost = cost
+            if step:
+                cost = math.ceil(cost / step - _EPSILON) * step
+            if cost >= best_cost - _GAP_TOLERANCE * best_cost:
+                pruned_bound = min(pruned_bound, cost)
+                continue
+
+            portions = [int(math.ceil(amount - _EPSILON)) for amount in relaxed]
+            self._repair(portions, rows, columns, targets, costs, efficiency)
+            self._trim(portions, rows, columns, targets, costs, efficiency)
+            portions_cost = sum(ore_cost * count for ore_cost, count in zip(costs, portions))
+            if portions_cost < best_cost:
+                best_portions, best_cost = portions, portions_cost
+                if cost >= best_cost - _GAP_TOLERANCE * best_cost:
+                    pruned_bound = min(pruned_bound, cost)
+                    continue
+
+            # Branch on the count furthest from a whole number
+            branch = None
+            distance = _EPSILON
+            for index, amount in enumerate(relaxed):
+                fraction = amount - math.floor(amount)
+                if min(fraction, 1 - fraction) > distance:
+                    branch, distance = index, min(fraction, 1 - fraction)
+            if branch is None:
+                continue
+
+            split = math.floor(relaxed[branch])
+            up_lower = list(lower)
+            up_lower[branch] = split + 1
+            down_upper = list(upper)
+            down_upper[branch] = split
+            stack.append((up_lower, upper, cost))
+            stack.append((lower, down_upper, cost))
+
+        bound = min([best_cost, pruned_bound] + [parent for _, _, parent in stack])
+        bound = max(bound, relaxed_cost)
+        debug_print(f"Ore mix: {nodes} nodes, cost {best_cost:.2f} (bound {bound:.2f}, "
+                    f"relaxation {relaxed_cost:.2f}){' - node limit reached' if stack else ''}")
+        return best_portions, relaxed_cost, bound, nodes
+
+    def _portion_yield(self, row: int, column: int, count: int, efficiency: float) -> int:
+        """Minerals refined from some portions of one ore, rounded down like the game"""
+        return math.floor(count * efficiency * self.engine.yield_matrix[row][column] + _EPSILON)
+
+    def _shortfall(self, portions: List[int], rows: List[int], columns: List[int],
+                   targets: List[int], efficiency: float) -> List[int]:
+        """Amount of each required mineral the rounded mix still lacks"""
+        return [max(0, target - sum(self._portion_yield(row, column, count, efficiency)
+                                    for row, count in zip(rows, portions) if count))
+                for column, target in zip(columns, targets)]
+
+    def _repair(self, portions: List[int], rows: List[int], columns: List[int],
+                targets: List[int], costs: List[float], efficiency: float):
+        """Add portions until the rounded-down yields cover every requirement"""
+        shortfall = self._shortfall(portions, rows, columns, targets, efficiency)
+        while any(shortfall):
+            # Cheapest portion per unit of shortfall it covers
+            best = None
+            best_ratio = None
+            for index, row in enumerate(rows):
+                covered = sum(min(short, efficiency * self.engine.yield_matrix[row][column])
+                              for column, short in zip(columns, shortfall) if short)
+                if covered <= _EPSILON:
+                    continue
+                ratio = costs[index] / covered
+                if best_ratio is None or ratio < best_ratio:
+                    best, best_ratio = index, ratio
+            portions[best] += 1
+            shortfall = self._shortfall(portions, rows, columns, targets, efficiency)
+
+    def _trim(self, portions: List[int], rows: List[int], columns: List[int],
+              targets: List[int], costs: List[float], efficiency: float):
+        """Remove portions, most expensive ore first, while the mix stays sufficient"""
+        for index in sorted(range(len(rows)), key=lambda i: -costs[i]):
+            while portions[index]:
+                portions[index] -= 1
+                if any(self._shortfall(portions, rows, columns, targets, efficiency)):
+                    portions[index] += 1
+                    break
+
+def _solve_covering_lp(yields: List[List[float]], costs: List[float], targets: List[float],
+                       upper_bounds: Optional[List[Optional[int]]] = None) -> Optional[List[float]]:
+    """
+    Solve min costs . x subject to yields^T x >= targets, 0 <= x <= upper_bounds
+
+    The dual, max targets . y - upper_bounds . z subject to yields y - z <= costs,
+    y, z >= 0, is solved with a tableau simplex using Bland's rule. The primal x
+    is the reduced cost of each dual slack in the optimal tableau.
+
+    Args:
+        yields: One row per ore with the amount of each mineral per portion
+        costs: Cost of one portion of each ore, all positive
+        targets: Required amount of each mineral
+        upper_bounds: Optional highest number of portions of each ore, None for no limit
+
+    Returns:
+        Optimal (fractional) number of portions of each ore, or None if the
+        bounds make the requirements impossible to cover
+    """
+    ore_count = len(costs)
+    mineral_count = len(targets)
+    bounded = [i for i in range(ore_count) if upper_bounds is not None and upper_bounds[i] is not None]
+    if any(upper_bounds[i] < 0 for i in bounded):
+        return None
+    width = mineral_count + ore_count + len(bounded)
+
+    # Rows: yields[i] . y + slack_i - z_i = costs[i]; last entry is the right-hand side
+    tableau = []
+    for i in range(ore_count):
+        row = list(yields[i]) + [0.0] * (ore_count + len(bounded)) + [costs[i]]
+        row[mineral_count + i] = 1.0
+        tableau.append(row)
+    for k, i in enumerate(bounded):
+        tableau[i][mineral_count + ore_count + k] = -1.0
+    objective = ([-float(target) for target in targets] + [0.0] * ore_count
+                 + [float(upper_bounds[i]) for i in bounded] + [0.0])
+    basis = [mineral_count + i for i in range(ore_count)]
+
+    while True:
+        entering = next((column for column in range(width) if objective[column] < -_EPSILON), None)
+        if entering is None:
+            break
+
+        leaving = None
+        best_ratio = None
+        for i, row in enumerate(tableau):
+            if row[entering] > _EPSILON:
+                ratio = row[-1] / row[entering]
+                if (best_ratio is None or ratio < best_ratio - _EPSILON
+                        or (abs(ratio - best_ratio) <= _EPSILON and basis[i] < basis[leaving])):
+                    leaving, best_ratio = i, ratio
+        if leaving is None:
+            # The dual is unbounded, so no mix within the bounds is sufficient
+            return None
+
+        pivot_row = tableau[leaving]
+        pivot = pivot_row[entering]
+        for column in range(width + 1):
+            pivot_row[column] /= pivot
+        for i, row in enumerate(tableau):
+            factor = row[entering]
+            if i != leaving and factor:
+                for column in range(width + 1):
+                    row[column] -= factor * pivot_row[column]
+        factor = objective[entering]
+        for column in range(width + 1):
+            objective[column] -= factor * pivot_row[column]
+        basis[leaving] = entering
+
+    return [max(0.0, objective[mineral_count + i]) for i in range(ore_count)]
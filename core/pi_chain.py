@@ -0,0 +1,190 @@
+"""
+Planetary interaction production chain for EVE Production Calculator
+
+PI schematics are fixed per tier: every cycle of a factory consumes a set
+amount of each input, depending only on the input's tier, and produces a set
+batch of its product. The chain compiles the registry's PI materials into an
+indexed P0 -> P4 graph using these per-cycle quantities, so any product can be
+resolved down to raw P0 resources in one pass over its memoized sub-chain.
+"""
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from core.utils.debug import debug_print
+
+# PI tiers, raw resources first
+PI_LEVELS = ('P0', 'P1', 'P2', 'P3', 'P4')
+
+# Units of an input consumed per factory cycle, by the tier of the input
+PI_INPUT_QUANTITIES = {'P0': 3000, 'P1': 40, 'P2': 10, 'P3': 6}
+
+# Units produced per factory cycle, by the tier of the product
+PI_BATCH_SIZES = {'P0': 1, 'P1': 20, 'P2': 5, 'P3': 3, 'P4': 1}
+
+# Length of a factory cycle in seconds, by the tier of the product; P0 is extracted, not produced
+PI_CYCLE_TIMES = {'P0': 0, 'P1': 1800, 'P2': 3600, 'P3': 3600, 'P4': 3600}
+
+def get_pi_tier(pi_level: str) -> Optional[int]:
+    """
+    Get the tier number of a PI level
+
+    Args:
+        pi_level: PI level such as "P2" or "p2"
+
+    Returns:
+        Tier from 0 to 4, or None if the level is not a PI tier
+    """
+    pi_level = (pi_level or '').upper()
+    return PI_LEVELS.index(pi_level) if pi_level in PI_LEVELS else None
+
+class PiChain:
+    """
+    Compiled PI production graph
+
+    Every PI material is a node, numbered by tier so P4 products come first and
+    P0 resources last; that numbering is also the resolution order. The inputs
+    of node ``n`` are ``inputs[offsets[n]:offsets[n + 1]]`` with the units
+    consumed per cycle in ``quantities``.
+    """
+    def __init__(self):
+        self.names: List[str] = []  # Node ID -> display name
+        self.registry_names: List[str] = []  # Node ID -> registry name
+        self.ids: Dict[str, int] = {}  # Display or registry name -> node ID
+        self.tiers = array('b')
+        self.batch_sizes = array('l')
+        self.cycle_times = array('l')
+
+        self.offsets = array('l', [0])
+        self.inputs = array('l')
+        self.quantities = array('l')
+
+        self._sub_chains: Dict[int, Tuple[int, ...]] = {}  # Node ID -> nodes it needs, in order
+
+    @property
+    def node_count(self) -> int:
+        """Number of PI materials in the chain"""
+        return len(self.names)
+
+    def get_node_id(self, name: str) -> Optional[int]:
+        """
+        Get the node ID of a PI material
+
+        Args:
+            name: Display or registry name
+
+        Returns:
+            Node ID, or None if the material is not in the chain
+        """
+        return self.ids.get(name)
+
+    def get_inputs(self, node_id: int) -> Tuple[List[int], List[int]]:
+        """
+        Get the inputs of a node and the units of each consumed per cycle
+
+        Args:
+            node_id: ID of the node
+
+        Returns:
+            Tuple of (input node IDs, units per cycle)
+        """
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return list(self.inputs[start:end]), list(self.quantities[start:end])
+
+    @classmethod
+    def from_registry(cls, registry) -> 'PiChain':
+        """
+        Compile the chain from the PI materials of a module registry
+
+        Args:
+            registry: ModuleRegistry with PI materials loaded
+
+        Returns:
+            The compiled PiChain
+        """
+        chain = cls()
+        materials = [material for material in registry.get_all_pi_materials()
+                     if get_pi_tier(material.pi_level) is not None]
+        # Highest tier first; the sort is stable, so file order is kept within a tier
+        materials.sort(key=lambda material: -get_pi_tier(material.pi_level))
+
+        for material in materials:
+            node_id = len(chain.names)
+            chain.names.append(material.display_name)
+            chain.registry_names.append(material.name)
+            chain.ids.setdefault(material.display_name, node_id)
+            chain.ids.setdefault(material.name, node_id)
+            chain.tiers.append(get_pi_tier(material.pi_level))
+            chain.batch_sizes.append(max(1, material.batch_size))
+            chain.cycle_times.append(material.cycle_time)
+
+        for node_id, material in enumerate(materials):
+            for input_name, amount in material.requirements.items():
+                child = chain.ids.get(input_name)
+                if child is None or chain.tiers[child] >= chain.tiers[node_id]:
+                    debug_print(f"PI chain: {material.display_name} input '{input_name}' skipped")
+                    continue
+                chain.inputs.append(child)
+                chain.quantities.append(int(amount))
+            chain.offsets.append(len(chain.inputs))
+
+        debug_print(f"Compiled PI chain: {chain.node_count} materials, {len(chain.inputs)} inputs")
+        return chain
+
+    def get_sub_chain(self, node_id: int) -> Tuple[int, ...]:
+        """
+        Get every node needed to make a node, itself included, in resolution order
+
+        Args:
+            node_id: ID of the product
+
+        Returns:
+            Node IDs, products before their inputs; memoized per node
+        """
+        sub_chain = self._sub_chains.get(node_id)
+        if sub_chain is None:
+            # Inputs always have a higher node ID than their products
+            needed = {node_id}
+            for input_id in self.inputs[self.offsets[node_id]:self.offsets[node_id + 1]]:
+                needed.update(self.get_sub_chain(input_id))
+            sub_chain = tuple(sorted(needed))
+            self._sub_chains[node_id] = sub_chain
+        return sub_chain
+
+    def resolve(self, demand: Dict[int, int]) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Resolve a demand down to P0 resources, in whole factory cycles
+
+        Demand for a material shared by several products is added up before it
+        is rounded to whole cycles, as a colony would produce it.
+
+        Args:
+            demand: Dictionary of node ID -> units wanted
+
+        Returns:
+            Tuple of (units needed of every node reached, factory cycles of every
+            node that is produced from inputs)
+        """
+        if len(demand) == 1:
+            nodes = self.get_sub_chain(next(iter(demand)))
+        else:
+            needed = set()
+            for node_id in demand:
+                needed.update(self.get_sub_chain(node_id))
+            nodes = sorted(needed)
+
+        units = dict(demand)
+        cycles = {}
+        offsets, inputs, quantities = self.offsets, self.inputs, self.quantities
+        for node_id in nodes:
+            amount = units.get(node_id)
+            start, end = offsets[node_id], offsets[node_id + 1]
+            if not amount or start == end:
+                continue
+            node_cycles = math.ceil(amount / self.batch_sizes[node_id])
+            cycles[node_id] = node_cycles
+            for index in range(start, end):
+                child = inputs[index]
+                units[child] = units.get(child, 0) + node_cycles * quantities[index]
+
+        return units, cycles
@@ -0,0 +1,222 @@
+"""
+PI colony throughput planner for EVE Production Calculator
+
+Works out what a colony needs to make a steady daily output of a PI product:
+the units per day flowing through every tier, the number of factories of each
+kind from the schematic cycle times and batch sizes, the extractors for every
+P0 resource, and the fewest planets whose types between them offer every
+required resource.
+
+The planet search is a set cover over planet types. Resources and planet
+types are bitmasks; the search always branches on the uncovered resource with
+the fewest planet types, prunes any branch that cannot beat the best cover
+found so far, and memoizes the best cover of every resource set it solves, so
+planning every product in a row reuses most of the work.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+from core.pi_chain import PI_LEVELS, PiChain
+from core.utils.bits import iter_bits
+from core.utils.debug import debug_print
+
+SECONDS_PER_DAY = 86400
+
+# Units of P0 one extractor control unit delivers per hour; depends heavily on
+# the planet, heads and cycle length, so callers can pass their own figure
+DEFAULT_EXTRACTOR_UNITS_PER_HOUR = 5000
+
+# Facility that produces each tier
+PI_FACILITIES = {
+    'P0': "Extractor Control Unit",
+    'P1': "Basic Industry Facility",
+    'P2': "Advanced Industry Facility",
+    'P3': "Advanced Industry Facility",
+    'P4': "High-Tech Production Plant"
+}
+
+class PiPlan:
+    """Daily throughput, facilities and planets of a PI colony"""
+    __slots__ = ('product', 'units_per_day', 'rates', 'cycles_per_day', 'facilities', 'tier_facilities',
+                 'planets', 'resource_planets', 'missing')
+
+    def __init__(self, product: str, units_per_day: float):
+        self.product = product
+        self.units_per_day = units_per_day
+        self.rates: Dict[str, float] = {}  # Material -> units needed per day
+        self.cycles_per_day: Dict[str, float] = {}  # Produced material -> factory cycles per day
+        self.facilities: Dict[str, int] = {}  # Material -> factories, or extractors for P0
+        self.tier_facilities: Dict[str, int] = {}  # Tier -> factories or extractors
+        self.planets: Tuple[str, ...] = ()  # Planet types to settle
+        self.resource_planets: Dict[str, str] = {}  # P0 resource -> planet type to extract it on
+        self.missing: List[str] = []  # P0 resources no known planet type offers
+
+class PiPlanner:
+    """Plans PI colonies over a compiled PiChain"""
+
+    def __init__(self, chain: PiChain, resource_planet_types: Dict[str, Tuple[str, ...]]):
+        """
+        Create a planner
+
+        Args:
+            chain: Compiled PI production chain
+            resource_planet_types: P0 resource display name -> planet types it can be extracted on
+        """
+        self.chain = chain
+        self.planet_types: List[str] = sorted({planet for planets in resource_planet_types.values()
+                                               for planet in planets})
+        planet_bits = {planet: 1 << index for index, planet in enumerate(self.planet_types)}
+
+        # Resource bit -> mask of planet types offering it; planet bit -> mask of resources
+        self.resources: List[str] = sorted(resource_planet_types)
+        self._resource_bits = {resource: 1 << index for index, resource in enumerate(self.resources)}
+        self._resource_planets: List[int] = []
+        self._planet_resources: List[int] = [0] * len(self.planet_types)
+        for resource_index, resource in enumerate(self.resources):
+            mask = 0
+            for planet in resource_planet_types[resource]:
+                mask |= planet_bits[planet]
+                self._planet_resources[planet_bits[planet].bit_length() - 1] |= 1 << resource_index
+            self._resource_planets.append(mask)
+
+        self._cover_memo: Dict[int, Tuple[int, ...]] = {0: ()}
+
+    @classmethod
+    def from_registry(cls, registry) -> 'PiPlanner':
+        """
+        Create a planner for the PI materials of a module registry
+
+        Args:
+            registry: ModuleRegistry with PI materials loaded
+
+        Returns:
+            A new PiPlanner
+        """
+        resource_planet_types = {material.display_name: material.planet_types
+                                 for material in registry.get_pi_materials_by_level('P0')}
+        return cls(registry.get_pi_chain(), resource_planet_types)
+
+    def plan(self, product: str, units_per_day: float,
+             extractor_units_per_hour: float = DEFAULT_EXTRACTOR_UNITS_PER_HOUR) -> Optional[PiPlan]:
+        """
+        Plan a colony making a product at a steady daily rate
+
+        Rates are continuous: a factory counts as needed as soon as part of its
+        day is used, but inputs are not rounded to whole cycles per day.
+
+        Args:
+            product: Display or registry name of the PI material
+            units_per_day: Units of the product wanted per day
+            extractor_units_per_hour: P0 output of one extractor control unit
+
+        Returns:
+            The PiPlan, or None if the product is unknown
+        """
+        chain = self.chain
+        node_id = chain.get_node_id(product)
+        if node_id is None:
+            return None
+
+        plan = PiPlan(chain.names[node_id], units_per_day)
+        tier_facilities = {level: 0 for level in PI_LEVELS}
+
+        # Products come before their inputs, so every rate is final when reached
+        rates = {node_id: float(units_per_day)}
+        offsets, inputs, quantities = chain.offsets, chain.inputs, chain.quantities
+        for material_id in chain.get_sub_chain(node_id):
+            rate = rates.get(material_id, 0.0)
+            if rate <= 0:
+                continue
+            name = chain.names[material_id]
+            level = PI_LEVELS[chain.tiers[material_id]]
+            plan.rates[name] = rate
+
+            start, end = offsets[material_id], offsets[material_id + 1]
+            if start == end:
+                # Extracted resource
+                count = math.ceil(rate / (extractor_units_per_hour * 24))
+            else:
+                cycles = rate / chain.batch_sizes[material_id]
+                plan.cycles_per_day[name] = cycles
+                count = math.ceil(cycles * chain.cycle_times[material_id] / SECONDS_PER_DAY - 1e-9)
+                for index in range(start, end):
+                    rates[inputs[index]] = rates.get(inputs[index], 0.0) + cycles * quantities[index]
+            plan.facilities[name] = count
+            tier_facilities[level] += count
+
+        plan.tier_facilities = {level: count for level, count in tier_facilities.items() if count}
+
+        resources = [chain.names[material_id] for material_id in rates if chain.tiers[material_id] == 0]
+        plan.missing = [resource for resource in resources if not self._planets_of(resource)]
+        cover = self.find_planets([resource for resource in resources if resource not in plan.missing])
+        plan.planets = cover
+        for resource in resources:
+            planet = next((planet for planet in cover if planet in self._planets_of(resource)), None)
+            if planet is not None:
+                plan.resource_planets[resource] = planet
+
+        debug_print(f"PI plan for {units_per_day} {plan.product}/day: {sum(plan.tier_facilities.values())} "
+                    f"facilities on {len(cover)} planet type(s)")
+        return plan
+
+    def _planets_of(self, resource: str) -> Tuple[str, ...]:
+        """Planet types a P0 resource can be extracted on"""
+        bit = self._resource_bits.get(resource)
+        if bit is None:
+            return ()
+        mask = self._resource_planets[bit.bit_length() - 1]
+        return tuple(self.planet_types[index] for index in iter_bits(mask))
+
+    def find_planets(self, resources: List[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Find the fewest planet types that between them offer every resource
+
+        Args:
+            resources: P0 resource display names
+
+        Returns:
+            Planet types in name order, or None if some resource is on no planet type
+        """
+        needed = 0
+        for resource in resources:
+            bit = self._resource_bits.get(resource)
+            if bit is None or not self._resource_planets[bit.bit_length() - 1]:
+                return None
+            needed |= bit
+
+        cover = self._cover(needed, len(self.planet_types) + 1)
+        return tuple(self.planet_types[index] for index in sorted(cover))
+
+    def _cover(self, needed: int, limit: int) -> Optional[Tuple[int, ...]]:
+        """
+        Get a minimum planet cover of a resource set
+
+        Args:
+            needed: Bitmask of resources to cover
+            limit: Only covers with fewer planets than this are of interest
+
+        Returns:
+            Planet indexes of a minimum cover, or None if none is smaller than limit
+        """
+        cover = self._cover_memo.get(needed)
+        if cover is not None:
+            return cover if len(cover) < limit else None
+        if limit <= 1:
+            return None
+
+        # Branch on the resource with the fewest planet choices
+        resource_index = min(iter_bits(needed), key=lambda index: bin(self._resource_planets[index]).count('1'))
+
+        best = None
+        for planet_index in iter_bits(self._resource_planets[resource_index]):
+            rest = self._cover(needed & ~self._planet_resources[planet_index], limit - 1)
+            if rest is not None:
+                best = (planet_index,) + rest
+                limit = len(best)
+                if limit == 1:
+                    break
+
+        # Only a cover found without hitting the limit is known to be minimal
+        if best is not None:
+            self._cover_memo[needed] = best
+        return best
@@ -0,0 +1,229 @@
+"""
+Ore refining engine for EVE Production Calculator
+
+Ore is reprocessed in whole portions: every full portion of an ore yields
+its base mineral amounts scaled by the reprocessing efficiency, rounded down
+per mineral, and units left over below a portion are returned unrefined.
+
+The engine builds an ore x mineral yield matrix once from the registry's ore
+data, so refining a whole ore inventory is a single pass over that matrix
+(one NumPy expression when NumPy is installed).
+"""
+import math
+from typing import Dict, List, Any, Iterable, Mapping, Optional, Tuple
+
+from core.module_registry import normalize_name
+from core.utils.debug import debug_print
+from core.utils.optional import load_numpy
+
+# Units of ore reprocessed together when ore.json does not say otherwise
+DEFAULT_PORTION_SIZE = 100
+
+# Absorbs float error so an exact yield such as 0.5 x 400 is not floored to 199
+_FLOOR_EPSILON = 1e-9
+
+def calculate_reprocessing_yield(base_yield: float = 50.0,
+                                 reprocessing_level: int = 0,
+                                 efficiency_level: int = 0,
+                                 ore_skill_level: int = 0,
+                                 implant_bonus: float = 0.0) -> float:
+    """
+    Calculate the reprocessing efficiency of a refining setup
+
+    Follows the game's formula: the base yield of the facility multiplied by
+    3% per Reprocessing level, 2% per Reprocessing Efficiency level, 2% per
+    level of the ore's processing skill and the implant bonus.
+
+    Args:
+        base_yield: Facility base yield in percent, including rig, security
+            and structure modifiers (50 for an unrigged station)
+        reprocessing_level: Reprocessing skill level (0-5)
+        efficiency_level: Reprocessing Efficiency skill level (0-5)
+        ore_skill_level: Ore processing skill level (0-5)
+        implant_bonus: Reprocessing implant bonus in percent (0, 1, 2 or 4)
+
+    Returns:
+        Reprocessing efficiency as a fraction between 0 and 1
+    """
+    efficiency = (base_yield / 100
+                  * (1 + 0.03 * reprocessing_level)
+                  * (1 + 0.02 * efficiency_level)
+                  * (1 + 0.02 * ore_skill_level)
+                  * (1 + implant_bonus / 100))
+    return max(0.0, min(1.0, efficiency))
+
+class RefiningEngine:
+    """
+    Refines ore inventories using an ore x mineral yield matrix
+
+    Rows are ores in ore.json order and columns are minerals in order of first
+    appearance. The matrix holds the base yield of one portion.
+    """
+
+    def __init__(self, ores: Iterable[Mapping[str, Any]]):
+        """
+        Build the yield matrix
+
+        Args:
+            ores: Ore data dictionaries with display_name, yields and optional
+                portion_size, volume (m3 per unit) and security_level
+        """
+        self.ore_names: List[str] = []
+        self.security_levels: List[Optional[str]] = []
+        self.portion_sizes: List[int] = []
+        self.volumes: List[Optional[float]] = []
+        self.minerals: List[str] = []
+        self.ore_rows: Dict[str, int] = {}
+        self.mineral_columns: Dict[str, int] = {}
+        self._normalized_rows: Dict[str, int] = {}
+        yields = []
+
+        for ore in ores:
+            display_name = ore.get('display_name')
+            if not display_name or display_name in self.ore_rows:
+                continue
+            row = len(self.ore_names)
+            self.ore_names.append(display_name)
+            self.security_levels.append(ore.get('security_level'))
+            self.portion_sizes.append(int(ore.get('portion_size') or DEFAULT_PORTION_SIZE))
+            self.volumes.append(float(ore['volume']) if ore.get('volume') else None)
+            self.ore_rows[display_name] = row
+            self._normalized_rows[normalize_name(display_name)] = row
+
+            ore_yields = {}
+            for mineral, amount in ore.get('yields', {}).items():
+                ore_yields[self.mineral_columns.setdefault(mineral, len(self.mineral_columns))] = amount
+            yields.append(ore_yields)
+
+        self.minerals = list(self.mineral_columns)
+        self.source = None  # Registry ore data the engine was built from
+
+        # Dense rows, one entry per mineral
+        self.yield_matrix: List[List[int]] = [
+            [ore_yields.get(column, 0) for column in range(len(self.minerals))] for ore_yields in yields
+        ]
+        self._numpy_matrix = None
+        self._numpy_portions = None
+
+    @classmethod
+    def from_registry(cls, registry) -> 'RefiningEngine':
+        """
+        Build an engine from the ores registered in a module registry
+
+        Args:
+            registry: ModuleRegistry with ore data loaded
+
+        Returns:
+            A new RefiningEngine
+        """
+        engine = cls(registry.get_all_ores())
+        engine.source = registry.ores
+        debug_print(f"Built refining yield matrix: {len(engine.ore_names)} ores x {len(engine.minerals)} minerals")
+        return engine
+
+    def find_ore(self, ore_name: str) -> Optional[int]:
+        """
+        Get the matrix row of an ore
+
+        Args:
+            ore_name: Display name of the ore, matched exactly or after normalization
+
+        Returns:
+            Row index, or None if the ore is unknown
+        """
+        row = self.ore_rows.get(ore_name)
+        if row is None:
+            row = self._normalized_rows.get(normalize_name(ore_name))
+        return row
+
+    def get_portion_yield(self, ore_name: str) -> Dict[str, int]:
+        """
+        Get the base minerals one portion of an ore yields at full efficiency
+
+        Args:
+            ore_name: Display name of the ore
+
+        Returns:
+            Dictionary of minerals and quantities, empty if the ore is unknown
+        """
+        row = self.find_ore(ore_name)
+        if row is None:
+            return {}
+        return {mineral: amount for mineral, amount in zip(self.minerals, self.yield_matrix[row]) if amount}
+
+    def refine(self, inventory: Mapping[str, int], efficiency: float,
+               ore_modifiers: Optional[Mapping[str, float]] = None) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Refine a whole ore inventory in one pass
+
+        Args:
+            inventory: Dictionary of ore display name -> units of ore
+            efficiency: Reprocessing efficiency as a fraction (see calculate_reprocessing_yield)
+            ore_modifiers: Optional extra bonus per ore as a fraction, for example
+                0.1 for an ore processing skill at level 5 that only applies to
+                some ores
+
+        Returns:
+            Tuple of (minerals produced, units of ore left over below a portion)
+        """
+        rows = []
+        quantities = []
+        for ore_name, quantity in inventory.items():
+            row = self.find_ore(ore_name)
+            if row is None:
+                debug_print(f"Refining: unknown ore '{ore_name}' skipped")
+                continue
+            if quantity > 0:
+                rows.append(row)
+                quantities.append(int(quantity))
+
+        ore_factors = []
+        for row in rows:
+            modifier = 0.0
+            if ore_modifiers:
+                modifier = ore_modifiers.get(self.ore_names[row], 0.0)
+            ore_factors.append(max(0.0, min(1.0, efficiency * (1 + modifier))))
+
+        np = load_numpy()
+        if np is None or not rows:
+            return self._refine_python(rows, quantities, ore_factors)
+
+        if self._numpy_matrix is None:
+            self._numpy_matrix = np.array(self.yield_matrix, dtype=np.float64).reshape(len(self.ore_names), len(self.minerals))
+            self._numpy_portions = np.array(self.portion_sizes, dtype=np.int64)
+
+        row_index = np.array(rows, dtype=np.intp)
+        units = np.array(quantities, dtype=np.int64)
+        portion_sizes = self._numpy_portions[row_index]
+        portions = units // portion_sizes
+        leftover = units - portions * portion_sizes
+
+        # Each ore stack is rounded down per mineral, like the game does
+        scaled = (portions * np.array(ore_factors))[:, None] * self._numpy_matrix[row_index]
+        totals = np.floor(scaled + _FLOOR_EPSILON).astype(np.int64).sum(axis=0)
+
+        minerals = {mineral: int(totals[column]) for mineral, column in self.mineral_columns.items() if totals[column]}
+        leftovers = {}
+        for row, units_left in zip(rows, leftover.tolist()):
+            if units_left:
+                name = self.ore_names[row]
+                leftovers[name] = leftovers.get(name, 0) + units_left
+        return minerals, leftovers
+
+    def _refine_python(self, rows: List[int], quantities: List[int],
+                       ore_factors: List[float]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Refine without NumPy; same rounding as the vectorized path"""
+        totals = [0] * len(self.minerals)
+        leftovers = {}
+        for row, units, factor in zip(rows, quantities, ore_factors):
+            portion_size = self.portion_sizes[row]
+            portions = units // portion_size
+            if units - portions * portion_size:
+                name = self.ore_names[row]
+                leftovers[name] = leftovers.get(name, 0) + units - portions * portion_size
+            for column, amount in enumerate(self.yield_matrix[row]):
+                if amount:
+                    totals[column] += math.floor(portions * factor * amount + _FLOOR_EPSILON)
+
+        minerals = {mineral: totals[column] for mineral, column in self.mineral_columns.items() if totals[column]}
+        return minerals, leftovers
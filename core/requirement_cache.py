@@ -0,0 +1,131 @@
+"""
+Requirement cache for EVE Production Calculator
+
+This module provides the LRU cache the calculator keeps its computed
+requirement dictionaries in
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set, Tuple, Hashable
+
+class RequirementCache:
+    """
+    Least-recently-used cache of calculated requirements
+
+    Keys are (category, name, me_level, te_level, quantity, variant) tuples,
+    where variant distinguishes the kind of calculation (direct, per-job,
+    fully expanded). Entries are also indexed by (category, name) so that a
+    blueprint change evicts exactly the entries computed for that item.
+
+    Calculations run on a worker thread while blueprint edits invalidate
+    entries from the GUI thread, so every operation holds a lock.
+    """
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_size: Maximum number of entries kept before the least recently used is evicted
+        """
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._entries: OrderedDict = OrderedDict()
+        self._keys_by_item: Dict[Tuple[str, str], Set[Tuple]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """
+        Look up a cached result and mark it as recently used
+
+        Args:
+            key: Cache key tuple starting with (category, name)
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple, value: Any):
+        """
+        Store a result, evicting the least recently used entry when full
+
+        Args:
+            key: Cache key tuple starting with (category, name)
+            value: The value to cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = value
+            self._keys_by_item.setdefault(key[:2], set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                old_key, _ = self._entries.popitem(last=False)
+                self._forget_key(old_key)
+                self.evictions += 1
+
+    def invalidate(self, category: str, name: str) -> int:
+        """
+        Evict every entry calculated for one item
+
+        Args:
+            category: Registry collection of the item
+            name: Registry name of the item
+
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock:
+            keys = self._keys_by_item.pop((category, name), ())
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Evict every entry, keeping the hit/miss counters"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_item.clear()
+
+    def get_stats(self) -> Dict[str, Hashable]:
+        """
+        Get cache effectiveness counters
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, size, evictions and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _forget_key(self, key: Tuple):
+        """Remove a key from the per-item index; the caller holds the lock"""
+        keys = self._keys_by_item.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_item[key[:2]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,222 @@
+"""
+Manufacturing job scheduler for EVE Production Calculator
+
+Lays the jobs of an expanded build order out over a fixed number of
+manufacturing slots. Every intermediate component and every ordered hull is
+one or more jobs, and a job can only start once every job building one of its
+inputs has finished.
+
+Scheduling is list scheduling with critical-path priority: whenever a slot is
+free, it takes the ready job with the longest remaining path to the end of the
+build (its own duration plus the longest chain of products still waiting on
+it). Jobs are held in heaps, so a schedule of n jobs takes O(n log n) time.
+"""
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from core.utils.debug import debug_print
+
+# Absorbs float error in expanded quantities before they are rounded up to whole runs
+_RUNS_EPSILON = 1e-9
+
+class ScheduledJob:
+    """One manufacturing job placed on a slot"""
+    __slots__ = ('category', 'name', 'display_name', 'runs', 'duration', 'slot', 'start', 'end')
+
+    def __init__(self, category: str, name: str, display_name: str, runs: int, duration: int):
+        self.category = category
+        self.name = name
+        self.display_name = display_name
+        self.runs = runs
+        self.duration = duration
+        self.slot = -1
+        self.start = 0
+        self.end = 0
+
+class Schedule:
+    """Jobs of a build order laid out over manufacturing slots"""
+    __slots__ = ('slots', 'jobs', 'makespan', 'slot_busy', 'critical_path', 'critical_path_time', 'unknown')
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.jobs: List[ScheduledJob] = []  # In start order
+        self.makespan = 0  # Wall-clock seconds from the first job starting to the last one ending
+        self.slot_busy: List[int] = [0] * slots  # Slot index -> seconds spent running jobs
+        self.critical_path: List[str] = []  # Display names, first built first
+        self.critical_path_time = 0  # Seconds of the critical path with unlimited slots
+        self.unknown: List[str] = []  # Items without a build time, scheduled as taking no time
+
+    @property
+    def total_work(self) -> int:
+        """Seconds of manufacturing over all jobs"""
+        return sum(self.slot_busy)
+
+    @property
+    def utilization(self) -> List[float]:
+        """Fraction of the makespan each slot spends running jobs"""
+        if not self.makespan:
+            return [0.0] * self.slots
+        return [busy / self.makespan for busy in self.slot_busy]
+
+    @property
+    def lower_bound(self) -> int:
+        """No schedule can be shorter than this: the critical path or the work spread over every slot"""
+        return max(self.critical_path_time, math.ceil(self.total_work / self.slots) if self.slots else 0)
+
+class ProductionScheduler:
+    """Schedules expanded build orders over a compiled MaterialGraph"""
+
+    def __init__(self, graph, job_duration: Callable[[str, str, int], Optional[int]]):
+        """
+        Create a scheduler
+
+        Args:
+            graph: Compiled MaterialGraph of the registry
+            job_duration: Function taking (category, name, runs) and returning the
+                job duration in seconds, or None if the build time is unknown
+        """
+        self.graph = graph
+        self.job_duration = job_duration
+
+    def schedule(self, totals: Dict[int, Union[int, float]], slots: int,
+                 runs_per_job: Optional[int] = None) -> Schedule:
+        """
+        Schedule every build of an expanded order
+
+        Args:
+            totals: Node ID -> total quantity, as returned by MaterialGraph.expand;
+                raw materials are ignored
+            slots: Number of manufacturing slots, at least 1
+            runs_per_job: Runs per manufacturing job, or None for one job per item
+
+        Returns:
+            The Schedule
+        """
+        graph = self.graph
+        slots = max(1, int(slots))
+        schedule = Schedule(slots)
+
+        # Items to build, products before their inputs
+        items = [node_id for node_id in graph.topo_order
+                 if totals.get(node_id, 0) > 0 and graph.has_recipe(node_id)]
+        index_of = {node_id: index for index, node_id in enumerate(items)}
+
+        # Split every item into jobs
+        item_jobs: List[List[ScheduledJob]] = []
+        for node_id in items:
+            category, name = graph.items[node_id]
+            runs = math.ceil(totals[node_id] - _RUNS_EPSILON)
+            job_runs = [runs]
+            if runs_per_job and runs_per_job < runs:
+                full_jobs, remainder = divmod(runs, runs_per_job)
+                job_runs = [runs_per_job] * full_jobs + ([remainder] if remainder else [])
+
+            jobs = []
+            for count in job_runs:
+                duration = self.job_duration(category, name, count)
+                if duration is None:
+                    duration = 0
+                    if not schedule.unknown or schedule.unknown[-1] != graph.names[node_id]:
+                        schedule.unknown.append(graph.names[node_id])
+                jobs.append(ScheduledJob(category, name, graph.names[node_id], count, duration))
+            item_jobs.append(jobs)
+
+        # Item-level dependencies: every job of a product waits for every job of its inputs
+        users: List[List[int]] = [[] for _ in items]
+        waiting = [0] * len(items)
+        for index, node_id in enumerate(items):
+            item_inputs, _ = graph.get_inputs(node_id)
+            for input_index in {index_of[child] for child in item_inputs if child in index_of}:
+                users[input_index].append(index)
+                waiting[index] += 1
+
+        # Longest chain after an item finishes; products come first, so their tails are final when reached
+        after = [0] * len(items)
+        tail = [0] * len(items)
+        next_on_path: List[Optional[int]] = [None] * len(items)
+        for index in range(len(items)):
+            for user in users[index]:
+                if next_on_path[index] is None or tail[user] > after[index]:
+                    after[index] = tail[user]
+                    next_on_path[index] = user
+            tail[index] = max(job.duration for job in item_jobs[index]) + after[index]
+
+        if items:
+            index = max(range(len(items)), key=lambda index: tail[index])
+            schedule.critical_path_time = tail[index]
+            while index is not None:
+                schedule.critical_path.append(graph.names[items[index]])
+                index = next_on_path[index]
+
+        self._place_jobs(schedule, item_jobs, users, waiting, after)
+        debug_print(f"Scheduled {len(schedule.jobs)} jobs on {slots} slot(s): makespan {schedule.makespan} s, "
+                    f"lower bound {schedule.lower_bound} s")
+        return schedule
+
+    @staticmethod
+    def _place_jobs(schedule: Schedule, item_jobs: List[List[ScheduledJob]], users: List[List[int]],
+                    waiting: List[int], after: List[int]):
+        """
+        Run the list scheduling simulation
+
+        Args:
+            schedule: Schedule to fill in
+            item_jobs: Item index -> its jobs
+            users: Item index -> indexes of the items that use it
+            waiting: Item index -> number of input items not finished yet; consumed
+            after: Item index -> longest chain of products after the item
+        """
+        ready: List[Tuple[int, int, ScheduledJob, int]] = []  # (-priority, sequence, job, item index)
+        sequence = 0
+
+        def release(index: int):
+            nonlocal sequence
+            for job in item_jobs[index]:
+                heapq.heappush(ready, (-(job.duration + after[index]), sequence, job, index))
+                sequence += 1
+
+        for index, count in enumerate(waiting):
+            if not count:
+                release(index)
+
+        remaining = [len(jobs) for jobs in item_jobs]
+        free_slots = [(0, slot) for slot in range(schedule.slots)]  # (free from, slot index)
+        running: List[Tuple[int, int, int]] = []  # (end, sequence, item index)
+        now = 0
+        unplaced = sum(remaining)
+
+        while unplaced:
+            # Finished jobs release the items waiting on them
+            while running and running[0][0] <= now:
+                _, _, index = heapq.heappop(running)
+                remaining[index] -= 1
+                if not remaining[index]:
+                    for user in users[index]:
+                        waiting[user] -= 1
+                        if not waiting[user]:
+                            release(user)
+
+            if ready and free_slots[0][0] <= now:
+                _, _, job, index = heapq.heappop(ready)
+                _, slot = heapq.heappop(free_slots)
+                job.slot, job.start, job.end = slot, now, now + job.duration
+                schedule.jobs.append(job)
+                schedule.slot_busy[slot] += job.duration
+                heapq.heappush(free_slots, (job.end, slot))
+                heapq.heappush(running, (job.end, sequence, index))
+                sequence += 1
+                unplaced -= 1
+                continue
+
+            # Wait for a slot to free up, or for a job to finish if nothing is ready
+            if ready:
+                now = free_slots[0][0]
+            elif running:
+                now = running[0][0]
+            else:
+                # Only reachable if the dependencies were cyclic
+                debug_print(f"Scheduler: {unplaced} job(s) never became ready")
+                break
+
+        schedule.makespan = max((job.end for job in schedule.jobs), default=0)
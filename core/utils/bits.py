@@ -0,0 +1,13 @@
+"""
+Bitmap utilities for EVE Production Tracker
+
+Sets of small integer IDs are kept as Python ints used as bitmaps, so
+unions and intersections are single bitwise operations.
+"""
+
+def iter_bits(bitmap: int):
+    """Yield the positions of the set bits of a bitmap, lowest first"""
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
@@ -8,15 +8,20 @@ via command line arguments.
 # Global debug flag - default to False (off)
 DEBUG_MODE = False
 
-def set_debug_mode(enabled=False):
+# Stream debug output is written to - None means stdout
+DEBUG_STREAM = None
+
+def set_debug_mode(enabled=False, stream=None):
     """
     Set the global debug mode
     
     Args:
         enabled: Boolean to enable/disable debug mode
+        stream: File object to write debug output to (default: stdout)
     """
-    global DEBUG_MODE
+    global DEBUG_MODE, DEBUG_STREAM
     DEBUG_MODE = enabled
+    DEBUG_STREAM = stream
     
     if enabled:
         debug_print("Debug mode enabled")
@@ -30,4 +35,5 @@ def debug_print(*args, **kwargs):
         **kwargs: Keyword arguments to pass to print()
     """
     if DEBUG_MODE:
+        kwargs.setdefault('file', DEBUG_STREAM)
         print(*args, **kwargs)
@@ -0,0 +1,90 @@
+"""
+Memory reporting utilities for EVE Production Tracker
+
+This module measures how much memory the loaded registry holds, per category
+and per item, so changes to the data models can be compared.
+"""
+import gc
+import sys
+import types
+import tracemalloc
+
+# Shared objects that are never counted towards an item
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+
+def deep_sizeof(roots, seen=None):
+    """
+    Get the combined size of objects and everything they reference
+
+    Every object is counted once, so data shared between items (interned
+    strings, shared requirement maps) only adds to the total the first time.
+
+    Args:
+        roots: Iterable of objects to measure
+        seen: Optional set of object IDs already counted
+
+    Returns:
+        Total size in bytes
+    """
+    seen = set() if seen is None else seen
+    pending = list(roots)
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES) or obj is None:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return total
+
+def registry_memory_report(registry):
+    """
+    Measure the memory held by each registry category
+
+    Args:
+        registry: The loaded ModuleRegistry
+
+    Returns:
+        List of dictionaries with category, items, bytes and bytes_per_item
+    """
+    report = []
+    for category in ('ships', 'capital_ships', 'components', 'capital_components', 'pi_materials'):
+        modules = list(getattr(registry, category).values())
+        size = deep_sizeof(modules)
+        report.append({
+            'category': category,
+            'items': len(modules),
+            'bytes': size,
+            'bytes_per_item': round(size / len(modules)) if modules else 0
+        })
+
+    items = sum(row['items'] for row in report)
+    size = sum(row['bytes'] for row in report)
+    report.append({
+        'category': 'total',
+        'items': items,
+        'bytes': size,
+        'bytes_per_item': round(size / items) if items else 0
+    })
+    return report
+
+def measure_load(load_function):
+    """
+    Measure the memory still allocated after running a load function
+
+    Args:
+        load_function: Function without arguments that returns the loaded object
+
+    Returns:
+        Tuple of (loaded object, bytes still allocated, peak bytes during the load)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load_function()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
@@ -0,0 +1,25 @@
+"""
+Optional dependency utilities for EVE Production Tracker
+
+Optional packages are imported on first use, so modules that can work
+without them neither pay their import time nor fail when they are missing.
+"""
+
+# NumPy module once imported, False if it is not installed, None before the first attempt
+_numpy = None
+
+def load_numpy():
+    """
+    Import NumPy on first use
+    
+    Returns:
+        The numpy module, or None if it is not installed (callers fall back to pure Python)
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
@@ -0,0 +1,61 @@
+"""
+Startup timing for EVE Production Tracker
+
+This module records how long each startup phase takes and which modules each
+phase imports, in the spirit of ``python -X importtime`` but grouped by phase.
+"""
+import sys
+import time
+
+# Modules that are meant to load on demand, reported as deferred if still unimported
+DEFERRED_MODULES = (
+    'core.gui.blueprints_gui',
+    'core.gui.blueprint_utils',
+    'core.gui.settings_gui',
+    'core.gui.dialogs',
+    'tkinter.filedialog',
+)
+
+class StartupTimer:
+    """Collects per-phase startup timings and module imports"""
+    def __init__(self):
+        """Start timing from now"""
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.known_modules = set(sys.modules)
+        self.initial_module_count = len(self.known_modules)
+        self.phases = []
+
+    def mark(self, phase):
+        """
+        Close the current startup phase
+
+        Args:
+            phase: Name of the phase that just finished
+        """
+        now = time.perf_counter()
+        new_modules = sorted(set(sys.modules) - self.known_modules)
+        self.known_modules.update(new_modules)
+        self.phases.append((phase, now - self.last, now - self.start, new_modules))
+        self.last = now
+
+    def report(self, stream=None):
+        """
+        Write the startup report
+
+        Args:
+            stream: File object to write to (default: stderr)
+        """
+        stream = stream or sys.stderr
+        print("startup: phase                   |  self [ms] | cumulative [ms] | new modules", file=stream)
+        for phase, elapsed, cumulative, new_modules in self.phases:
+            print(f"startup: {phase:<24}| {elapsed * 1000:10.1f} | {cumulative * 1000:15.1f} | {len(new_modules)}",
+                  file=stream)
+            # Project modules individually, everything else by top-level package
+            shown = [name for name in new_modules if name.startswith('core.') or '.' not in name]
+            for name in shown:
+                print(f"startup:   {name}", file=stream)
+
+        deferred = [name for name in DEFERRED_MODULES if name not in sys.modules]
+        print(f"startup: {len(sys.modules) - self.initial_module_count} modules imported, "
+              f"deferred until first use: {', '.join(deferred) if deferred else 'none'}", file=stream)
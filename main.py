@@ -7,20 +7,18 @@ A tool for calculating resource requirements for manufacturing in EVE Online
 import os
 import sys
 import argparse
-import tkinter as tk
-from tkinter import ttk, messagebox
 
-from core.module_registry import ModuleRegistry
-from core.data_loaders import load_ships, load_components, load_pi_data, load_ore_data
-from core.calculator import RequirementsCalculator
-from core.config.blueprint_config import load_blueprint_ownership, apply_blueprint_ownership
-from core.gui.gui import EveProductionCalculator
 from core.utils.debug import set_debug_mode, debug_print
+from core.utils.startup import StartupTimer
 
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="EVE Online Production Calculator")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--headless", nargs=argparse.REMAINDER, metavar="COMMAND",
+                        help="Run a command without the GUI (see --headless --help)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print per-phase startup timings and imported modules to stderr")
     return parser.parse_args()
 
 def main():
@@ -30,27 +28,41 @@ def main():
     # Parse command line arguments
     args = parse_arguments()
     
-    # Set debug mode if --debug flag is present
-    set_debug_mode(args.debug)
-    
     # Get base path for application
-    base_path = os.path.dirname(__file__)
+    base_path = os.path.dirname(os.path.abspath(__file__))
     
-    # Create module registry
-    module_registry = ModuleRegistry()
+    # Headless mode never imports tkinter or any GUI module
+    if args.headless is not None:
+        from core.cli import run_headless
+        
+        headless_args = args.headless
+        if args.debug and '--debug' not in headless_args:
+            headless_args = ['--debug'] + headless_args
+        sys.exit(run_headless(headless_args, base_path))
     
-    # Load data into registry
-    load_ships(module_registry, base_path)
-    load_components(module_registry, base_path)
-    load_pi_data(module_registry, base_path)
+    startup_timer = StartupTimer()
+    
+    from core.data_loaders import load_registry
+    from core.calculator import RequirementsCalculator
+    from core.config.blueprint_config import load_blueprint_ownership, apply_blueprint_ownership
+    from core.config.blueprint_config import set_save_delay, set_blueprint_backend
+    from core.config.settings import load_settings
+    startup_timer.mark("core imports")
+    
+    # Set debug mode if --debug flag is present
+    set_debug_mode(args.debug)
+    
+    # Load data into registry and compile the production graph
+    settings = load_settings(base_path)
+    module_registry = load_registry(base_path, backend=settings.get('registry_backend', 'objects'))
+    startup_timer.mark("data loading")
     
     # Create calculator
     calculator = RequirementsCalculator(module_registry)
     
-    # Load ore data
-    load_ore_data(module_registry, base_path)
-    
     # Load blueprint ownership data
+    set_save_delay(settings.get('config_save_delay_ms', 500) / 1000)
+    set_blueprint_backend(settings.get('blueprint_backend', 'json'), base_path)
     blueprint_config = load_blueprint_ownership()
     debug_print(f"Blueprint configuration loaded. Categories: {', '.join(blueprint_config.keys())}")
     
@@ -59,7 +71,7 @@ def main():
     apply_blueprint_ownership(blueprint_config, module_registry)
     
     # Check if any ships are owned
-    owned_ships = [ship.name for ship in module_registry.get_all_ships() if ship.owned_status]
+    owned_ships = [ship.name for ship in module_registry.get_ships_by_filter(owned_only=True)]
     if owned_ships:
         debug_print(f"After applying ownership, found {len(owned_ships)} owned ships: {', '.join(owned_ships)}")
     else:
@@ -67,6 +79,11 @@ def main():
     
     # Set blueprint config in calculator
     calculator.set_blueprint_config(blueprint_config)
+    startup_timer.mark("blueprint config")
+    
+    # The GUI (and tkinter) is only imported once the data is ready
+    from core.gui.gui import EveProductionCalculator
+    startup_timer.mark("gui imports")
     
     # Create and run GUI
     app = EveProductionCalculator(
@@ -74,6 +91,13 @@ def main():
         calculator=calculator,
         blueprint_config=blueprint_config
     )
+    startup_timer.mark("window creation")
+    
+    if args.startup_report:
+        def report_startup():
+            startup_timer.mark("first idle")
+            startup_timer.report()
+        app.after_idle(report_startup)
     
     # Start the main event loop
     app.mainloop()
@@ -0,0 +1,3 @@
+"""
+Tests for EVE Production Calculator
+"""
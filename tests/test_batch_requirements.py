@@ -0,0 +1,70 @@
+"""
+Tests for RequirementsCalculator.calculate_batch_requirements
+"""
+import random
+
+import pytest
+
+import core.calculator as calculator_module
+from core.calculator import RequirementsCalculator
+from core.models import ComponentModule, ShipModule
+from core.module_registry import ModuleRegistry
+
+def build_calculator():
+    """Calculator over two components and a ship, all at ME 10"""
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 100, 'Pyerite': 33, 'Morphite': 1}, ''))
+    registry.register_component(ComponentModule('gadget', 'Gadget', {'Tritanium': 7, 'Isogen': 250}, ''))
+    registry.register_ship(ShipModule('rifter', 'Rifter', {'Widget': 3, 'Tritanium': 2501}, '', 'Minmatar', 'Frigate'))
+    calculator = RequirementsCalculator(registry)
+    calculator.set_blueprint_config({
+        'components': {'widget': {'me': 10}, 'gadget': {'me': 10}},
+        'ship_blueprints': {'rifter': {'me': 10}}
+    })
+    return calculator
+
+@pytest.fixture
+def scalar_only(monkeypatch):
+    """Force the pure Python batch path"""
+    monkeypatch.setattr(calculator_module, 'load_numpy', lambda: None)
+
+def test_per_unit_rounding(scalar_only):
+    # 33 * 0.9 = 29.7 rounds to 30 per unit
+    assert build_calculator().calculate_batch_requirements([('Widget', 10, None)]) == {
+        'Tritanium': 900, 'Pyerite': 300, 'Morphite': 10}
+
+def test_per_job_rounding(scalar_only):
+    calculator = build_calculator()
+    # One job: 33 * 10 * 0.9 = 297, and Morphite never drops below one per run
+    assert calculator.calculate_batch_requirements([('Widget', 10, None)], per_job=True) == {
+        'Tritanium': 900, 'Pyerite': 297, 'Morphite': 10}
+    # Jobs of 3, 3, 3 and 1 runs: Pyerite 3 * ceil(89.1) + ceil(29.7)
+    assert calculator.calculate_batch_requirements([('Widget', 10, None)], per_job=True, runs_per_job=3) == {
+        'Tritanium': 900, 'Pyerite': 300, 'Morphite': 10}
+
+def test_per_job_matches_job_requirements(scalar_only):
+    calculator = build_calculator()
+    batch = calculator.calculate_batch_requirements([('rifter', 7, None), ('Gadget', 12, 4)], per_job=True,
+                                                    runs_per_job=5, structure_bonus=1, rig_bonus=2.4)
+    rifter = calculator.calculate_job_requirements('ships', 'rifter', 7, 5, 1, 2.4)
+    calculator.blueprint_config['components']['gadget']['me'] = 4
+    calculator.clear_expansion_cache()
+    gadget = calculator.calculate_job_requirements('components', 'gadget', 12, 5, 1, 2.4)
+    assert batch == calculator.aggregate_requirements([rifter, gadget])
+
+@pytest.mark.parametrize('per_job', [False, True])
+def test_numpy_path_matches_scalar_path(monkeypatch, per_job):
+    pytest.importorskip('numpy')
+    calculator = build_calculator()
+    generator = random.Random(3)
+    for _ in range(25):
+        orders = [(generator.choice(['Widget', 'gadget', 'Rifter']), generator.randint(1, 5000),
+                   generator.choice([None, 0, 3, 7, 10])) for _ in range(20)]
+        options = {'runs_per_job': generator.choice([None, 1, 9, 100]),
+                   'structure_bonus': generator.choice([0, 1]), 'rig_bonus': generator.choice([0, 2.4, 4.2])}
+
+        vectorized = calculator.calculate_batch_requirements(orders, per_job=per_job, **options)
+        with monkeypatch.context() as patch:
+            patch.setattr(calculator_module, 'load_numpy', lambda: None)
+            scalar = calculator.calculate_batch_requirements(orders, per_job=per_job, **options)
+        assert vectorized == scalar
@@ -0,0 +1,68 @@
+"""
+Tests for the blueprint configuration journal, its replay and compaction
+"""
+import json
+import os
+
+import pytest
+
+import core.config.blueprint_config as blueprint_config
+
+@pytest.fixture
+def config_files(tmp_path, monkeypatch):
+    """Point the snapshot and the journal at a temporary directory"""
+    config_file = tmp_path / 'blueprint_ownership.json'
+    journal_file = tmp_path / 'blueprint_ownership.journal'
+    monkeypatch.setattr(blueprint_config, 'CONFIG_FILE', str(config_file))
+    monkeypatch.setattr(blueprint_config, 'JOURNAL_FILE', str(journal_file))
+    return config_file, journal_file
+
+def write_snapshot(path, config):
+    path.write_text(json.dumps(config), encoding='utf-8')
+
+def test_journal_replays_over_the_snapshot(config_files):
+    config_file, _ = config_files
+    write_snapshot(config_file, {'components': {'widget': {'owned': False, 'invented': False, 'me': 2, 'te': 0}}})
+    assert blueprint_config.append_blueprint_journal([('components', 'widget', 'me', 5),
+                                                      ('components', 'gadget', 'owned', True)])
+    assert blueprint_config.append_blueprint_journal([('components', 'widget', 'me', 9)])
+
+    config = json.loads(config_file.read_text(encoding='utf-8'))
+    assert blueprint_config.replay_blueprint_journal(config) == 3
+    assert config['components']['widget']['me'] == 9
+    # A blueprint first seen in the journal gets the default settings
+    assert config['components']['gadget'] == {'owned': True, 'invented': False, 'me': 0, 'te': 0}
+
+def test_torn_last_line_is_skipped(config_files):
+    _, journal_file = config_files
+    assert blueprint_config.append_blueprint_journal([('components', 'widget', 'me', 5)])
+    with open(journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"category": "components", "blueprint": "widget", "attri')
+
+    config = {}
+    assert blueprint_config.replay_blueprint_journal(config) == 1
+    assert config['components']['widget']['me'] == 5
+
+def test_compaction_folds_the_journal_into_the_snapshot(config_files):
+    config_file, journal_file = config_files
+    write_snapshot(config_file, {'schema_version': 1, 'components': {}})
+    assert blueprint_config.append_blueprint_journal([('components', 'widget', 'te', 4)])
+
+    assert blueprint_config.compact_blueprint_journal()
+    assert journal_file.read_text(encoding='utf-8') == ''
+    snapshot = json.loads(config_file.read_text(encoding='utf-8'))
+    assert snapshot['components']['widget']['te'] == 4
+    assert snapshot['schema_version'] == 1
+    assert not os.path.exists(str(journal_file) + '.tmp')
+
+def test_unreadable_snapshot_is_never_overwritten(config_files):
+    config_file, journal_file = config_files
+    config_file.write_text('{"components": {"widget": ', encoding='utf-8')
+    assert blueprint_config.append_blueprint_journal([('components', 'widget', 'me', 5)])
+    journal = journal_file.read_text(encoding='utf-8')
+
+    assert not blueprint_config.compact_blueprint_journal()
+    assert not blueprint_config.save_blueprint_ownership({'components': {'widget': {'me': 1}}})
+    # Both files are left for the user to recover
+    assert config_file.read_text(encoding='utf-8') == '{"components": {"widget": '
+    assert journal_file.read_text(encoding='utf-8') == journal
@@ -0,0 +1,40 @@
+"""
+Tests for the recursive bill-of-materials expansion of RequirementsCalculator
+"""
+from core.calculator import RequirementsCalculator
+from core.models import ComponentModule, ShipModule
+from core.module_registry import ModuleRegistry
+
+def build_calculator():
+    """Calculator for a ship built from gizmos, which are built from widgets"""
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 10, 'Pyerite': 3}, ''))
+    registry.register_component(ComponentModule('gizmo', 'Gizmo', {'Widget': 2, 'Pyerite': 5}, ''))
+    registry.register_ship(ShipModule('rifter', 'Rifter', {'Gizmo': 4, 'widget': 1, 'Tritanium': 100}, '',
+                                      'Minmatar', 'Frigate'))
+    calculator = RequirementsCalculator(registry)
+    calculator.set_blueprint_config({'components': {'widget': {'me': 10}}})
+    return calculator
+
+def test_expand_requirements_reaches_raw_materials():
+    calculator = build_calculator()
+    # 3 Rifters need 12 Gizmos and 3 + 24 = 27 Widgets, built in one job each:
+    # Tritanium 300 + ceil(27 * 10 * 0.9) = 543, Pyerite 12 * 5 + ceil(27 * 3 * 0.9) = 133
+    assert calculator.expand_requirements('ships', 'rifter', 3) == {'Tritanium': 543, 'Pyerite': 133}
+
+def test_expand_intermediates():
+    calculator = build_calculator()
+    assert calculator.expand_intermediates('ships', 'rifter', 3) == {'Gizmo': 12, 'Widget': 27}
+
+def test_expand_order_combines_shared_components():
+    calculator = build_calculator()
+    # 13 Gizmos, and the 29 Widgets of both lines are one job:
+    # Tritanium 300 + ceil(261), Pyerite 13 * 5 + ceil(78.3)
+    totals = calculator.expand_order([('ships', 'rifter', 3), ('components', 'gizmo', 1)])
+    assert totals == {'Tritanium': 561, 'Pyerite': 144}
+
+def test_expansion_follows_me_changes():
+    calculator = build_calculator()
+    assert calculator.expand_requirements('components', 'gizmo', 1) == {'Tritanium': 18, 'Pyerite': 11}
+    calculator.set_blueprint_config({})
+    assert calculator.expand_requirements('components', 'gizmo', 1) == {'Tritanium': 20, 'Pyerite': 11}
@@ -0,0 +1,42 @@
+"""
+Tests for the per-job material rounding of RequirementsCalculator
+"""
+from core.calculator import RequirementsCalculator
+from core.models import ComponentModule
+from core.module_registry import ModuleRegistry
+
+def build_calculator(me_level=10):
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 100, 'Pyerite': 33, 'Morphite': 1}, ''))
+    calculator = RequirementsCalculator(registry)
+    calculator.set_blueprint_config({'components': {'widget': {'me': me_level}}})
+    return calculator
+
+def test_single_job():
+    # Pyerite 33 * 10 * 0.9 = 297 where per-unit rounding would give 300;
+    # Morphite 10 * 0.9 = 9 is raised to one per run
+    assert build_calculator().calculate_job_requirements('components', 'widget', 10) == {
+        'Tritanium': 900, 'Pyerite': 297, 'Morphite': 10}
+
+def test_float_noise_is_not_rounded_up():
+    # 100 * 0.9 is 90.00000000000001 in floating point
+    assert build_calculator().calculate_job_requirements('components', 'widget', 1)['Tritanium'] == 90
+
+def test_jobs_with_remainder():
+    # Jobs of 4, 4 and 2 runs: Pyerite 2 * ceil(118.8) + ceil(59.4)
+    assert build_calculator().calculate_job_requirements('components', 'widget', 10, runs_per_job=4) == {
+        'Tritanium': 900, 'Pyerite': 298, 'Morphite': 10}
+    # A job size above the quantity is a single job
+    assert build_calculator().calculate_job_requirements('components', 'widget', 10, runs_per_job=50) == {
+        'Tritanium': 900, 'Pyerite': 297, 'Morphite': 10}
+
+def test_structure_and_rig_bonuses():
+    # 100 * 0.9 * 0.99 * 0.976 = 86.9616 -> 87; 33 * 0.9 * 0.99 * 0.976 = 28.697... -> 29
+    requirements = build_calculator().calculate_job_requirements('components', 'widget', 1,
+                                                                 structure_bonus=1, rig_bonus=2.4)
+    assert requirements == {'Tritanium': 87, 'Pyerite': 29, 'Morphite': 1}
+
+def test_me_is_clamped_and_unknown_items_are_empty():
+    assert build_calculator(me_level=15).calculate_job_requirements('components', 'widget', 1)['Tritanium'] == 90
+    assert build_calculator().calculate_job_requirements('components', 'gadget', 1) == {}
+    assert build_calculator().calculate_job_requirements('components', 'widget', 0) == {}
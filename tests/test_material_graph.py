@@ -0,0 +1,68 @@
+"""
+Tests for MaterialGraph compilation, cycle and dangling material reporting
+"""
+from core.material_graph import MaterialGraph
+from core.models import ComponentModule
+from core.module_registry import ModuleRegistry
+
+def build_registry():
+    """Registry with a two-level chain, a two-item cycle and a self-referencing item"""
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 10, 'Unobtainium': 2}, ''))
+    registry.register_component(ComponentModule('gizmo', 'Gizmo', {'Widget': 2, 'Pyerite': 5}, ''))
+    registry.register_component(ComponentModule('loop_a', 'Loop A', {'Loop B': 1, 'Tritanium': 1}, ''))
+    registry.register_component(ComponentModule('loop_b', 'Loop B', {'loop_a': 1}, ''))
+    registry.register_component(ComponentModule('ouroboros', 'Ouroboros', {'Ouroboros': 1}, ''))
+    return registry
+
+def build_graph():
+    return MaterialGraph.from_registry(build_registry(), raw_materials={'Tritanium', 'Pyerite'})
+
+def test_cycles_are_reported_and_not_expanded():
+    graph = build_graph()
+    assert sorted(sorted(set(cycle)) for cycle in graph.cycles) == [['Loop A', 'Loop B'], ['Ouroboros']]
+    for cycle in graph.cycles:
+        assert cycle[0] == cycle[-1]
+
+    loop_a = graph.get_node_id('components', 'loop_a')
+    assert loop_a in graph.cyclic
+    assert not graph.has_recipe(loop_a)
+    # A cyclic node is left as is instead of being pushed round the loop
+    assert graph.expand({loop_a: 4}) == {loop_a: 4}
+
+def test_dangling_materials():
+    # Unobtainium is neither buildable nor a known raw material
+    assert build_graph().dangling == ['Unobtainium']
+    # Without a raw material list nothing can be called dangling
+    assert MaterialGraph.from_registry(build_registry()).dangling == []
+
+def test_topological_order_puts_products_first():
+    graph = build_graph()
+    position = {node_id: index for index, node_id in enumerate(graph.topo_order)}
+    assert sorted(position) == list(range(graph.node_count))
+    for node_id in range(graph.node_count):
+        if graph.has_recipe(node_id):
+            for child in graph.get_inputs(node_id)[0]:
+                assert position[node_id] < position[child]
+
+def test_expand_totals_every_level():
+    graph = build_graph()
+    gizmo = graph.get_node_id('components', 'gizmo')
+    widget = graph.get_node_id('components', 'widget')
+    totals = graph.expand({gizmo: 3})
+    assert {graph.names[node_id]: amount for node_id, amount in totals.items()} == {
+        'Gizmo': 3, 'Widget': 6, 'Pyerite': 15, 'Tritanium': 60, 'Unobtainium': 12}
+
+    # A custom quantity function sees the combined demand of each node once
+    calls = []
+    def input_quantities(node_id, amount):
+        calls.append((graph.names[node_id], amount))
+        return [quantity * amount for quantity in graph.get_inputs(node_id)[1]]
+    graph.expand({gizmo: 3, widget: 1}, input_quantities)
+    assert sorted(calls) == [('Gizmo', 3), ('Widget', 7)]
+
+def test_dependents():
+    graph = build_graph()
+    tritanium = graph.ids['Tritanium']
+    names = {graph.names[node_id] for node_id in graph.get_dependents(tritanium)}
+    assert names == {'Widget', 'Gizmo', 'Loop A', 'Loop B'}
@@ -0,0 +1,47 @@
+"""
+Tests for the memory-mapped registry backend
+"""
+import pytest
+
+from core.mmap_store import MappedItemStore, MappedModuleRegistry, write_store
+from core.models import ComponentModule, ShipModule
+from core.module_registry import ModuleRegistry
+
+@pytest.fixture
+def mapped_registry(tmp_path):
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 10}, ''))
+    for index, faction in enumerate(['Amarr', 'Caldari', 'Minmatar', 'Minmatar']):
+        registry.register_ship(ShipModule(f'ship_{index}', f'Ship {index}', {'Widget': 2}, '', faction, 'Frigate'))
+    path = str(tmp_path / 'registry_store.bin')
+    assert write_store(registry, path)
+    store = MappedItemStore(path)
+    yield MappedModuleRegistry(store)
+    store.close()
+
+def materialized(registry):
+    return sum(getattr(registry, category).materialized_count for category in registry.INDEXED_CATEGORIES)
+
+def test_ownership_creates_no_models(mapped_registry):
+    assert mapped_registry.set_owned_status('ships', 'ship_1', True)
+    assert mapped_registry.set_owned_status('ships', 'ship_3', "Owned")
+    assert not mapped_registry.set_owned_status('ships', 'ship_9', True)
+    assert materialized(mapped_registry) == 0
+    assert 'owned_bitmaps' not in mapped_registry.__dict__
+
+    # Building the indexes picks the ownership up without any model either
+    assert mapped_registry.get_names_by_filter('ships', owned_only=True) == ['ship_1', 'ship_3']
+    assert mapped_registry.get_names_by_filter('ships', faction='Minmatar', owned_only=True) == ['ship_3']
+    assert materialized(mapped_registry) == 0
+
+    # Models created later carry the ownership
+    assert mapped_registry.ships['ship_1'].owned_status is True
+    assert mapped_registry.ships['ship_0'].owned_status is False
+
+def test_ownership_after_the_indexes_exist(mapped_registry):
+    assert mapped_registry.get_names_by_filter('ships', owned_only=True) == []
+    mapped_registry.set_owned_status('ships', 'ship_2', True)
+    assert [ship.name for ship in mapped_registry.get_ships_by_filter(owned_only=True)] == ['ship_2']
+    mapped_registry.set_owned_status('ships', 'ship_2', False)
+    assert mapped_registry.get_names_by_filter('ships', owned_only=True) == []
+    assert mapped_registry.ships['ship_2'].owned_status is False
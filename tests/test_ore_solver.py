@@ -0,0 +1,64 @@
+"""
+Tests for the ore mix solver: the covering LP and branch and bound
+"""
+import pytest
+
+from core.ore_solver import OreMixSolver, STATUS_NODE_LIMIT, STATUS_OPTIMAL, _solve_covering_lp
+from core.refining import RefiningEngine
+
+def build_solver():
+    """Two single-mineral ores where the cheaper rate per unit rounds badly"""
+    return OreMixSolver(RefiningEngine([
+        {'display_name': 'Arkonor', 'security_level': 'High-sec', 'portion_size': 1, 'volume': 1.0,
+         'yields': {'Tritanium': 10}},
+        {'display_name': 'Dark Ochre', 'security_level': 'Low-sec', 'portion_size': 1, 'volume': 0.8,
+         'yields': {'Tritanium': 7}},
+    ]))
+
+def test_covering_lp():
+    # min x1 + x2 subject to 2 x1 + x2 >= 4 and x1 + 3 x2 >= 6: the optimum is (1.2, 1.6)
+    assert _solve_covering_lp([[2, 1], [1, 3]], [1, 1], [4, 6]) == pytest.approx([1.2, 1.6])
+    # With x1 <= 1 the second ore has to cover the rest: x2 = max(2, 5 / 3)
+    assert _solve_covering_lp([[2, 1], [1, 3]], [1, 1], [4, 6], [1, None]) == pytest.approx([1.0, 2.0])
+    # Bounds that cannot cover the targets
+    assert _solve_covering_lp([[2, 1], [1, 3]], [1, 1], [4, 6], [1, 1]) is None
+
+def test_branch_and_bound_closes_the_rounding_gap():
+    # The relaxation takes 1.5 Arkonor (1.5 m3); rounding it up costs 2 m3,
+    # but one portion of each ore covers the 15 Tritanium for 1.8 m3
+    mix = build_solver().solve({'Tritanium': 15}, 1.0)
+    assert mix.feasible
+    assert mix.portions == {'Arkonor': 1, 'Dark Ochre': 1}
+    assert mix.minerals == {'Tritanium': 17}
+    assert mix.surplus == {'Tritanium': 2}
+    assert mix.cost == pytest.approx(1.8)
+    assert mix.relaxed_cost == pytest.approx(1.5)
+    assert mix.status == STATUS_OPTIMAL
+    assert mix.gap == pytest.approx(0.0, abs=1e-4)
+
+def test_node_limit_is_reported_with_its_gap():
+    # The root relaxation alone only finds the rounded-up mix
+    mix = build_solver().solve({'Tritanium': 15}, 1.0, max_nodes=1)
+    assert mix.nodes == 1
+    assert mix.portions == {'Arkonor': 2}
+    assert mix.status == STATUS_NODE_LIMIT
+    assert mix.bound == pytest.approx(1.5)
+    assert mix.gap == pytest.approx(0.25)
+
+    with pytest.raises(ValueError):
+        build_solver().solve({'Tritanium': 15}, 1.0, max_nodes=0)
+
+def test_units_objective_and_security_filter():
+    solver = build_solver()
+    # Counting units, Arkonor covers more per portion
+    assert solver.solve({'Tritanium': 15}, 1.0, objective='units').portions == {'Arkonor': 2}
+    assert solver.solve({'Tritanium': 15}, 1.0, security_levels=['low sec']).portions == {'Dark Ochre': 3}
+    mix = solver.solve({'Tritanium': 15}, 1.0, security_levels=['Null-sec'])
+    assert not mix.feasible
+    assert mix.missing == ['Tritanium']
+
+def test_efficiency_rounds_down_like_the_game():
+    # 3 portions at 50% give floor(10.5) = 10 Tritanium, one short of 11
+    mix = build_solver().solve({'Tritanium': 11}, 0.5, security_levels=['Low-sec'])
+    assert mix.portions == {'Dark Ochre': 4}
+    assert mix.minerals == {'Tritanium': 14}
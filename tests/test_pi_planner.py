@@ -0,0 +1,63 @@
+"""
+Tests for the planet set cover of PiPlanner
+"""
+import itertools
+import random
+
+from core.pi_chain import PiChain
+from core.pi_planner import PiPlanner
+
+RESOURCE_PLANETS = {
+    'Aqueous Liquids': ('Barren', 'Gas', 'Ice', 'Oceanic', 'Storm', 'Temperate'),
+    'Base Metals': ('Barren', 'Gas', 'Lava', 'Plasma', 'Storm'),
+    'Heavy Metals': ('Ice', 'Lava', 'Plasma'),
+    'Noble Metals': ('Barren', 'Plasma'),
+    'Felsic Magma': ('Lava',),
+    'Microorganisms': ('Barren', 'Ice', 'Oceanic', 'Temperate'),
+    'Planktic Colonies': ('Ice', 'Oceanic'),
+}
+
+def brute_force_cover_size(resource_planets, resources):
+    """Size of the smallest set of planet types offering every resource"""
+    planets = sorted({planet for resource in resources for planet in resource_planets[resource]})
+    for size in range(len(planets) + 1):
+        for combination in itertools.combinations(planets, size):
+            if all(set(resource_planets[resource]) & set(combination) for resource in resources):
+                return size
+    return None
+
+def test_find_planets():
+    planner = PiPlanner(PiChain(), RESOURCE_PLANETS)
+    assert planner.find_planets([]) == ()
+    assert planner.find_planets(['Felsic Magma', 'Heavy Metals']) == ('Lava',)
+    # Lava is forced, and one of Ice or Oceanic covers the rest
+    cover = planner.find_planets(['Felsic Magma', 'Planktic Colonies', 'Aqueous Liquids', 'Microorganisms'])
+    assert len(cover) == 2 and 'Lava' in cover
+    assert planner.find_planets(['Felsic Magma', 'Unknown Ore']) is None
+
+def test_covers_are_minimal_and_memoized():
+    generator = random.Random(11)
+    planets = [f'Planet {index}' for index in range(9)]
+    resource_planets = {f'Resource {index}': tuple(generator.sample(planets, generator.randint(1, 3)))
+                        for index in range(14)}
+    planner = PiPlanner(PiChain(), resource_planets)
+    resources = sorted(resource_planets)
+
+    for _ in range(60):
+        wanted = generator.sample(resources, generator.randint(1, len(resources)))
+        cover = planner.find_planets(wanted)
+        assert all(set(resource_planets[resource]) & set(cover) for resource in wanted)
+        assert len(cover) == brute_force_cover_size(resource_planets, wanted)
+
+    # Every memoized cover, including those of sub-problems cut short by the
+    # limit of a better branch, is a minimum cover of its resource set
+    for needed, cover in planner._cover_memo.items():
+        wanted = [planner.resources[index] for index in range(len(resources)) if needed >> index & 1]
+        assert len(cover) == brute_force_cover_size(resource_planets, wanted)
+
+    # A solved resource set is kept, so a repeated query is a memo lookup
+    wanted = resources[:5]
+    cover = planner.find_planets(wanted)
+    needed = sum(planner._resource_bits[resource] for resource in wanted)
+    assert tuple(planner.planet_types[index] for index in sorted(planner._cover_memo[needed])) == cover
+    assert planner.find_planets(wanted) == cover
@@ -0,0 +1,56 @@
+"""
+Tests for the bitmap filter indexes of ModuleRegistry
+"""
+import itertools
+import random
+
+from core.models import ShipModule
+from core.module_registry import ModuleRegistry, is_owned
+from core.utils.bits import iter_bits
+
+FACTIONS = ['Amarr', 'Caldari', 'Gallente', 'Minmatar']
+SHIP_TYPES = ['Frigate', 'Cruiser', 'Battleship']
+
+def build_registry(seed=7, count=150):
+    """Registry of random ships, some re-registered with new attributes and some owned"""
+    generator = random.Random(seed)
+    registry = ModuleRegistry()
+    for index in range(count):
+        registry.register_ship(ShipModule(f'ship_{index}', f'Ship {index}', {'Tritanium': 1}, '',
+                                          generator.choice(FACTIONS), generator.choice(SHIP_TYPES)))
+    # Replacing a ship must clear its old faction and type bits
+    for index in generator.sample(range(count), 20):
+        registry.register_ship(ShipModule(f'ship_{index}', f'Ship {index}', {'Tritanium': 1}, '',
+                                          generator.choice(FACTIONS), generator.choice(SHIP_TYPES)))
+    for index in generator.sample(range(count), 40):
+        registry.set_owned_status('ships', f'ship_{index}', generator.choice([True, "Owned"]))
+    # Ownership taken away again
+    for index in generator.sample(range(count), 10):
+        registry.set_owned_status('ships', f'ship_{index}', "Unowned")
+    return registry
+
+def linear_scan(registry, faction, ship_type, owned_only):
+    return [ship.name for ship in registry.ships.values()
+            if faction in (None, "All", ship.faction)
+            and ship_type in (None, "All", ship.ship_type)
+            and (not owned_only or is_owned(ship.owned_status))]
+
+def test_iter_bits():
+    assert list(iter_bits(0)) == []
+    assert list(iter_bits(0b101001)) == [0, 3, 5]
+    assert list(iter_bits(1 << 200 | 1 << 64)) == [64, 200]
+
+def test_filters_match_a_linear_scan():
+    registry = build_registry()
+    for faction, ship_type, owned_only in itertools.product([None, "All"] + FACTIONS + ['Jove'],
+                                                            [None] + SHIP_TYPES, [False, True]):
+        expected = linear_scan(registry, faction, ship_type, owned_only)
+        assert [ship.name for ship in registry.get_ships_by_filter(faction, ship_type, owned_only)] == expected
+        assert registry.get_names_by_filter('ships', faction, ship_type, owned_only) == expected
+
+def test_owned_filter_counts():
+    registry = build_registry()
+    owned = registry.get_ships_by_filter(owned_only=True)
+    assert owned and all(is_owned(ship.owned_status) for ship in owned)
+    assert len(owned) == sum(is_owned(ship.owned_status) for ship in registry.ships.values())
+    assert not registry.set_owned_status('ships', 'no_such_ship', True)
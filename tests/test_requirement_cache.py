@@ -0,0 +1,75 @@
+"""
+Tests for the requirement cache and its dependency-aware invalidation
+"""
+from core.calculator import RequirementsCalculator
+from core.models import ComponentModule, ShipModule
+from core.module_registry import ModuleRegistry
+from core.requirement_cache import RequirementCache
+
+def build_calculator():
+    """Calculator where the Rifter uses Gizmos, Gizmos use Widgets and Bolts stand alone"""
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('widget', 'Widget', {'Tritanium': 10}, ''))
+    registry.register_component(ComponentModule('gizmo', 'Gizmo', {'Widget': 2}, ''))
+    registry.register_component(ComponentModule('bolt', 'Bolt', {'Pyerite': 4}, ''))
+    registry.register_ship(ShipModule('rifter', 'Rifter', {'Gizmo': 1, 'Bolt': 1}, '', 'Minmatar', 'Frigate'))
+    calculator = RequirementsCalculator(registry)
+    calculator.set_blueprint_config({'components': {}})
+    return calculator
+
+def test_lru_eviction():
+    cache = RequirementCache(max_size=2)
+    cache.put(('components', 'a', 0, 0, 1, None), {'A': 1})
+    cache.put(('components', 'b', 0, 0, 1, None), {'B': 1})
+    assert cache.get(('components', 'a', 0, 0, 1, None)) == {'A': 1}
+    cache.put(('components', 'c', 0, 0, 1, None), {'C': 1})
+    # b was the least recently used
+    assert cache.get(('components', 'b', 0, 0, 1, None)) is None
+    assert cache.get_stats()['evictions'] == 1
+    # An evicted entry is gone from the per-item index too
+    assert cache.invalidate('components', 'b') == 0
+
+def test_invalidate_removes_every_variant_of_an_item():
+    cache = RequirementCache()
+    cache.put(('components', 'a', 0, 0, 1, 'job'), {'A': 1})
+    cache.put(('components', 'a', 0, 0, 5, 'expanded'), {'A': 5})
+    cache.put(('components', 'b', 0, 0, 1, 'job'), {'B': 1})
+    assert cache.invalidate('components', 'a') == 2
+    assert cache.get_stats()['size'] == 1
+
+def test_blueprint_change_evicts_dependents_only():
+    calculator = build_calculator()
+    assert calculator.expand_requirements('ships', 'rifter', 1) == {'Tritanium': 20, 'Pyerite': 4}
+    for name in ('widget', 'gizmo', 'bolt'):
+        calculator.calculate_job_requirements('components', name, 1)
+    assert calculator.get_cache_stats()['size'] == 4
+
+    # Widget, and the Gizmo and Rifter built from it, are evicted; the Bolt stays
+    calculator.blueprint_config['components']['widget'] = {'me': 10}
+    calculator.on_blueprint_changed('components', 'widget')
+    stats = calculator.get_cache_stats()
+    assert stats['size'] == 1
+    assert stats['invalidations'] == 3
+
+    hits = stats['hits']
+    calculator.calculate_job_requirements('components', 'bolt', 1)
+    assert calculator.get_cache_stats()['hits'] == hits + 1
+    # The new ME reaches the Rifter: ceil(2 * 10 * 0.9)
+    assert calculator.expand_requirements('ships', 'rifter', 1) == {'Tritanium': 18, 'Pyerite': 4}
+
+def test_unknown_category_clears_everything():
+    calculator = build_calculator()
+    calculator.calculate_job_requirements('components', 'bolt', 1)
+    calculator.on_blueprint_changed(None, None)
+    assert calculator.get_cache_stats()['size'] == 0
+
+def test_result_of_an_invalidated_generation_is_not_stored():
+    calculator = build_calculator()
+
+    def calculate(me_level):
+        # A blueprint edit lands while the calculation is running
+        calculator.on_blueprint_changed('components', 'bolt')
+        return {'Pyerite': 4}
+
+    assert calculator._cached_requirements('components', 'bolt', 1, 'test', calculate) == {'Pyerite': 4}
+    assert calculator.get_cache_stats()['size'] == 0
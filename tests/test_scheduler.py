@@ -0,0 +1,77 @@
+"""
+Tests for the list scheduler of manufacturing jobs
+"""
+from core.material_graph import MaterialGraph
+from core.models import ComponentModule, ShipModule
+from core.module_registry import ModuleRegistry
+from core.scheduler import ProductionScheduler
+
+# Seconds per run
+RUN_TIMES = {'hull': 100, 'plate': 30, 'alloy': 50, 'engine': 40}
+
+def build_graph():
+    """A hull needs two plates and an engine; every plate needs an alloy"""
+    registry = ModuleRegistry()
+    registry.register_component(ComponentModule('alloy', 'Alloy', {'Tritanium': 5}, ''))
+    registry.register_component(ComponentModule('plate', 'Plate', {'Alloy': 1}, ''))
+    registry.register_component(ComponentModule('engine', 'Engine', {'Pyerite': 3}, ''))
+    registry.register_ship(ShipModule('hull', 'Hull', {'Plate': 2, 'Engine': 1}, '', 'Minmatar', 'Frigate'))
+    return MaterialGraph.from_registry(registry)
+
+def schedule_hull(slots, runs_per_job=None, run_times=RUN_TIMES):
+    graph = build_graph()
+    totals = graph.expand({graph.get_node_id('ships', 'hull'): 1})
+    durations = lambda category, name, runs: run_times[name] * runs if name in run_times else None
+    return ProductionScheduler(graph, durations).schedule(totals, slots, runs_per_job)
+
+def check_feasible(schedule):
+    """No slot runs two jobs at once and every product starts after its inputs end"""
+    by_slot = {}
+    for job in schedule.jobs:
+        by_slot.setdefault(job.slot, []).append(job)
+    for jobs in by_slot.values():
+        jobs.sort(key=lambda job: job.start)
+        for previous, job in zip(jobs, jobs[1:]):
+            assert previous.end <= job.start
+    ends = {}
+    for job in schedule.jobs:
+        ends[job.name] = max(ends.get(job.name, 0), job.end)
+    inputs = {'hull': ('plate', 'engine'), 'plate': ('alloy',)}
+    for job in schedule.jobs:
+        for name in inputs.get(job.name, ()):
+            assert ends[name] <= job.start
+
+def test_one_slot_runs_all_work_back_to_back():
+    schedule = schedule_hull(1)
+    check_feasible(schedule)
+    # Alloy 2 x 50, Plate 2 x 30, Engine 40 and Hull 100
+    assert schedule.total_work == 300
+    assert schedule.makespan == 300
+    assert schedule.jobs[-1].name == 'hull'
+
+def test_two_slots_reach_the_critical_path():
+    schedule = schedule_hull(2)
+    check_feasible(schedule)
+    assert schedule.critical_path == ['Alloy', 'Plate', 'Hull']
+    assert schedule.critical_path_time == 260
+    # The Engine runs beside the Alloy, so only the critical path remains
+    assert schedule.makespan == 260
+    assert schedule.lower_bound == 260
+    # One slot runs the Alloy and the Hull, the other the Engine and the Plate
+    assert sorted(schedule.slot_busy) == [100, 200]
+    assert sorted(schedule.utilization) == [100 / 260, 200 / 260]
+
+def test_single_run_jobs():
+    schedule = schedule_hull(2, runs_per_job=1)
+    check_feasible(schedule)
+    assert len(schedule.jobs) == 6
+    # Both Alloys 0-50, then the Engine 50-90 beside Plates 50-80 and 80-110, Hull 110-210
+    assert schedule.lower_bound == 180
+    assert schedule.makespan == 210
+    assert [(job.name, job.start) for job in schedule.jobs][:2] == [('alloy', 0), ('alloy', 0)]
+
+def test_unknown_build_times_take_no_time():
+    schedule = schedule_hull(2, run_times={'hull': 100, 'plate': 30})
+    check_feasible(schedule)
+    assert sorted(schedule.unknown) == ['Alloy', 'Engine']
+    assert schedule.makespan == 160
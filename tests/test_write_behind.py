@@ -0,0 +1,72 @@
+"""
+Tests for the coalescing write-behind store of blueprint edits
+"""
+import threading
+
+from core.config.blueprint_config import WriteBehindStore
+
+class Recorder:
+    """Write function that records every call"""
+    def __init__(self, results=()):
+        self.calls = []
+        self.results = list(results)
+        self.written = threading.Event()
+
+    def __call__(self, records):
+        self.calls.append(sorted(records))
+        self.written.set()
+        return self.results.pop(0) if self.results else True
+
+def test_burst_is_coalesced_into_one_write():
+    recorder = Recorder()
+    store = WriteBehindStore(recorder, delay=60)
+    store.mark_dirty('components', 'widget', 'me', 1)
+    store.mark_dirty('components', 'widget', 'me', 5)
+    store.mark_dirty('components', 'widget', 'owned', True)
+    store.mark_dirty('components', 'widget', 'me', 7)
+    assert recorder.calls == []
+    assert store.pending_count() == 2
+
+    assert store.flush()
+    assert recorder.calls == [[('components', 'widget', 'me', 7), ('components', 'widget', 'owned', True)]]
+    assert store.pending_count() == 0
+    # Nothing pending, nothing written
+    assert store.flush()
+    assert len(recorder.calls) == 1
+    store.close()
+
+def test_background_write_after_the_save_window():
+    recorder = Recorder()
+    store = WriteBehindStore(recorder, delay=0.05)
+    for level in range(10):
+        store.mark_dirty('components', 'widget', 'me', level)
+    assert recorder.written.wait(5)
+    store.close()
+    assert recorder.calls == [[('components', 'widget', 'me', 9)]]
+
+def test_zero_delay_writes_immediately():
+    recorder = Recorder()
+    store = WriteBehindStore(recorder, delay=0)
+    store.mark_dirty('components', 'widget', 'me', 3)
+    store.mark_dirty('components', 'widget', 'me', 4)
+    assert recorder.calls == [[('components', 'widget', 'me', 3)], [('components', 'widget', 'me', 4)]]
+
+def test_failed_write_is_retried_without_losing_newer_edits():
+    recorder = Recorder(results=[False])
+    store = WriteBehindStore(recorder, delay=60)
+    store.mark_dirty('components', 'widget', 'me', 3)
+    store.mark_dirty('components', 'gadget', 'te', 2)
+    assert not store.flush()
+    # Edited again after the failure: the newer value wins
+    store.mark_dirty('components', 'widget', 'me', 8)
+    assert store.pending_count() == 2
+
+    assert store.close()
+    assert recorder.calls[-1] == [('components', 'gadget', 'te', 2), ('components', 'widget', 'me', 8)]
+
+def test_edits_after_close_are_written_immediately():
+    recorder = Recorder()
+    store = WriteBehindStore(recorder, delay=60)
+    store.close()
+    store.mark_dirty('components', 'widget', 'me', 1)
+    assert recorder.calls == [[('components', 'widget', 'me', 1)]]